@@ -0,0 +1,103 @@
+"""
+Startup time of the game.
+
+Runs main.py in fresh interpreters with `-X importtime` and reports the
+import time of each module (the slowest ones, and every game module),
+then times the cold start: launching the game up to its main menu and
+quitting, against a bare interpreter. Each run uses an empty working
+directory, as a first launch would.
+
+Usage:
+    python -m src.benchmarks.startup
+    python -m src.benchmarks.startup --runs 30 --budget 30
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.game.game_manager import GameManager
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Answer to the main menu: quit right away
+QUIT = f"{GameManager.QUIT}\n".encode()
+
+
+def import_times():
+    """
+    Import main in a fresh interpreter with -X importtime.
+    Return (module, self µs, cumulative µs) tuples in import order.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|")
+        times.append((module.strip(), int(own), int(cumulative)))
+    return times
+
+
+def _run(args, directory, stdin=b""):
+    start = time.perf_counter()
+    subprocess.run(args, input=stdin, cwd=directory, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def cold_start(runs=20):
+    """Return (game, bare interpreter) wall times in seconds, one per run"""
+    game = []
+    bare = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory(prefix="startup-") as directory:
+            bare.append(_run([sys.executable, "-c", "pass"], directory))
+            game.append(_run([sys.executable, MAIN], directory, QUIT))
+    return game, bare
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Report import and cold start times")
+    parser.add_argument("--runs", type=int, default=20, help="cold starts to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules listed")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="fail (status 1) if the best cold start exceeds this many ms")
+    args = parser.parse_args()
+    
+    # Warm the bytecode caches so the first run does not compile the game
+    _run([sys.executable, "-c", "import main"], ROOT)
+    
+    times = import_times()
+    total = sum(own for _, own, _ in times)
+    print(f"Imports: {len(times)} modules, {total / 1000:.1f} ms")
+    print("\nSlowest modules (self time):")
+    for module, own, cumulative in sorted(times, key=lambda item: -item[1])[:args.top]:
+        print(f"  {own / 1000:7.2f} ms  {cumulative / 1000:7.2f} ms cumulative  {module}")
+    print("\nGame modules:")
+    for module, own, cumulative in times:
+        if module == "main" or module.startswith("src"):
+            print(f"  {own / 1000:7.2f} ms  {cumulative / 1000:7.2f} ms cumulative  {module}")
+    
+    game, bare = cold_start(args.runs)
+    best = min(game) * 1000
+    print(f"\nCold start to the main menu ({args.runs} runs): "
+          f"best {best:.1f} ms, median {statistics.median(game) * 1000:.1f} ms "
+          f"(bare interpreter: best {min(bare) * 1000:.1f} ms)")
+    
+    if args.budget is not None:
+        if best > args.budget:
+            print(f"❌ Over the {args.budget:g} ms budget")
+            sys.exit(1)
+        print(f"✅ Within the {args.budget:g} ms budget")
+
+
+if __name__ == "__main__":
+    main()
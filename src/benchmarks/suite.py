@@ -0,0 +1,328 @@
+"""
+Benchmark suite of the engine's hot paths (standard library only).
+
+Every benchmark is timed with timeit: the number of calls per run is
+calibrated to last about 0.2 s, the run is repeated and the fastest one
+is kept, which filters out most of the noise of a busy machine. The
+RNGs are seeded, so every run does the same work.
+
+Results go to a JSON file; compare checks a run against a baseline and
+exits with status 1 when a benchmark got slower than the threshold.
+
+Usage:
+    python -m src.benchmarks.suite run --out benchmarks/baseline.json
+    python -m src.benchmarks.suite compare benchmarks/baseline.json
+    python -m src.benchmarks.suite compare benchmarks/baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+
+from src.content.loader import ContentPack, Effect, default_content
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.systems.actions import ActionManager
+from src.systems.events import EventManager
+from src.ui.display import Display
+from src.ui.renderer import FrameRenderer
+from src.utils.save_manager import FileBackend, SaveManager
+
+
+# Result file layout version
+VERSION = 1
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+
+def bench_day_step():
+    """One simulated day: an action rule, then the natural evolution"""
+    content = default_content()
+    rng = random.Random(1)
+    actions = ActionManager(content, rng=rng)
+    events = EventManager(content, rng=rng)
+    rules = [action["rule"] for action in actions.actions.values()]
+    player = Player()
+    day = [0]
+    
+    def step():
+        if not player.is_alive() or player.day > GameLoop.TARGET_DAYS:
+            player.__init__()
+        rules[day[0] % len(rules)](player, events)
+        player.natural_evolution()
+        player.increment_day()
+        day[0] += 1
+    return step, None
+
+
+def bench_event_trigger():
+    """EventManager.trigger_random_event on the base catalog"""
+    events = EventManager(default_content(), rng=random.Random(2))
+    player = Player()
+    return (lambda: events.trigger_random_event(player)), None
+
+
+def bench_event_trigger_conditional():
+    """EventManager.trigger_random_event on 5000 events with preconditions"""
+    rng = random.Random(5)
+    events = []
+    for number in range(5000):
+        when = []
+        for field, bounds in (("hunger", [(None, 29), (50, None)]), ("thirst", [(None, 29), (50, None)]),
+                              ("energy", [(None, 49), (70, None)]), ("day", [(3, None), (5, None)])):
+            if rng.random() < 0.3:
+                when.append((field,) + rng.choice(bounds))
+        events.append({"name": f"Event {number}", "description": "", "probability": rng.random(),
+                       "effect": Effect([("thirst", 1)]), "when": tuple(when)})
+    content = default_content()
+    manager = EventManager(ContentPack(content.actions, events), rng=random.Random(2))
+    states = [(rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 100), rng.randint(1, 7))
+              for _ in range(64)]
+    player = Player()
+    index = [0]
+    
+    def trigger():
+        i = index[0] = (index[0] + 1) % 64
+        player.hunger, player.thirst, player.energy, player.day = states[i]
+        manager.trigger_random_event(player)
+    return trigger, None
+
+
+def bench_render_gauges():
+    """Display.show_gauges into a buffer (plain frames, as piped output)"""
+    buffer = io.StringIO()
+    display = Display(FrameRenderer(buffer, ansi=False))
+    player = Player()
+    values = [random.Random(3).randint(0, 100) for _ in range(64)]
+    index = [0]
+    
+    def render():
+        i = index[0] = (index[0] + 1) % 64
+        player.hunger = values[i]
+        display.show_gauges(player)
+        buffer.seek(0)
+        buffer.truncate()
+    return render, None
+
+
+def bench_render_panel():
+    """Display.show_gauges on an ANSI terminal (only changed lines redrawn)"""
+    buffer = io.StringIO()
+    display = Display(FrameRenderer(buffer, ansi=True))
+    player = Player()
+    values = [random.Random(4).randint(0, 100) for _ in range(64)]
+    index = [0]
+    
+    def render():
+        i = index[0] = (index[0] + 1) % 64
+        player.thirst = values[i]
+        display.show_gauges(player)
+        buffer.seek(0)
+        buffer.truncate()
+    return render, None
+
+
+def bench_save_load():
+    """SaveManager.save then SaveManager.load of one slot (file backend)"""
+    directory = tempfile.mkdtemp(prefix="bench-saves-")
+    manager = SaveManager(backend=FileBackend(directory))
+    player = Player("Bench")
+    sink = io.StringIO()
+    
+    def round_trip():
+        with contextlib.redirect_stdout(sink):
+            manager.save(player, "bench")
+            manager.load("bench")
+        sink.seek(0)
+        sink.truncate()
+    return round_trip, lambda: shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_save_load_sqlite():
+    """SaveManager.save then SaveManager.load of one slot (SQLite backend)"""
+    from src.utils.sqlite_backend import SQLiteBackend
+    directory = tempfile.mkdtemp(prefix="bench-saves-")
+    manager = SaveManager(backend=SQLiteBackend(os.path.join(directory, "saves.db")))
+    player = Player("Bench")
+    sink = io.StringIO()
+    
+    def round_trip():
+        with contextlib.redirect_stdout(sink):
+            manager.save(player, "bench")
+            manager.load("bench")
+        sink.seek(0)
+        sink.truncate()
+    
+    def cleanup():
+        manager.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return round_trip, cleanup
+
+
+def bench_leaderboard():
+    """Main menu leaderboard: top 10 runs and best players among 100,000 runs"""
+    from src.utils.run_history import RunHistory, fill
+    directory = tempfile.mkdtemp(prefix="bench-runs-")
+    history = RunHistory(os.path.join(directory, "runs.db"))
+    fill(history, 100_000, seed=42)
+    
+    def leaderboard():
+        history.top(10)
+        history.top_players(10)
+        history.count()
+    
+    def cleanup():
+        history.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return leaderboard, cleanup
+
+
+# name: factory returning (function to time, cleanup or None)
+BENCHMARKS = {
+    "day_step": bench_day_step,
+    "event_trigger": bench_event_trigger,
+    "event_trigger_conditional": bench_event_trigger_conditional,
+    "render_gauges": bench_render_gauges,
+    "render_panel": bench_render_panel,
+    "save_load": bench_save_load,
+    "save_load_sqlite": bench_save_load_sqlite,
+    "leaderboard": bench_leaderboard,
+}
+
+# Smallest slowdown flagged for benchmarks dominated by disk syncs, whose
+# timings vary much more from run to run than the CPU-bound ones
+IO_TOLERANCE = 0.5
+IO_BENCHMARKS = ("save_load", "save_load_sqlite")
+
+
+def time_benchmark(factory, repeat=7, target=0.2):
+    """Return the best time per call, in seconds"""
+    function, cleanup = factory()
+    try:
+        timer = timeit.Timer(function)
+        # The first calibration also warms up caches and lazy imports
+        timer.autorange()
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * target / max(elapsed, 1e-9)))
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+    finally:
+        if cleanup:
+            cleanup()
+
+
+def run_suite(names=None, repeat=7):
+    """Run the benchmarks and return the result document"""
+    results = {}
+    for name in names or BENCHMARKS:
+        seconds = time_benchmark(BENCHMARKS[name], repeat)
+        results[name] = {"seconds_per_call": seconds,
+                         "description": BENCHMARKS[name].__doc__}
+    return {
+        "version": VERSION,
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "content": default_content().digest,
+        "results": results
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Compare two result documents. Return (lines, regressions) where
+    regressions lists the benchmarks slower than the baseline by more than
+    threshold (0.1 = 10%), or IO_TOLERANCE for the disk benchmarks.
+    """
+    lines = []
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            lines.append(f"{name:>18}: {result['seconds_per_call'] * 1e6:10.2f} µs (new)")
+            continue
+        before = baseline["results"][name]["seconds_per_call"]
+        after = result["seconds_per_call"]
+        change = after / before - 1
+        limit = max(threshold, IO_TOLERANCE) if name in IO_BENCHMARKS else threshold
+        flag = ""
+        if change > limit:
+            flag = "  ⚠️  REGRESSION"
+            regressions.append(name)
+        lines.append(f"{name:>18}: {before * 1e6:10.2f} µs -> {after * 1e6:10.2f} µs "
+                     f"({change:+.1%}){flag}")
+    if baseline.get("content") != current.get("content"):
+        lines.append("Note: the content packs differ between the two runs.")
+    if baseline.get("python") != current.get("python"):
+        lines.append(f"Note: Python {baseline.get('python')} vs {current.get('python')}.")
+    return lines, regressions
+
+
+def _write(document, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+
+def _print_results(document):
+    for name, result in document["results"].items():
+        print(f"{name:>18}: {result['seconds_per_call'] * 1e6:10.2f} µs")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the engine's hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run = commands.add_parser("run", help="run the suite and write the results")
+    run.add_argument("--out", default=DEFAULT_BASELINE, help="result file")
+    run.add_argument("--only", action="append", choices=sorted(BENCHMARKS))
+    run.add_argument("--repeat", type=int, default=7)
+    
+    check = commands.add_parser("compare", help="compare results with a baseline")
+    check.add_argument("baseline")
+    check.add_argument("current", nargs="?", default=None,
+                       help="result file (default: run the suite now)")
+    check.add_argument("--threshold", type=float, default=0.10,
+                       help="slowdown flagged as a regression (0.10 = 10%%)")
+    check.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    if args.command == "run":
+        document = run_suite(args.only, args.repeat)
+        _print_results(document)
+        _write(document, args.out)
+        print(f"Results written to {args.out} in {time.perf_counter() - start:.1f}s")
+        return
+    
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        current = run_suite([name for name in baseline["results"] if name in BENCHMARKS],
+                            args.repeat)
+    
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        sys.exit(1)
+    print(f"\n✅ No regression beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Game content module"""
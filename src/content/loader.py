@@ -0,0 +1,454 @@
+"""
+Content packs: actions and events declared in JSON data files.
+
+A pack is a directory holding actions.json and/or events.json. Packs are
+validated and compiled into plain, picklable objects (ActionSpec, Effect
+and event dicts), so the catalog ships cheaply to worker processes. The
+compiled form is cached as JSON in the user's cache directory, under the
+SHA-256 of the pack files, so startup skips validation when nothing has
+changed. Reading the cache never runs code, and a cache file whose digest
+or version does not match is compiled again.
+
+Events may declare preconditions on the gauges and the day, compiled to
+(field, low, high) bounds, and on the biome of the world map, compiled
+to ("biome", names); see src/systems/event_index.py:
+    
+    "when": {"thirst": {"max": 29}, "energy": {"min": 51}, "day": {"min": 3}}
+    "when": {"biome": ["beach", "jungle"]}
+
+Extra packs (mods) can be listed in the SURVIVAL_CONTENT_PACKS environment
+variable, separated by os.pathsep: their actions replace base actions with
+the same key and their events are added to the catalog.
+"""
+
+import hashlib
+import json
+import os
+import random
+
+
+# Directory of the packs shipped with the game
+PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs")
+BASE_PACK = os.path.join(PACKS_DIR, "base")
+
+# Events of the world map's biomes, loaded when the map is on
+WORLD_PACK = os.path.join(PACKS_DIR, "world")
+
+
+def _user_cache_dir():
+    """The per-user cache directory ($XDG_CACHE_HOME, ~/.cache or %LOCALAPPDATA%)"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "survival-game")
+
+
+# Where compiled packs are cached, keyed by content hash
+CACHE_DIR = os.path.join(_user_cache_dir(), "content")
+
+# Bump when the compiled form changes, to invalidate old caches
+COMPILED_VERSION = 3
+
+GAUGES = ("hunger", "thirst", "energy")
+
+# Fields an event precondition can test
+CONDITION_FIELDS = GAUGES + ("day",)
+
+# Land biomes of the world map (see src/systems/world.py)
+BIOMES = ("beach", "jungle", "forest", "rocks", "mountain")
+
+
+class ContentError(ValueError):
+    """Raised when a content pack is invalid"""
+
+
+class Effect:
+    """
+    Compiled effect of an event or event choice.
+    Gauge deltas are applied first (clamped to 0-100), then, with the given
+    chance, the success deltas. Calling the effect applies it to a player
+    and returns the result text, if any.
+    """
+    
+    __slots__ = ("deltas", "chance", "success", "success_text", "failure_text")
+    
+    def __init__(self, deltas=(), chance=None, success=(), success_text=None, failure_text=None):
+        self.deltas = tuple(deltas)
+        self.chance = chance
+        self.success = tuple(success)
+        self.success_text = success_text
+        self.failure_text = failure_text
+    
+    def __getstate__(self):
+        return (self.deltas, self.chance, self.success, self.success_text, self.failure_text)
+    
+    def __setstate__(self, state):
+        (self.deltas, self.chance, self.success,
+         self.success_text, self.failure_text) = state
+    
+    def __call__(self, player, rng=random):
+        for gauge, amount in self.deltas:
+            apply_delta(player, gauge, amount)
+        
+        if self.chance is None:
+            return None
+        if rng.random() < self.chance:
+            for gauge, amount in self.success:
+                apply_delta(player, gauge, amount)
+            return self.success_text
+        return self.failure_text
+
+
+class ActionSpec:
+    """
+    Compiled daily action.
+    The action needs (and consumes) `cost` energy, then applies its fixed
+    deltas, then rolls `success_rate` to gain randint(*yield_range) on
+    `yield_gauge`, and finally meets a random event if `explore` is set.
+    """
+    
+    __slots__ = ("key", "name", "description", "cost", "deltas", "success_rate",
+                 "yield_gauge", "yield_range", "explore", "messages")
+    
+    def __init__(self, key, name, description, cost=0, deltas=(), success_rate=None,
+                 yield_gauge=None, yield_range=None, explore=False, messages=None):
+        self.key = key
+        self.name = name
+        self.description = description
+        self.cost = cost
+        self.deltas = tuple(deltas)
+        self.success_rate = success_rate
+        self.yield_gauge = yield_gauge
+        self.yield_range = yield_range
+        self.explore = explore
+        self.messages = messages or {}
+    
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class ContentPack:
+    """Compiled catalog of actions (in menu order) and events"""
+    
+    def __init__(self, actions, events, digest=""):
+        self.actions = actions
+        self.events = events
+        self.digest = digest
+    
+    def action(self, key):
+        """Return the ActionSpec with the given key"""
+        for spec in self.actions:
+            if spec.key == key:
+                return spec
+        raise KeyError(key)
+
+
+def apply_delta(player, gauge, amount):
+    """Add amount to a player's gauge, clamped to 0-100"""
+    setattr(player, gauge, min(100, max(0, getattr(player, gauge) + amount)))
+
+
+def _check(condition, where, message):
+    if not condition:
+        raise ContentError(f"{where}: {message}")
+
+
+def _number(value, where, field, low=None, high=None):
+    _check(isinstance(value, (int, float)) and not isinstance(value, bool),
+           where, f"'{field}' must be a number")
+    _check(low is None or value >= low, where, f"'{field}' must be at least {low}")
+    _check(high is None or value <= high, where, f"'{field}' must be at most {high}")
+    return value
+
+
+def _deltas(mapping, where):
+    _check(isinstance(mapping, dict), where, "gauge changes must be an object")
+    deltas = []
+    for gauge, amount in mapping.items():
+        _check(gauge in GAUGES, where, f"unknown gauge '{gauge}'")
+        _check(isinstance(amount, int) and not isinstance(amount, bool),
+               where, f"'{gauge}' change must be an integer")
+        deltas.append((gauge, amount))
+    return deltas
+
+
+def _compile_effect(data, where):
+    _check(isinstance(data, dict), where, "'effect' must be an object")
+    data = dict(data)
+    chance = data.pop("chance", None)
+    success = data.pop("success", {})
+    success_text = data.pop("success_text", None)
+    failure_text = data.pop("failure_text", None)
+    if chance is not None:
+        _number(chance, where, "chance", 0, 1)
+    else:
+        _check(not success, where, "'success' needs a 'chance'")
+    return Effect(_deltas(data, where), chance, _deltas(success, where), success_text, failure_text)
+
+
+def _compile_action(data, where):
+    _check(isinstance(data, dict), where, "an action must be an object")
+    for field in ("key", "name", "description"):
+        _check(isinstance(data.get(field), str) and data[field], where, f"'{field}' is required")
+    key = data["key"]
+    _check(key == key.strip().lower() and len(key.split()) == 1,
+           where, f"key '{key}' must be lowercase without spaces")
+    _check(key not in ("s", "q", "-"), where, f"key '{key}' is reserved by the game menu")
+    
+    cost = _number(data.get("cost", 0), where, "cost", 0)
+    deltas = _deltas(data.get("effect", {}), where)
+    
+    success_rate = yield_gauge = yield_range = None
+    if "yield" in data:
+        gains = data["yield"]
+        _check(isinstance(gains, dict) and len(gains) == 1, where, "'yield' must name exactly one gauge")
+        (yield_gauge, yield_range), = gains.items()
+        _check(yield_gauge in GAUGES, where, f"unknown gauge '{yield_gauge}'")
+        _check(isinstance(yield_range, list) and len(yield_range) == 2 and
+               all(isinstance(v, int) for v in yield_range) and yield_range[0] <= yield_range[1],
+               where, "'yield' range must be [low, high] integers")
+        yield_range = tuple(yield_range)
+        success_rate = _number(data.get("success_rate", 1), where, "success_rate", 0, 1)
+    
+    messages = data.get("messages", {})
+    _check(isinstance(messages, dict), where, "'messages' must be an object")
+    
+    return ActionSpec(key, data["name"], data["description"], cost, deltas, success_rate,
+                      yield_gauge, yield_range, bool(data.get("explore", False)), messages)
+
+
+def _compile_conditions(data, where):
+    """
+    'when' object to a tuple of (field, low, high), None for open bounds,
+    and ("biome", names)
+    """
+    _check(isinstance(data, dict), where, "'when' must be an object")
+    conditions = []
+    for field, bounds in data.items():
+        if field == "biome":
+            _check(isinstance(bounds, list) and bounds and all(name in BIOMES for name in bounds),
+                   where, f"'biome' must be a list of biomes among {', '.join(BIOMES)}")
+            conditions.append((field, tuple(sorted(set(bounds)))))
+            continue
+        _check(field in CONDITION_FIELDS, where, f"unknown condition field '{field}'")
+        _check(isinstance(bounds, dict) and bounds and set(bounds) <= {"min", "max"},
+               where, f"'{field}' condition must be an object with 'min' and/or 'max'")
+        low, high = bounds.get("min"), bounds.get("max")
+        for name, value in (("min", low), ("max", high)):
+            _check(value is None or (isinstance(value, int) and not isinstance(value, bool)),
+                   where, f"'{field}' {name} must be an integer")
+        _check(low is None or high is None or low <= high,
+               where, f"'{field}' min must not exceed max")
+        conditions.append((field, low, high))
+    return tuple(conditions)
+
+
+def _compile_event(data, where):
+    _check(isinstance(data, dict), where, "an event must be an object")
+    for field in ("name", "description"):
+        _check(isinstance(data.get(field), str) and data[field], where, f"'{field}' is required")
+    
+    event = {
+        "name": data["name"],
+        "description": data["description"],
+        "probability": _number(data.get("probability"), where, "probability", 0)
+    }
+    if data.get("when"):
+        event["when"] = _compile_conditions(data["when"], where)
+    
+    if "choices" in data:
+        choices = data["choices"]
+        _check(isinstance(choices, dict) and "1" in choices,
+               where, "'choices' must be an object with at least a '1' option (the default)")
+        event["type"] = "choice"
+        event["choices"] = {}
+        for key, choice in choices.items():
+            _check(key == key.strip() and len(key.split()) == 1 and key != "-",
+                   where, f"choice key '{key}' must be a single word")
+            _check(isinstance(choice, dict) and isinstance(choice.get("text"), str),
+                   where, f"choice '{key}' needs a 'text'")
+            event["choices"][key] = {
+                "text": choice["text"],
+                "effect": _compile_effect(choice.get("effect", {}), f"{where} choice '{key}'")
+            }
+    else:
+        event["effect"] = _compile_effect(data.get("effect", {}), where)
+    
+    return event
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ContentError(f"{path}: invalid JSON ({e})")
+    _check(isinstance(data, list), path, "expected a list")
+    return data
+
+
+def compile_pack(directory):
+    """Parse, validate and compile one pack directory (no caching)"""
+    actions = []
+    events = []
+    
+    path = os.path.join(directory, "actions.json")
+    if os.path.exists(path):
+        for index, data in enumerate(_read_json(path)):
+            actions.append(_compile_action(data, f"{path}[{index}]"))
+        keys = [spec.key for spec in actions]
+        _check(len(keys) == len(set(keys)), path, "action keys must be unique")
+    
+    path = os.path.join(directory, "events.json")
+    if os.path.exists(path):
+        for index, data in enumerate(_read_json(path)):
+            events.append(_compile_event(data, f"{path}[{index}]"))
+    
+    return ContentPack(actions, events)
+
+
+def _pack_digest(directories):
+    """SHA-256 of the pack files, in load order"""
+    digest = hashlib.sha256(f"compiled-v{COMPILED_VERSION}".encode())
+    for directory in directories:
+        for filename in ("actions.json", "events.json"):
+            path = os.path.join(directory, filename)
+            digest.update(filename.encode())
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _encode_effect(effect):
+    return [effect.deltas, effect.chance, effect.success, effect.success_text, effect.failure_text]
+
+
+def _decode_effect(state):
+    deltas, chance, success, success_text, failure_text = state
+    return Effect([tuple(delta) for delta in deltas], chance, [tuple(delta) for delta in success],
+                  success_text, failure_text)
+
+
+def _encode_pack(pack):
+    """The compiled pack as a JSON document"""
+    events = []
+    for event in pack.events:
+        event = dict(event)
+        if "effect" in event:
+            event["effect"] = _encode_effect(event["effect"])
+        else:
+            event["choices"] = {key: {"text": choice["text"], "effect": _encode_effect(choice["effect"])}
+                                for key, choice in event["choices"].items()}
+        events.append(event)
+    return {"version": COMPILED_VERSION, "digest": pack.digest,
+            "actions": [spec.__getstate__() for spec in pack.actions], "events": events}
+
+
+def _decode_pack(document):
+    """ContentPack from _encode_pack's document (JSON turned its tuples into lists)"""
+    actions = []
+    for state in document["actions"]:
+        spec = ActionSpec.__new__(ActionSpec)
+        spec.__setstate__(state)
+        spec.deltas = tuple(tuple(delta) for delta in spec.deltas)
+        if spec.yield_range is not None:
+            spec.yield_range = tuple(spec.yield_range)
+        actions.append(spec)
+    
+    events = []
+    for event in document["events"]:
+        if "when" in event:
+            event["when"] = tuple((condition[0], tuple(condition[1])) if condition[0] == "biome"
+                                  else tuple(condition) for condition in event["when"])
+        if "effect" in event:
+            event["effect"] = _decode_effect(event["effect"])
+        else:
+            for choice in event["choices"].values():
+                choice["effect"] = _decode_effect(choice["effect"])
+        events.append(event)
+    return ContentPack(actions, events, document["digest"])
+
+
+def _read_cache(path, digest):
+    """The pack cached at path, or None if it is missing, stale or broken"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        if document.get("version") != COMPILED_VERSION or document.get("digest") != digest:
+            return None
+        return _decode_pack(document)
+    except (OSError, ValueError, TypeError, KeyError, AttributeError, IndexError):
+        # Corrupted cache: fall back to compiling
+        return None
+
+
+def load_packs(directories, cache_dir=CACHE_DIR):
+    """
+    Load and merge packs in order, using the compiled cache when possible.
+    Actions of later packs replace earlier actions with the same key;
+    events are appended.
+    """
+    digest = _pack_digest(directories)
+    cache_path = os.path.join(cache_dir, f"{digest}.json") if cache_dir else None
+    
+    if cache_path and os.path.exists(cache_path):
+        pack = _read_cache(cache_path, digest)
+        if pack is not None:
+            return pack
+    
+    actions = {}
+    events = []
+    for directory in directories:
+        _check(os.path.isdir(directory), directory, "content pack not found")
+        pack = compile_pack(directory)
+        for spec in pack.actions:
+            actions[spec.key] = spec
+        events.extend(pack.events)
+    
+    _check(actions, ", ".join(directories), "no action defined")
+    pack = ContentPack(list(actions.values()), events, digest)
+    
+    if cache_path:
+        # Imported here: only needed when the cache is written
+        from src.utils.save_manager import atomic_write
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            atomic_write(cache_path, json.dumps(_encode_pack(pack), ensure_ascii=False,
+                                                separators=(",", ":")))
+        except OSError:
+            # Caching is an optimization only
+            pass
+    
+    return pack
+
+
+def pack_directories():
+    """Base pack followed by the packs listed in SURVIVAL_CONTENT_PACKS"""
+    extra = os.environ.get("SURVIVAL_CONTENT_PACKS", "")
+    return [BASE_PACK] + [path for path in extra.split(os.pathsep) if path]
+
+
+_default_content = None
+_world_content = None
+
+
+def default_content():
+    """Return the game content (loaded once per process)"""
+    global _default_content
+    if _default_content is None:
+        _default_content = load_packs(pack_directories(), CACHE_DIR)
+    return _default_content
+
+
+def world_content():
+    """Return the game content with the world map's events (loaded once per process)"""
+    global _world_content
+    if _world_content is None:
+        _world_content = load_packs(pack_directories() + [WORLD_PACK], CACHE_DIR)
+    return _world_content
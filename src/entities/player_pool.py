@@ -0,0 +1,170 @@
+"""Packed storage for large numbers of players"""
+
+import tracemalloc
+from array import array
+
+from src.entities.player import Player
+
+
+class PlayerPool:
+    """
+    Stores the gauges of many players in compact array buffers.
+    
+    Hunger, thirst and energy are unsigned bytes (array('B')) and the day
+    an unsigned short (array('H')): 5 bytes per player, against about 80
+    for a Player object with __slots__ and 120 for one with a __dict__.
+    All players of a pool share the same name.
+    
+    Indexing the pool returns a PlayerView, a lightweight object exposing
+    the Player API on top of the buffers. Headless batches play a pool's
+    players with run_pool (see src/simulation/headless.py).
+    """
+    
+    def __init__(self, size=0, name="Adventurer"):
+        template = Player(name)
+        self.name = name
+        self.hunger = array("B", [template.hunger]) * size
+        self.thirst = array("B", [template.thirst]) * size
+        self.energy = array("B", [template.energy]) * size
+        self.day = array("H", [template.day]) * size
+    
+    def __len__(self):
+        return len(self.day)
+    
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("player index out of range")
+        return PlayerView(self, index % len(self))
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield PlayerView(self, index)
+    
+    def add(self, player=None):
+        """
+        Append a player (a fresh one if None) to the pool.
+        Return its index.
+        """
+        if player is None:
+            player = Player(self.name)
+        self.hunger.append(player.hunger)
+        self.thirst.append(player.thirst)
+        self.energy.append(player.energy)
+        self.day.append(player.day)
+        return len(self) - 1
+    
+    def alive_count(self):
+        """Count the players still alive"""
+        return sum(1 for h, t, e in zip(self.hunger, self.thirst, self.energy)
+                   if h > Player.MIN_HUNGER and t > Player.MIN_THIRST and e > Player.MIN_ENERGY)
+    
+    def nbytes(self):
+        """Memory used by the gauge buffers, in bytes"""
+        return sum(buffer.itemsize * len(buffer)
+                   for buffer in (self.hunger, self.thirst, self.energy, self.day))
+
+
+class PlayerView:
+    """
+    A player stored in a PlayerPool.
+    Gauge attributes read and write the pool buffers. The Player methods
+    (eat, drink, rest, consume_energy, natural_evolution, is_alive...) only
+    go through those attributes, so they are borrowed unchanged; a view
+    holds nothing but its pool and index.
+    """
+    
+    __slots__ = ("_pool", "_index")
+    
+    MIN_HUNGER = Player.MIN_HUNGER
+    MIN_THIRST = Player.MIN_THIRST
+    MIN_ENERGY = Player.MIN_ENERGY
+    HUNGER_DECAY = Player.HUNGER_DECAY
+    THIRST_DECAY = Player.THIRST_DECAY
+    ENERGY_DECAY = Player.ENERGY_DECAY
+    DEATH_CAUSES = Player.DEATH_CAUSES
+    
+    is_alive = Player.is_alive
+    natural_evolution = Player.natural_evolution
+    eat = Player.eat
+    drink = Player.drink
+    rest = Player.rest
+    consume_energy = Player.consume_energy
+    increment_day = Player.increment_day
+    get_state = Player.get_state
+    load_state = Player.load_state
+    get_death_cause = Player.get_death_cause
+    
+    def __init__(self, pool, index):
+        self._pool = pool
+        self._index = index
+    
+    @property
+    def name(self):
+        return self._pool.name
+    
+    @name.setter
+    def name(self, value):
+        self._pool.name = value
+    
+    @property
+    def day(self):
+        return self._pool.day[self._index]
+    
+    @day.setter
+    def day(self, value):
+        self._pool.day[self._index] = value
+    
+    @property
+    def hunger(self):
+        return self._pool.hunger[self._index]
+    
+    @hunger.setter
+    def hunger(self, value):
+        self._pool.hunger[self._index] = value
+    
+    @property
+    def thirst(self):
+        return self._pool.thirst[self._index]
+    
+    @thirst.setter
+    def thirst(self, value):
+        self._pool.thirst[self._index] = value
+    
+    @property
+    def energy(self):
+        return self._pool.energy[self._index]
+    
+    @energy.setter
+    def energy(self, value):
+        self._pool.energy[self._index] = value
+
+
+def measure_memory(count=100000):
+    """
+    Measure the memory cost per player of Player objects kept in a list
+    and of a PlayerPool, with tracemalloc.
+    Return a dict of bytes per player.
+    """
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        players = [Player() for _ in range(count)]
+        objects = (tracemalloc.get_traced_memory()[0] - start) / count
+        del players
+        
+        start = tracemalloc.get_traced_memory()[0]
+        pool = PlayerPool(count)
+        packed = (tracemalloc.get_traced_memory()[0] - start) / count
+        del pool
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "player": objects,
+        "pool": packed
+    }
+
+
+if __name__ == "__main__":
+    for label, size in measure_memory().items():
+        print(f"{label}: {size:.1f} bytes per player")
@@ -0,0 +1,81 @@
+"""Compact record of the choices made during a game session"""
+
+import json
+import os
+from datetime import datetime
+
+
+class ActionLog:
+    """
+    Seed, starting state and every choice of a session.
+    
+    Entries follow the order in which the game asked for input: the option
+    of a choice event, the daily action key, or PASS for loop iterations
+    where no action was taken (save, invalid input, cancelled quit). With
+    the seed, this is enough to replay the session exactly (see replay.py).
+    """
+    
+    VERSION = 1
+    
+    # Iteration of the game loop where the day did not advance
+    PASS = "-"
+    
+    def __init__(self, seed, start_state, target_days, content_digest=""):
+        self.seed = seed
+        self.start_state = dict(start_state)
+        self.target_days = target_days
+        self.content_digest = content_digest
+        self.entries = []
+        
+        # The world map the session started on (WorldMap.state), if it was on
+        # (see src/systems/world.py)
+        self.world = None
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    def record(self, entry):
+        """Record one input"""
+        self.entries.append(entry)
+    
+    def to_dict(self):
+        """Return the log as a JSON-serializable dictionary"""
+        document = {
+            "version": self.VERSION,
+            "seed": self.seed,
+            "start": self.start_state,
+            "target_days": self.target_days,
+            "content": self.content_digest,
+            "started": self.started,
+            # Menu keys never contain spaces, so a single string stays compact
+            "entries": " ".join(self.entries)
+        }
+        if self.world:
+            document["world"] = self.world
+        return document
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a log from to_dict output"""
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported action log version: {data.get('version')}")
+        log = cls(data["seed"], data["start"], data["target_days"], data.get("content", ""))
+        log.started = data.get("started", log.started)
+        log.world = data.get("world")
+        if log.world is True:
+            # Logs of the first world maps: the map of the seed, from its spawn
+            log.world = {"seed": log.seed}
+        log.entries = data["entries"].split()
+        return log
+    
+    def save(self, path):
+        """Write the log as JSON"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+    
+    @classmethod
+    def load(cls, path):
+        """Read a log written by save"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -1,10 +1,17 @@
 """Main game loop"""
 
+import os
 import random
+from src.content.loader import default_content, world_content
 from src.entities.player import Player
+from src.game.action_log import ActionLog
+from src.game.metrics import INPUT, from_environment
+from src.game.telemetry import TelemetryWriter
 from src.systems.actions import ActionManager
 from src.systems.events import EventManager
 from src.ui.display import Display
+from src.utils.autosave import Autosaver
+from src.utils.dialogue import CONTINUE, Pause, run
 from src.utils.save_manager import SaveManager
 
 
@@ -14,100 +21,491 @@ class GameLoop:
     # Number of days to survive to win
     TARGET_DAYS = 7
     
-    def __init__(self, player):
+    # Chance to roll for a random event at the start of each day
+    DAILY_EVENT_CHANCE = 0.4
+    
+    # Save the game in the background at the end of every day
+    AUTOSAVE = True
+    
+    # Directory of the session logs (seed + choices, see src/game/replay.py)
+    LOG_DIR = "logs"
+    
+    # Let the player save the game, and write the session log when the game
+    # ends (server sessions do neither, see src/server/session.py)
+    SAVES = True
+    SESSION_LOG = True
+    
+    # Record every day and outcome to JSON Lines files (see src/game/telemetry.py)
+    TELEMETRY = True
+    TELEMETRY_DIR = os.path.join(LOG_DIR, "telemetry")
+    
+    # Append every won or lost game to the run history, for the leaderboards
+    # (see src/utils/run_history.py)
+    RUN_HISTORY = True
+    
+    # Seconds between two dumps of the metrics file (see src/game/metrics.py)
+    METRICS_DUMP_INTERVAL = 30.0
+    
+    # Explore a procedurally generated map whose biomes select the events
+    # (also turned on by the SURVIVAL_WORLD environment variable); the
+    # changes to each map are kept under WORLD_DIR/<map seed>, and saves
+    # hold the map seed and the explorer's position (see WorldMap.state)
+    WORLD = False
+    WORLD_DIR = os.path.join("saves", "worlds")
+    
+    # Show the Monte Carlo advisor under the action menu (also turned on by
+    # the SURVIVAL_ADVISOR environment variable), and its time budget
+    ADVISOR = False
+    ADVISOR_BUDGET = 0.05
+    
+    # Keep a snapshot of every day to rewind to (also turned on by the
+    # SURVIVAL_REWIND environment variable, see src/game/history.py)
+    REWIND = False
+    
+    def __init__(self, player, seed=None, slot=None, metrics=None, save_manager=None,
+                 advisor=None, run_history=None, content=None, display=None, output=print,
+                 world=None):
         self.player = player
-        self.action_manager = ActionManager()
-        self.event_manager = EventManager()
-        self.display = Display()
-        self.save_manager = SaveManager()
+        
+        # Save slot of this session (allocated on the first save), and
+        # whether the player saved it (a loaded slot was): a slot that only
+        # ever held autosaves goes away when they quit without saving
+        self.slot = slot
+        self._saved = slot is not None
+        
+        # Each session owns its RNG so it can be replayed from its log
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.world = None
+        if self.WORLD or os.environ.get("SURVIVAL_WORLD"):
+            # Imported here: the map is off by default
+            from src.systems.world import WorldMap
+            if content is None:
+                content = world_content()
+            # A loaded game goes on with the map it was saved with (world,
+            # from WorldMap.state), a new one gets a map of its own seed;
+            # without a WORLD_DIR the map is only kept in memory
+            world = world or {}
+            map_seed = world.get("seed", self.seed)
+            directory = os.path.join(self.WORLD_DIR, str(map_seed)) if self.WORLD_DIR else None
+            self.world = WorldMap(map_seed, directory, position=world.get("position"))
+        elif content is None:
+            content = default_content()
+        self.action_manager = ActionManager(content, rng=self.rng)
+        self.event_manager = EventManager(content, rng=self.rng)
+        self.action_manager.world = self.event_manager.world = self.world
+        self.action_log = ActionLog(self.seed, player.get_state(), self.TARGET_DAYS, content.digest)
+        self.action_log.world = self.world.state() if self.world is not None else None
+        self.event_manager.action_log = self.action_log
+        self.log_path = os.path.join(self.LOG_DIR, f"session-{self.seed}.json")
+        
+        # What the player reads: screens, and the lines written with output
+        # (a server session sends both over the player's connection)
+        self.display = display if display is not None else Display()
+        self.output = output
+        self.action_manager.output = self.event_manager.output = output
+        
+        # A save manager given by the caller is shared: only close our own
+        self._owns_save_manager = save_manager is None
+        self.save_manager = save_manager if save_manager is not None else SaveManager()
+        self.autosaver = Autosaver(self.save_manager) if self.AUTOSAVE else None
+        
+        # Finished runs: shared when given, else opened when the game ends
+        self._owns_run_history = run_history is None
+        self.run_history = run_history
+        
+        # Per-phase timing: a LoopMetrics, or from $SURVIVAL_METRICS (off by default)
+        if metrics is None:
+            metrics = from_environment(self.METRICS_DUMP_INTERVAL)
+        self.metrics = metrics
+        if metrics.enabled:
+            self.event_manager.listeners.append(lambda event: metrics.count_event(event["name"]))
+        
+        # Chance of winning of each action (see src/simulation/advisor.py)
+        if advisor is None and (self.ADVISOR or os.environ.get("SURVIVAL_ADVISOR")):
+            # Imported here: the advisor plays headless games, built on this module
+            from src.simulation.advisor import Advisor
+            advisor = Advisor(content, self.TARGET_DAYS, self.ADVISOR_BUDGET)
+        self.advisor = advisor
+        
+        # Telemetry, and the events applied since the last recorded day
+        self.telemetry = TelemetryWriter(self.TELEMETRY_DIR) if self.TELEMETRY else None
+        self._day_events = []
+        if self.telemetry is not None:
+            self.event_manager.listeners.append(lambda event: self._day_events.append(event["name"]))
+        self.start_day = player.day
         self.running = False
+        
+        # How the game ended: "won", "dead" or "quit" (None while it lasts)
+        self.outcome = None
+        
+        # Days to rewind to
+        self.history = None
+        if self.REWIND or os.environ.get("SURVIVAL_REWIND"):
+            # Imported here: rewinding is off by default
+            from src.game.history import History
+            self.history = History()
     
     def start(self):
         """Start the main game loop"""
+        run(self.play(), self._input)
+    
+    def play(self):
+        """
+        The game as a dialogue (see src/utils/dialogue.py): start answers
+        it in the terminal, a server session over the player's connection
+        """
         self.running = True
+        try:
+            yield from self._play()
+        finally:
+            self._close()
+    
+    def _play(self):
+        self.output(f"\n🎯 Goal: Survive {self.TARGET_DAYS} days!")
+        self.output("📋 Manage your vital resources each day.")
+        yield Pause("\nPress Enter to start...")
+        self._record("start", name=self.player.name, **self._gauges())
         
-        print(f"\n🎯 Goal: Survive {self.TARGET_DAYS} days!")
-        print("📋 Manage your vital resources each day.")
-        input("\nPress Enter to start...")
-        
+        metrics = self.metrics
+        won = False
         while self.running and self.player.is_alive():
-            # Display player's status
-            self.display.show_gauges(self.player)
-            
-            # Random events at the start of the day
-            self._handle_random_events()
-            
-            # Show actions menu
-            actions = self.action_manager.get_available_actions()
-            self.display.show_action_menu(actions)
-            
-            # Player's choice
-            choice = input("\nYour choice: ").strip().lower()
-            
-            # Handle player's choice
-            if choice == 'q':
-                if self._confirm_quit():
-                    self.running = False
-                    break
-            elif choice == 's':
-                self.save_manager.save(self.player)
-                input("\nPress Enter to continue...")
-            else:
-                # Execute chosen action
-                if self.action_manager.execute_action(choice, self.player, self.event_manager):
-                    # Natural evolution of gauges
-                    self.player.natural_evolution()
+            with metrics.phase("turn"):
+                self._snapshot()
+                
+                # Display player's status
+                with metrics.phase("render"):
+                    self.display.show_gauges(self.player)
+                
+                # Random events at the start of the day
+                with metrics.phase("events"):
+                    yield from self._handle_random_events()
+                
+                # Show actions menu
+                advice = None
+                if self.advisor is not None:
+                    with metrics.phase("advisor"):
+                        advice = self.advisor.estimate(self.player)
+                with metrics.phase("render"):
+                    actions = self.action_manager.get_available_actions()
+                    self.display.show_action_menu(actions, can_save=self.SAVES, advice=advice,
+                                                  can_rewind=self._can_rewind())
+                
+                # Player's choice
+                choice = (yield "\nYour choice: ").strip().lower()
+                
+                # Handle player's choice
+                if choice == 'q':
+                    if (yield from self._confirm_quit()):
+                        self.running = False
+                        self._record_outcome("quit")
+                        break
+                    self.action_log.record(ActionLog.PASS)
+                elif choice == 's' and self.SAVES:
+                    self.action_log.record(ActionLog.PASS)
+                    self._save()
+                    self._write_action_log()
+                    yield CONTINUE
+                elif choice == 'r' and self._can_rewind():
+                    if not (yield from self._rewind()):
+                        self.action_log.record(ActionLog.PASS)
+                    yield CONTINUE
+                else:
+                    # Record before executing: event choices come after the action
+                    if choice in self.action_manager.actions:
+                        self.action_log.record(choice)
+                    else:
+                        self.action_log.record(ActionLog.PASS)
                     
-                    # Advance to the next day
-                    self.player.increment_day()
+                    # Execute chosen action
+                    with metrics.phase("action"):
+                        executed = yield from self.action_manager.action_dialogue(
+                            choice, self.player, self.event_manager)
+                    if executed:
+                        with metrics.phase("evolution"):
+                            # Natural evolution of gauges
+                            self.player.natural_evolution()
+                            
+                            # Advance to the next day
+                            self.player.increment_day()
+                        self._record_day(choice)
+                        
+                        # Check for victory
+                        if self.player.day > self.TARGET_DAYS:
+                            self._victory()
+                            won = True
+                            break
+                        
+                        if self.player.is_alive():
+                            self._autosave()
                     
-                    # Check for victory
-                    if self.player.day > self.TARGET_DAYS:
-                        self._victory()
-                        break
-                
-                input("\nPress Enter to continue...")
+                    yield CONTINUE
+            metrics.maybe_dump()
         
-        # End of game
-        if not self.player.is_alive():
+        # End of game: a victory stands even if a gauge ran out on the last day
+        if not won and not self.player.is_alive():
             self._game_over()
     
+    def _close(self):
+        """Release what the session holds once it is over (or abandoned)"""
+        self._close_autosaver()
+        self._save_world()
+        if self.advisor is not None:
+            self.advisor.close()
+        if self._owns_save_manager:
+            self.save_manager.close()
+        if self._owns_run_history and self.run_history is not None:
+            self.run_history.close()
+        self.display.close()
+        self._close_telemetry()
+        self._dump_metrics()
+    
+    def _input(self, prompt):
+        """Read the player's answer, timed as think time"""
+        with self.metrics.phase(INPUT):
+            return input(prompt)
+    
+    def _gauges(self):
+        player = self.player
+        return {"day": player.day, "hunger": player.hunger, "thirst": player.thirst,
+                "energy": player.energy}
+    
+    def _record(self, kind, **fields):
+        """Queue a telemetry record of this session"""
+        if self.telemetry is None:
+            return
+        try:
+            self.telemetry.record(kind, session=self.seed, **fields)
+        except OSError as e:
+            self.output(f"❌ Error while writing telemetry: {e}")
+    
+    def _record_day(self, action):
+        """Record the day just played: its action, events and final gauges"""
+        if self.telemetry is None:
+            return
+        gauges = self._gauges()
+        gauges["day"] -= 1
+        events, self._day_events = self._day_events, []
+        self._record("day", action=action, events=events, **gauges)
+    
+    def _record_outcome(self, outcome):
+        """Record how the game ended ("won", "dead" or "quit")"""
+        self.outcome = outcome
+        fields = {"outcome": outcome, "start_day": self.start_day, "day": self.player.day}
+        if outcome == "dead":
+            fields["cause"] = self.player.get_death_cause()
+        self._record("end", **fields)
+    
+    def _close_telemetry(self):
+        """Write the buffered telemetry"""
+        if self.telemetry is None:
+            return
+        try:
+            with self.metrics.phase("save"):
+                self.telemetry.close()
+        except OSError as e:
+            self.output(f"❌ Error while writing telemetry: {e}")
+    
+    def _dump_metrics(self):
+        """Write the final metrics dump, if instrumentation is on"""
+        try:
+            self.metrics.maybe_dump(force=True)
+        except OSError as e:
+            self.output(f"❌ Error while writing the metrics: {e}")
+    
     def _handle_random_events(self):
         """Handle random events at the start of the day"""
         # 40% chance an event occurs
-        if random.random() < 0.4:
+        if self.rng.random() < self.DAILY_EVENT_CHANCE:
             event = self.event_manager.trigger_random_event(self.player)
             if event:
-                self.event_manager.apply_event(event, self.player)
+                yield from self.event_manager.event_dialogue(event, self.player)
+    
+    def _snapshot(self):
+        """Record the start of a new day in the history, if rewinding is on"""
+        if self.history is not None and self.history.latest() != self.player.day:
+            self.history.record(self.player, self.rng, len(self.action_log.entries), self.world)
+    
+    def _can_rewind(self):
+        history = self.history
+        return history is not None and history.get(self.player.day - 1) is not None
+    
+    def _rewind(self):
+        """
+        Go back to the start of an earlier day, as if the days since were
+        not played. Return False if the player picked no valid day.
+        """
+        day = self.player.day
+        answer = (yield f"\n⏪ Back to which day? (1-{day - 1}, or -N to undo N days): ").strip()
+        try:
+            target = int(answer)
+        except ValueError:
+            self.output("❌ Invalid day.")
+            return False
+        if target < 0:
+            target += day
+        snapshot = self.history.get(target) if 0 < target < day else None
+        if snapshot is None:
+            self.output("❌ There is no earlier day to go back to.")
+            return False
+        
+        self.player.load_state(snapshot.state())
+        self.rng.setstate(snapshot.rng_state())
+        del self.action_log.entries[snapshot.entries:]
+        if self.world is not None:
+            self.world.restore(snapshot.world)
+        self.history.truncate(snapshot.day)
+        self._day_events = []
+        self._record("rewind", day=day, to=snapshot.day)
+        
+        if snapshot.day != target:
+            self.output(f"\n⏪ Day {target} was not kept: back to the start of day {snapshot.day}.")
+        else:
+            self.output(f"\n⏪ Back to the start of day {snapshot.day}.")
+        self._autosave()
+        return True
     
     def _game_over(self):
         """Show the game over screen"""
         self.display.show_game_over(self.player, self.TARGET_DAYS)
+        self._record_outcome("dead")
+        self._record_run("dead")
         
         # Delete save after game over
-        self.save_manager.delete_save()
+        self._delete_save()
+        self._write_action_log()
     
     def _victory(self):
         """Show the victory screen"""
         self.display.show_victory(self.player, self.TARGET_DAYS)
+        self._record_outcome("won")
+        self._record_run("won")
         
         # Delete save after victory
-        self.save_manager.delete_save()
+        self._delete_save()
+        self._write_action_log()
+    
+    def _record_run(self, outcome):
+        """Append the finished game ("won" or "dead") to the run history"""
+        if self.run_history is None and not self.RUN_HISTORY:
+            return
+        # Imported here: the database is only needed once a game ends
+        import sqlite3
+        if self.run_history is None:
+            from src.utils.run_history import RunHistory
+            self.run_history = RunHistory()
+        
+        player = self.player
+        cause = player.get_death_cause() if outcome == "dead" else None
+        try:
+            with self.metrics.phase("save"):
+                # Full days survived: the game ends on the day after the last one played
+                self.run_history.add(player.name, outcome, player.day - 1, cause, self.seed)
+        except (sqlite3.Error, OSError) as e:
+            self.output(f"❌ Error while recording the run: {e}")
+    
+    def _autosave(self):
+        """Queue the state of the new day for the background writer"""
+        if self.autosaver is None:
+            return
+        with self.metrics.phase("save"):
+            if self.slot is None:
+                self.slot = self.save_manager.new_slot(self.player.name)
+            self.autosaver.submit(self._state(), self.slot)
+        self._save_world()
+    
+    def _state(self):
+        """What a save holds: the player's state, and the map's if it is on"""
+        state = self.player.get_state()
+        if self.world is not None:
+            state["world"] = self.world.state()
+        return state
+    
+    def _flush_autosave(self):
+        """Wait for pending autosaves, reporting a failed one"""
+        if self.autosaver is None:
+            return
+        self.autosaver.flush()
+        if self.autosaver.error:
+            self.output(f"\n❌ Error while autosaving: {self.autosaver.error}")
+            self.autosaver.error = None
+    
+    def _close_autosaver(self):
+        """Flush pending autosaves and stop the writer thread"""
+        if self.autosaver is not None:
+            self._flush_autosave()
+            self.autosaver.close()
+    
+    def _save(self):
+        """Save the game to this session's slot"""
+        with self.metrics.phase("save"):
+            # Pending autosaves hold older states: let them land first
+            self._flush_autosave()
+            slot = self.save_manager.save(self.player, self.slot, self._state())
+        if slot:
+            self.slot = slot
+            self._saved = True
+        self._save_world()
+    
+    def _save_world(self):
+        """Store the changes to the world map, if it is on"""
+        if self.world is None:
+            return
+        try:
+            with self.metrics.phase("save"):
+                self.world.save()
+        except OSError as e:
+            self.output(f"❌ Error while saving the map: {e}")
+    
+    def _delete_save(self):
+        """Delete this session's save slot, if it was saved, and its map"""
+        with self.metrics.phase("save"):
+            if self.autosaver is not None:
+                # A pending autosave must not bring the slot back
+                self.autosaver.discard()
+                self.autosaver.flush()
+            if self.slot:
+                self.save_manager.delete_save(self.slot)
+            if self.world is not None:
+                try:
+                    self.world.delete()
+                except OSError as e:
+                    self.output(f"❌ Error while deleting the map: {e}")
     
     def _confirm_quit(self):
         """Ask for confirmation before quitting"""
-        print("\n⚠️  Do you want to save before quitting?")
-        print("1. Yes, save and quit")
-        print("2. No, quit without saving")
-        print("3. Cancel")
+        if not self.SAVES:
+            # Nothing to save: quit right away
+            self._write_action_log()
+            self.output("\n👋 See you soon!")
+            return True
+        
+        self.output("\n⚠️  Do you want to save before quitting?")
+        self.output("1. Yes, save and quit")
+        self.output("2. No, quit without saving")
+        self.output("3. Cancel")
         
-        choice = input("\nYour choice: ").strip()
+        choice = (yield "\nYour choice: ").strip()
         
         if choice == "1":
-            self.save_manager.save(self.player)
+            self._save()
+            self._write_action_log()
             return True
         elif choice == "2":
-            print("\n👋 See you soon!")
+            if not self._saved:
+                self._delete_save()
+            self._write_action_log()
+            self.output("\n👋 See you soon!")
             return True
         else:
             return False
+    
+    def _write_action_log(self):
+        """Write the session log so the game can be replayed (bug reports)"""
+        if not self.SESSION_LOG:
+            return
+        try:
+            with self.metrics.phase("save"):
+                self.action_log.save(self.log_path)
+        except OSError as e:
+            self.output(f"❌ Error while writing the session log: {e}")
@@ -1,19 +1,59 @@
 """Main game manager"""
 
 from src.entities.player import Player
-from src.game.game_loop import GameLoop
 from src.ui.display import Display
-from src.utils.save_manager import SaveManager
 
 
 class GameManager:
     """Coordinates the game and manages the main menu"""
     
+    # Saves listed per page in the load menu
+    SAVES_PER_PAGE = 10
+    
+    # Runs listed per leaderboard
+    LEADERBOARD_SIZE = 10
+    
+    # Main menu answer to quit (see Display.show_main_menu)
+    QUIT = "4"
+    
     def __init__(self):
         self.display = Display()
-        self.save_manager = SaveManager()
         self.player = None
         self.game_loop = None
+        
+        # Shared with every GameLoop; created when the saves are first needed
+        self._save_manager = None
+        
+        # Shared with every GameLoop as well; opened with the leaderboard or
+        # when the first game ends
+        self._run_history = None
+    
+    @property
+    def save_manager(self):
+        """The SaveManager of the menus and of every game"""
+        if self._save_manager is None:
+            # Imported here: the main menu shows before any save is touched
+            from src.utils.save_manager import SaveManager
+            self._save_manager = SaveManager()
+        return self._save_manager
+    
+    @property
+    def run_history(self):
+        """The RunHistory of the leaderboard and of every game"""
+        if self._run_history is None:
+            # Imported here: sqlite3 is only needed by the leaderboard and finished games
+            from src.utils.run_history import RunHistory
+            self._run_history = RunHistory()
+        return self._run_history
+    
+    def _play(self, slot=None, world=None):
+        """Run a game of the current player (world: its saved map, see WorldMap.state)"""
+        # The game modules (content, rules, autosave) load with the first game
+        from src.game.game_loop import GameLoop
+        run_history = self.run_history if GameLoop.RUN_HISTORY else None
+        self.game_loop = GameLoop(self.player, slot=slot, save_manager=self.save_manager,
+                                  run_history=run_history, world=world)
+        self.game_loop.start()
     
     def run(self):
         """Main entry point to run the game"""
@@ -27,10 +67,16 @@ class GameManager:
             elif choice == "2":
                 self._load_game()
             elif choice == "3":
+                self._leaderboard()
+            elif choice == self.QUIT:
                 print("\n👋 Thanks for playing! See you soon!")
+                if self._save_manager is not None:
+                    self._save_manager.close()
+                if self._run_history is not None:
+                    self._run_history.close()
                 break
             else:
-                print("\n❌ Invalid choice. Please enter 1, 2 or 3.")
+                print("\n❌ Invalid choice. Please enter 1, 2, 3 or 4.")
     
     def _new_game(self):
         """Start a new game"""
@@ -51,8 +97,7 @@ class GameManager:
         print("You must survive by managing your vital resources.")
         
         # Start the game loop
-        self.game_loop = GameLoop(self.player)
-        self.game_loop.start()
+        self._play()
     
     def _load_game(self):
         """Load a saved game"""
@@ -60,8 +105,12 @@ class GameManager:
         print("                       📂 LOADING")
         print("="*60)
         
+        slot = self._choose_slot()
+        if slot is None:
+            return
+        
         # Load data from disk
-        data = self.save_manager.load()
+        data = self.save_manager.load(slot)
         
         if data:
             # Create the player and load their state
@@ -71,9 +120,71 @@ class GameManager:
             print(f"\nWelcome back {self.player.name}!")
             print(f"📅 Day {self.player.day}")
             
-            # Start the game loop
-            self.game_loop = GameLoop(self.player)
-            self.game_loop.start()
+            # Start the game loop, saving back to the same slot
+            self._play(slot, data.get("world"))
         else:
             print("\n⚠️  Unable to load game.")
             input("\nPress Enter to return to menu...")
+    
+    def _leaderboard(self):
+        """
+        Show the best runs, then the leaderboard the player picks: each
+        player's best, one player's runs, or the runs of a cause of death.
+        Every query reads an index of the run history, never all the runs.
+        """
+        # Imported here: only the errors of the run history are needed
+        import sqlite3
+        history = self.run_history
+        causes = list(Player.DEATH_CAUSES.values())
+        size = self.LEADERBOARD_SIZE
+        title, query = "Best runs", lambda: history.top(size)
+        while True:
+            try:
+                runs, total = query(), history.count()
+            except (sqlite3.Error, OSError) as e:
+                print(f"\n❌ Unable to read the run history: {e}")
+                input("\nPress Enter to return to menu...")
+                return
+            self.display.show_leaderboard(title, runs, total, causes)
+            
+            choice = input("\nYour choice: ").strip().lower()
+            if not choice:
+                return
+            if choice == "r":
+                title, query = "Best runs", lambda: history.top(size)
+            elif choice == "p":
+                title, query = "Best run of each player", lambda: history.top_players(size)
+            elif choice == "n":
+                name = input("\nPlayer name: ").strip()
+                if name:
+                    title, query = f"Runs of {name}", lambda name=name: history.player_runs(name, size)
+            elif choice.isdigit() and 1 <= int(choice) <= len(causes):
+                cause = causes[int(choice) - 1]
+                title, query = f"Best runs: {cause}", lambda cause=cause: history.top(size, cause)
+            else:
+                print("\n❌ Invalid choice.")
+    
+    def _choose_slot(self):
+        """Let the player pick a save, a page at a time. Return its slot or None."""
+        saves = self.save_manager.list_saves()
+        if not saves:
+            print("\n❌ No saved game found.")
+            input("\nPress Enter to return to menu...")
+            return None
+        
+        first = 0
+        while True:
+            page = saves[first:first + self.SAVES_PER_PAGE]
+            self.display.show_save_list(page, first, len(saves))
+            
+            choice = input("\nYour choice: ").strip().lower()
+            if not choice:
+                return None
+            if choice == "n" and first + len(page) < len(saves):
+                first += self.SAVES_PER_PAGE
+            elif choice == "p" and first:
+                first -= self.SAVES_PER_PAGE
+            elif choice.isdigit() and 1 <= int(choice) <= len(page):
+                return page[int(choice) - 1][0]
+            else:
+                print("\n❌ Invalid choice.")
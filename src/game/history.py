@@ -0,0 +1,122 @@
+"""
+History of the days of a session, to rewind to any of them.
+
+At the start of each day GameLoop records a Snapshot: the player's
+gauges, the RNG state, the position in the action log and the world map
+(see WorldMap.snapshot). Nothing is deep-copied: the gauges are a small
+tuple, the map is a persistent structure whose versions share every
+chunk a day did not change, and the 624 words of the Mersenne Twister
+only change when it regenerates them (every 312 random() calls or so),
+so consecutive days share the same tuple. A day costs about 1.5 KB with
+the world map on, and recording or restoring it takes constant time.
+
+Past max_snapshots, older days are thinned out to sparse keyframes: the
+recent half of the history keeps every day, the older half only the
+days that are multiples of the keyframe spacing, which doubles whenever
+that is not enough. Rewinding to a thinned out day lands on the closest
+earlier day kept.
+"""
+
+from bisect import bisect_right
+
+
+class Snapshot:
+    """State of a session at the start of a day"""
+    
+    __slots__ = ("day", "gauges", "words", "index", "gauss", "entries", "world")
+    
+    def __init__(self, day, gauges, words, index, gauss, entries, world):
+        self.day = day
+        self.gauges = gauges
+        
+        # Mersenne Twister words (shared between days), position and cached gauss
+        self.words = words
+        self.index = index
+        self.gauss = gauss
+        
+        # Number of action log entries, and WorldMap.snapshot() (or None)
+        self.entries = entries
+        self.world = world
+    
+    def state(self):
+        """The player's state, for Player.load_state"""
+        hunger, thirst, energy = self.gauges
+        return {"day": self.day, "hunger": hunger, "thirst": thirst, "energy": energy}
+    
+    def rng_state(self):
+        """The RNG state, for random.Random.setstate"""
+        return (3, self.words + (self.index,), self.gauss)
+
+
+class History:
+    """Snapshots of the days of a session, by day"""
+    
+    # Days kept before thinning out the older ones
+    MAX_SNAPSHOTS = 1000
+    
+    # Spacing of the keyframes kept among the older days
+    KEYFRAME_EVERY = 10
+    
+    def __init__(self, max_snapshots=MAX_SNAPSHOTS, keyframe_every=KEYFRAME_EVERY):
+        self.max_snapshots = max_snapshots
+        self.spacing = keyframe_every
+        self._days = []
+        self._snapshots = {}
+        self._words = ()
+    
+    def __len__(self):
+        return len(self._days)
+    
+    def days(self):
+        """The days that can be rewound to, in order"""
+        return list(self._days)
+    
+    def latest(self):
+        """The last day recorded, or None"""
+        return self._days[-1] if self._days else None
+    
+    def record(self, player, rng, entries=0, world=None):
+        """Keep the state at the start of the player's current day"""
+        _, state, gauss = rng.getstate()
+        words = state[:-1]
+        if words == self._words:
+            words = self._words
+        else:
+            self._words = words
+        
+        day = player.day
+        if self._days and self._days[-1] >= day:
+            self.truncate(day - 1)
+        self._snapshots[day] = Snapshot(day, (player.hunger, player.thirst, player.energy),
+                                        words, state[-1], gauss, entries,
+                                        world.snapshot() if world is not None else None)
+        self._days.append(day)
+        if len(self._days) > self.max_snapshots:
+            self._thin()
+    
+    def get(self, day):
+        """The snapshot of the last day kept up to day, or None"""
+        index = bisect_right(self._days, day)
+        return self._snapshots[self._days[index - 1]] if index else None
+    
+    def truncate(self, day):
+        """Forget the days after day (the future of a rewind)"""
+        index = bisect_right(self._days, day)
+        for later in self._days[index:]:
+            del self._snapshots[later]
+        del self._days[index:]
+    
+    def _thin(self):
+        """Keep only keyframes in the older half, spacing them out until under the limit"""
+        half = len(self._days) // 2
+        older, recent = self._days[:half], self._days[half:]
+        kept = []
+        while older:
+            kept = [day for day in older if day % self.spacing == 0]
+            if len(kept) < len(older):
+                break
+            self.spacing *= 2
+        for day in older:
+            if day % self.spacing:
+                del self._snapshots[day]
+        self._days = kept + recent
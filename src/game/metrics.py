@@ -0,0 +1,259 @@
+"""
+Per-phase timing of the game loop.
+
+GameLoop times each phase of a turn (random events, action dispatch,
+natural evolution, rendering, save I/O) and the time spent waiting on the
+player's input, and counts the events fired. Time waiting on input is
+subtracted from the phases it happened in, so "busy" times are the
+processing time of the engine and "input" is the player's think time.
+
+Instrumentation is off unless a LoopMetrics is given to GameLoop, or the
+SURVIVAL_METRICS environment variable names a JSON file, which is then
+rewritten periodically while playing. Off, every phase goes through
+NULL_METRICS, whose timers do nothing.
+
+Usage:
+    SURVIVAL_METRICS=logs/metrics.json python main.py
+    python -m src.game.metrics logs/metrics.json
+"""
+
+import json
+import os
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+from src.utils.save_manager import atomic_write
+
+
+# Phase timing the player's think time
+INPUT = "input"
+
+
+class _Phase:
+    """Times one phase: a context manager, reused once exited"""
+    
+    __slots__ = ("metrics", "name", "start", "waiting")
+    
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+        self.waiting = 0.0
+    
+    def __enter__(self):
+        self.waiting = 0.0
+        self.metrics._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        metrics = self.metrics
+        metrics._stack.pop()
+        waiting = elapsed if self.name == INPUT else self.waiting
+        if metrics._stack:
+            metrics._stack[-1].waiting += waiting
+        metrics._record(self.name, elapsed, elapsed - waiting)
+        return False
+
+
+class LoopMetrics:
+    """
+    Wall time and count of each phase, and the frequency of each event.
+    Phases may nest (an event asks for input, an action triggers an
+    event); each records its total time and its busy time, which leaves
+    out the input waits inside it.
+    """
+    
+    enabled = True
+    
+    # Busy times of the last turns kept for the percentiles
+    TURN_SAMPLES = 1000
+    
+    def __init__(self, dump_path=None, dump_interval=30.0):
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._start = time.perf_counter()
+        self._last_dump = self._start
+        
+        # name: [count, total seconds, busy seconds, max busy seconds]
+        self.phases = {}
+        self.events = Counter()
+        self.turn_times = deque(maxlen=self.TURN_SAMPLES)
+        
+        # Open phases, innermost last, and one reusable timer per phase
+        self._stack = []
+        self._timers = {}
+    
+    def phase(self, name):
+        """Context manager timing one run of a phase"""
+        timer = self._timers.get(name)
+        if timer is None or timer in self._stack:
+            # A phase nested in itself needs its own timer
+            timer = _Phase(self, name)
+            self._timers.setdefault(name, timer)
+        return timer
+    
+    def _record(self, name, elapsed, busy):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = [0, 0.0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += busy
+        if busy > stats[3]:
+            stats[3] = busy
+        if name == "turn":
+            self.turn_times.append(busy)
+    
+    def count_event(self, name):
+        """Record that an event fired"""
+        self.events[name] += 1
+    
+    def merge(self, other):
+        """Add the phases, events and turn times of another LoopMetrics to this one"""
+        for name, (count, total, busy, longest) in other.phases.items():
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = [0, 0.0, 0.0, 0.0]
+            stats[0] += count
+            stats[1] += total
+            stats[2] += busy
+            stats[3] = max(stats[3], longest)
+        self.events.update(other.events)
+        self.turn_times.extend(other.turn_times)
+        return self
+    
+    def snapshot(self):
+        """Return the metrics so far as a JSON-serializable dictionary"""
+        phases = {}
+        for name, (count, total, busy, longest) in sorted(self.phases.items()):
+            phases[name] = {
+                "count": count,
+                "total_s": round(total, 6),
+                "busy_s": round(busy, 6),
+                "mean_busy_ms": round(busy / count * 1000, 3),
+                "max_busy_ms": round(longest * 1000, 3)
+            }
+        
+        turns = sorted(self.turn_times)
+        percentiles = {}
+        if turns:
+            for p in (50, 95, 99):
+                index = min(len(turns) - 1, int(len(turns) * p / 100))
+                percentiles[f"p{p}_ms"] = round(turns[index] * 1000, 3)
+        
+        waiting = self.phases.get(INPUT, (0, 0.0))[1]
+        turn = self.phases.get("turn")
+        return {
+            "started": self.started,
+            "elapsed_s": round(time.perf_counter() - self._start, 3),
+            "turns": turn[0] if turn else 0,
+            # Engine time vs player think time over the whole session
+            "processing_s": round(turn[2], 6) if turn else 0.0,
+            "input_s": round(waiting, 6),
+            "turn_busy": percentiles,
+            "phases": phases,
+            "events": dict(self.events.most_common())
+        }
+    
+    def dump(self, path=None):
+        """Write a snapshot to a JSON file (default: dump_path)"""
+        path = path or self.dump_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atomic_write(path, json.dumps(self.snapshot(), indent=2, ensure_ascii=False))
+        self._last_dump = time.perf_counter()
+    
+    def maybe_dump(self, force=False):
+        """Dump to dump_path if dump_interval seconds passed since the last dump (or force)"""
+        if not self.dump_path:
+            return
+        if force or time.perf_counter() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+
+class _NullPhase:
+    """Timer that does nothing"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+class NullMetrics:
+    """Instrumentation turned off: the same interface, doing nothing"""
+    
+    enabled = False
+    
+    _phase = _NullPhase()
+    
+    def phase(self, name):
+        return self._phase
+    
+    def count_event(self, name):
+        pass
+    
+    def maybe_dump(self, force=False):
+        pass
+    
+    def dump(self, path=None):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+def from_environment(interval=30.0):
+    """LoopMetrics dumping to $SURVIVAL_METRICS, or NULL_METRICS if it is unset"""
+    path = os.environ.get("SURVIVAL_METRICS")
+    if not path:
+        return NULL_METRICS
+    return LoopMetrics(path, interval)
+
+
+def format_report(snapshot):
+    """Lines summarizing a snapshot"""
+    lines = [f"Session started {snapshot['started']}, {snapshot['turns']} turns, "
+             f"{snapshot['processing_s'] * 1000:.1f} ms processing, "
+             f"{snapshot['input_s']:.1f} s waiting on input"]
+    if snapshot["turn_busy"]:
+        lines.append("Turn processing: " + ", ".join(
+            f"{name[:-3]} {value:.3f} ms" for name, value in snapshot["turn_busy"].items()))
+    
+    lines.append("")
+    lines.append(f"{'phase':>10} {'count':>7} {'busy ms':>10} {'mean ms':>9} {'max ms':>9}")
+    phases = sorted(snapshot["phases"].items(), key=lambda item: -item[1]["busy_s"])
+    for name, stats in phases:
+        lines.append(f"{name:>10} {stats['count']:>7} {stats['busy_s'] * 1000:>10.2f} "
+                     f"{stats['mean_busy_ms']:>9.3f} {stats['max_busy_ms']:>9.3f}")
+    
+    if snapshot["events"]:
+        lines.append("")
+        lines.append("Events fired:")
+        for name, count in snapshot["events"].items():
+            lines.append(f"  {count:>5}  {name}")
+    return lines
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize a game loop metrics dump")
+    parser.add_argument("path", help="JSON file written with SURVIVAL_METRICS")
+    args = parser.parse_args()
+    
+    with open(args.path, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    print("\n".join(format_report(snapshot)))
+
+
+if __name__ == "__main__":
+    main()
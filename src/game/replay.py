@@ -0,0 +1,176 @@
+"""
+Replay of recorded game sessions.
+
+A session log (see action_log.py) holds the seed, the starting state and
+every choice of a session. Replaying it fast-forwards through the same
+rules as GameLoop with all rendering turned off, which rebuilds the state
+of any day of the session in milliseconds.
+
+Usage:
+    python -m src.game.replay logs/session-123.json
+    python -m src.game.replay logs/session-123.json --day 5
+    python -m src.game.replay logs/session-123.json --timeline
+"""
+
+import argparse
+import random
+import time
+
+from src.content.loader import default_content, world_content
+from src.entities.player import Player
+from src.game.action_log import ActionLog
+from src.simulation.headless import HeadlessGame
+
+
+class LogExhausted(Exception):
+    """Raised when a replay needs more input than the log recorded"""
+
+
+class LogPolicy:
+    """Policy answering with the entries of an action log, in order"""
+    
+    def __init__(self, entries, position=0):
+        self.entries = entries
+        self.position = position
+    
+    def _next(self):
+        if self.position >= len(self.entries):
+            raise LogExhausted()
+        entry = self.entries[self.position]
+        self.position += 1
+        return entry
+    
+    def choose_action(self, player, actions):
+        """Return the recorded action key, or None for a PASS iteration"""
+        entry = self._next()
+        return None if entry == ActionLog.PASS else entry
+    
+    def choose_event(self, event, player, exploring=False):
+        """Return the recorded option of a choice event"""
+        return self._next()
+
+
+class Replayer:
+    """
+    Rebuild the state of a recorded session at any day.
+    A checkpoint (player state, RNG state, log position) is kept every
+    `checkpoint_every` days while replaying, so once a day has been
+    reached, seeking anywhere replays at most that many days.
+    """
+    
+    def __init__(self, log, checkpoint_every=1):
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+        self.log = log
+        self.checkpoint_every = checkpoint_every
+        self.rng = random.Random(log.seed)
+        self.policy = LogPolicy(log.entries)
+        content = world_content() if log.world else None
+        self.game = HeadlessGame(self.policy, target_days=log.target_days, rng=self.rng,
+                                 content=content)
+        
+        # The map is generated again from the seed; checkpoints keep its snapshots
+        self.world = None
+        if log.world:
+            from src.systems.world import WorldMap
+            self.world = WorldMap(log.world.get("seed", log.seed),
+                                  position=log.world.get("position"))
+            self.game.action_manager.world = self.game.event_manager.world = self.world
+        
+        start = self._new_player(log.start_state)
+        self.start_day = start.day
+        self._checkpoints = {start.day: (start.get_state(), self.rng.getstate(), 0,
+                                         self._world_snapshot())}
+    
+    @staticmethod
+    def _new_player(state):
+        player = Player(state.get("name", "Adventurer"))
+        player.load_state(state)
+        return player
+    
+    def _world_snapshot(self):
+        return self.world.snapshot() if self.world is not None else None
+    
+    def seek(self, day):
+        """
+        Return (player, status) at the start of the given day, or where the
+        session stopped if it ended before that day. Status is "playing",
+        "won", "dead", or "ended" (the log stops there: the player quit).
+        """
+        reached = [d for d in self._checkpoints if d <= day]
+        base = max(reached) if reached else self.start_day
+        state, rng_state, position, world = self._checkpoints[base]
+        
+        player = self._new_player(state)
+        self.rng.setstate(rng_state)
+        self.policy.position = position
+        if self.world is not None:
+            self.world.restore(world)
+        return player, self._fast_forward(player, day)
+    
+    def replay(self):
+        """Replay the whole log. Return (player, status) at the end."""
+        return self.seek(float("inf"))
+    
+    def _fast_forward(self, player, day):
+        """Play logged turns until the player reaches day or the session stops"""
+        target_days = self.log.target_days
+        while player.day < day:
+            if player.day > target_days:
+                return "won"
+            if not player.is_alive():
+                return "dead"
+            try:
+                advanced = self.game.play_turn(player)
+            except LogExhausted:
+                return "ended"
+            
+            if (advanced and (player.day - self.start_day) % self.checkpoint_every == 0
+                    and player.day not in self._checkpoints):
+                self._checkpoints[player.day] = (player.get_state(), self.rng.getstate(),
+                                                 self.policy.position, self._world_snapshot())
+        
+        if player.day > target_days:
+            return "won"
+        if not player.is_alive():
+            return "dead"
+        return "playing"
+
+
+def _describe(player, status):
+    state = player.get_state()
+    return (f"Day {state['day']}: hunger {state['hunger']}, thirst {state['thirst']}, "
+            f"energy {state['energy']} ({status})")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Replay a recorded survival game session")
+    parser.add_argument("log", help="session log written by the game (logs/session-*.json)")
+    parser.add_argument("--day", type=int, default=None, help="show the state at the start of this day")
+    parser.add_argument("--timeline", action="store_true", help="show the state at the start of every day")
+    parser.add_argument("--checkpoint-every", type=int, default=1)
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    log = ActionLog.load(args.log)
+    replayer = Replayer(log, args.checkpoint_every)
+    
+    content = world_content() if log.world else default_content()
+    if log.content_digest and log.content_digest != content.digest:
+        print("⚠️  The content packs changed since this session was recorded: the replay may differ.")
+    
+    print(f"Session of {log.start_state.get('name', 'Adventurer')} started {log.started}, seed {log.seed}")
+    if args.timeline:
+        final_player, final_status = replayer.replay()
+        for day in range(replayer.start_day, final_player.day + 1):
+            print(_describe(*replayer.seek(day)))
+    elif args.day is not None:
+        print(_describe(*replayer.seek(args.day)))
+    else:
+        print(_describe(*replayer.replay()))
+    print(f"Replayed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
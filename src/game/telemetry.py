@@ -0,0 +1,293 @@
+"""
+Append-only telemetry of played games, and its analysis.
+
+GameLoop records one JSON object per line (JSON Lines) for each game:
+
+    {"type": "start", "session": 123, "name": "Bob", "day": 1, "hunger": 70, ...}
+    {"type": "day", "session": 123, "day": 1, "action": "2", "events": ["🌧️ Rain"],
+     "hunger": 60, "thirst": 85, "energy": 95}
+    {"type": "end", "session": 123, "outcome": "dead", "start_day": 1, "day": 4,
+     "cause": "Died of..."}
+    {"type": "rewind", "session": 123, "day": 5, "to": 2}
+
+Days record the action, the events applied since the previous day and
+the gauges at the end of the day; the outcome is "won", "dead" or "quit".
+A rewind (see history.py) records the day left and the day gone back to.
+Days are counted as played: the days a rewind discarded stay in the day
+count, the action mix and the events, and the report counts them apart.
+Lines are buffered and appended to telemetry.jsonl in one write, which
+is rotated to a timestamped file once it grows past max_bytes.
+
+The analyzer streams every line of the log files (plain or .gz) through
+generators, keeping only counters, so gigabytes of telemetry are read in
+constant memory; files are spread over a process pool. It reports the
+survival curve by day, the action mix and the death causes.
+
+Usage:
+    python -m src.game.telemetry logs/telemetry
+    python -m src.game.telemetry logs/telemetry/telemetry-*.jsonl.gz --json
+"""
+
+import gzip
+import json
+import os
+import time
+from collections import Counter
+
+
+DEFAULT_DIR = os.path.join("logs", "telemetry")
+
+
+class TelemetryWriter:
+    """
+    Buffered JSON Lines writer with size-based rotation.
+    Several processes may append to the same directory: each flush is a
+    single append, and rotated files are named after the time and the pid.
+    """
+    
+    FILENAME = "telemetry.jsonl"
+    
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=64 * 2**20, buffer_records=256):
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self.max_bytes = max_bytes
+        self.buffer_records = buffer_records
+        self._buffer = []
+    
+    def record(self, kind, **fields):
+        """Queue a record; written once the buffer is full or on flush"""
+        fields = {"type": kind, **fields}
+        self._buffer.append(json.dumps(fields, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if len(self._buffer) >= self.buffer_records:
+            self.flush()
+    
+    def flush(self):
+        """Append the buffered records. Raises OSError on failure."""
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer = []
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.directory, f"telemetry-{stamp}-{os.getpid()}")
+        rotated = f"{base}.jsonl"
+        number = 2
+        while os.path.exists(rotated):
+            # Rotated more than once within a second
+            rotated = f"{base}-{number}.jsonl"
+            number += 1
+        try:
+            os.replace(self.path, rotated)
+        except FileNotFoundError:
+            # Another process rotated it first
+            pass
+    
+    def close(self):
+        """Flush what is buffered"""
+        self.flush()
+
+
+def log_files(paths):
+    """Expand directories into their telemetry files, oldest first"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = [name for name in os.listdir(path) if name.startswith("telemetry")
+                     and name.endswith((".jsonl", ".jsonl.gz"))]
+            entries = [os.path.join(path, name) for name in names]
+            files.extend(sorted(entries, key=os.path.getmtime))
+        else:
+            files.append(path)
+    return files
+
+
+def iter_records(paths):
+    """Yield the records of telemetry files one at a time, skipping broken lines"""
+    for path in log_files(paths):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+
+
+class TelemetryReport:
+    """Counters aggregated from a stream of records"""
+    
+    def __init__(self):
+        self.sessions = 0
+        self.days = 0
+        
+        # Rewinds, and the days played again because of them
+        self.rewinds = 0
+        self.rewound_days = 0
+        self.outcomes = Counter()
+        self.death_causes = Counter()
+        self.actions = Counter()
+        self.events = Counter()
+        
+        # First and last day of finished games (the last day per outcome);
+        # a game that died on day d ends on day d + 1 (see GameLoop)
+        self.start_days = Counter()
+        self.final_days = {"won": Counter(), "dead": Counter(), "quit": Counter()}
+    
+    def add(self, record):
+        """Count one record"""
+        kind = record.get("type")
+        if kind == "day":
+            self.days += 1
+            self.actions[record.get("action")] += 1
+            self.events.update(record.get("events", ()))
+        elif kind == "end":
+            outcome = record.get("outcome")
+            self.outcomes[outcome] += 1
+            if outcome in self.final_days:
+                self.start_days[record.get("start_day", 1)] += 1
+                self.final_days[outcome][record.get("day", 1)] += 1
+            if outcome == "dead":
+                self.death_causes[record.get("cause")] += 1
+        elif kind == "start":
+            self.sessions += 1
+        elif kind == "rewind":
+            self.rewinds += 1
+            self.rewound_days += max(0, record.get("day", 1) - record.get("to", 1))
+    
+    def merge(self, other):
+        """Add the counts of another report to this one"""
+        self.sessions += other.sessions
+        self.days += other.days
+        self.rewinds += other.rewinds
+        self.rewound_days += other.rewound_days
+        for name in ("outcomes", "death_causes", "actions", "events", "start_days"):
+            getattr(self, name).update(getattr(other, name))
+        for outcome, counter in other.final_days.items():
+            self.final_days[outcome].update(counter)
+        return self
+    
+    def survival_curve(self):
+        """
+        Return [(day, share of players alive at the start of that day)],
+        Kaplan-Meier style: a game counts from its first day (loaded games
+        start later) until the day it ended; quitting is not dying.
+        """
+        finals = Counter()
+        for counter in self.final_days.values():
+            finals.update(counter)
+        if not finals:
+            return []
+        
+        curve = [(1, 1.0)]
+        alive = 1.0
+        started = ended = 0
+        for day in range(2, max(finals) + 1):
+            # Games playing the night from day - 1 to day
+            started += self.start_days[day - 1]
+            ended += finals[day - 1]
+            at_risk = started - ended
+            if at_risk > 0:
+                alive *= 1 - self.final_days["dead"][day] / at_risk
+            curve.append((day, alive))
+        return curve
+    
+    def to_dict(self):
+        """Return the report as a JSON-serializable dictionary"""
+        return {
+            "sessions": self.sessions,
+            "days": self.days,
+            "rewinds": self.rewinds,
+            "rewound_days": self.rewound_days,
+            "outcomes": dict(self.outcomes),
+            "survival": {day: round(alive, 4) for day, alive in self.survival_curve()},
+            "actions": dict(self.actions.most_common()),
+            "death_causes": dict(self.death_causes.most_common()),
+            "events": dict(self.events.most_common())
+        }
+    
+    def summary(self):
+        """Return a human readable summary"""
+        finished = sum(self.outcomes.values())
+        lines = [f"Sessions: {self.sessions} ({finished} finished), days played: {self.days}"]
+        if self.rewinds:
+            lines.append(f"  {self.rewinds} rewinds discarded {self.rewound_days} of those days")
+        for outcome, count in self.outcomes.most_common():
+            lines.append(f"  {outcome}: {count} ({count / finished:.2%})")
+        
+        lines.append("Survival (alive at the start of the day):")
+        for day, alive in self.survival_curve():
+            lines.append(f"  day {day:>3}: {alive:7.2%}  {'█' * round(alive * 40)}")
+        
+        lines.append("Action mix:")
+        for action, count in self.actions.most_common():
+            lines.append(f"  {action}: {count} ({count / self.days:.2%})")
+        
+        lines.append("Death causes:")
+        deaths = sum(self.death_causes.values())
+        for cause, count in self.death_causes.most_common():
+            lines.append(f"  {cause} {count} ({count / deaths:.2%})")
+        return "\n".join(lines)
+
+
+def analyze(records):
+    """Aggregate a stream of records into a TelemetryReport"""
+    report = TelemetryReport()
+    for record in records:
+        report.add(record)
+    return report
+
+
+def _analyze_file(path):
+    return analyze(iter_records([path]))
+
+
+def analyze_files(paths, workers=None):
+    """
+    Analyze telemetry files (or directories), one file per task over a
+    process pool: parsing JSON dominates, and rotation keeps files small
+    enough to spread. Return the merged TelemetryReport.
+    """
+    files = log_files(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        return analyze(iter_records(files))
+    
+    from concurrent.futures import ProcessPoolExecutor
+    report = TelemetryReport()
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        for partial in pool.map(_analyze_file, files):
+            report.merge(partial)
+    return report
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Analyze game telemetry (JSON Lines)")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_DIR],
+                        help="telemetry files or directories (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, one file each (default: CPU count)")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    report = analyze_files(args.paths, args.workers)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+        return
+    print(report.summary())
+    print(f"Analyzed in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Multi-session game server module"""
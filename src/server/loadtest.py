@@ -0,0 +1,223 @@
+"""
+Load test for the game server.
+
+Simulates many concurrent players on one machine. Each simulated player
+plays games back to back, answering every question with a random valid
+key after a think time, and measures the turn latency: the time from
+sending an answer to receiving the next question.
+
+By default the server runs in the same process. 10k TCP players then need
+about 20k file descriptors (raise `ulimit -n`, or start the server on its
+own and use --connect). --transport memory skips the sockets to measure
+the session loop alone.
+
+Usage:
+    python -m src.server.loadtest --players 10000 --duration 60
+    python -m src.server.loadtest --players 10000 --connect 127.0.0.1:7777
+    python -m src.server.loadtest --players 10000 --transport memory --think 0
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from src.content.loader import default_content
+from src.server.server import GameServer
+from src.server.session import PROMPT, GameSession, QueueChannel
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+# Answers picked by the simulated players (actions and event options)
+ANSWERS = ("1", "2", "3", "4")
+
+
+class LoadStats:
+    """Counters and turn latencies collected by the simulated players"""
+    
+    def __init__(self):
+        self.latencies = []
+        self.sessions = 0
+        self.errors = 0
+    
+    def summary(self, elapsed):
+        """Human readable report"""
+        lines = [
+            f"Sessions completed: {self.sessions}",
+            f"Turns: {len(self.latencies)} ({len(self.latencies) / elapsed:,.0f}/s)",
+        ]
+        if self.errors:
+            lines.append(f"Connection errors: {self.errors}")
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            def percentile(p):
+                return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+            lines.append("Turn latency: p50 {:.2f} ms, p90 {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms".format(
+                percentile(0.5), percentile(0.9), percentile(0.99), latencies[-1] * 1000))
+        return "\n".join(lines)
+
+
+def _answer(prompt, rng):
+    """Answer of a simulated player to a question"""
+    if prompt.startswith("Enter your name"):
+        return "Bot"
+    return rng.choice(ANSWERS)
+
+
+async def _think(think, rng):
+    # Spread the answers so the players do not move in lockstep
+    await asyncio.sleep(rng.uniform(0.5, 1.5) * think if think else 0)
+
+
+async def tcp_player(host, port, deadline, think, stats, rng):
+    """Play games over TCP until the deadline"""
+    prompt_mark = PROMPT.encode("utf-8")
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            stats.errors += 1
+            await asyncio.sleep(rng.uniform(0.1, 1.0))
+            continue
+        
+        sent_at = None
+        try:
+            while True:
+                # Skip the screen up to the question in one read
+                try:
+                    await reader.readuntil(prompt_mark)
+                except asyncio.IncompleteReadError:
+                    # Connection closed: the game is over
+                    stats.sessions += 1
+                    break
+                prompt = await reader.readline()
+                if sent_at is not None:
+                    stats.latencies.append(time.perf_counter() - sent_at)
+                if time.perf_counter() >= deadline:
+                    break
+                await _think(think, rng)
+                answer = _answer(prompt.decode("utf-8"), rng)
+                writer.write(f"{answer}\n".encode("utf-8"))
+                await writer.drain()
+                sent_at = time.perf_counter()
+        except OSError:
+            stats.errors += 1
+        finally:
+            writer.close()
+
+
+async def memory_player(content, deadline, think, stats, rng):
+    """Play games through in-memory channels until the deadline"""
+    while time.perf_counter() < deadline:
+        channel = QueueChannel()
+        session = asyncio.ensure_future(_closing(GameSession(channel, content).run(), channel))
+        sent_at = None
+        while True:
+            message = await channel.outbox.get()
+            if message is None:
+                stats.sessions += 1
+                break
+            text, prompt = message
+            if prompt is None:
+                continue
+            if sent_at is not None:
+                stats.latencies.append(time.perf_counter() - sent_at)
+            if time.perf_counter() >= deadline:
+                channel.inbox.put_nowait(None)
+                break
+            await _think(think, rng)
+            channel.inbox.put_nowait(_answer(prompt, rng))
+            sent_at = time.perf_counter()
+        await session
+
+
+async def _closing(session, channel):
+    """Run a session, then close its channel like the server does"""
+    await session
+    channel.close()
+
+
+def _raise_file_limit(players):
+    """Raise the open file limit as far as allowed for the sockets needed"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = 2 * players + 256
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            pass
+
+
+async def run_load_test(players, duration, think=1.0, transport="tcp", connect=None,
+                        ramp=5.0, seed=None):
+    """Run the load test. Return (LoadStats, elapsed seconds, server or None)."""
+    rng = random.Random(seed)
+    stats = LoadStats()
+    server = None
+    
+    if transport == "tcp":
+        if connect:
+            host, port = connect.rsplit(":", 1)
+            port = int(port)
+        else:
+            _raise_file_limit(players)
+            server = GameServer(port=0)
+            host, port = server.host, await server.start()
+    else:
+        content = default_content()
+    
+    start = time.perf_counter()
+    deadline = start + duration
+    tasks = []
+    for index in range(players):
+        player_rng = random.Random(rng.random())
+        if transport == "tcp":
+            coroutine = tcp_player(host, port, deadline, think, stats, player_rng)
+        else:
+            coroutine = memory_player(content, deadline, think, stats, player_rng)
+        tasks.append(asyncio.ensure_future(coroutine))
+        # Ramp up instead of opening every connection at once
+        if ramp and index % 100 == 99:
+            await asyncio.sleep(ramp * 100 / players)
+    
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        await server.close()
+    return stats, elapsed, server
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load test the survival game server")
+    parser.add_argument("--players", type=int, default=10000, help="concurrent simulated players")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="average seconds a player takes to answer")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds to connect every player")
+    parser.add_argument("--transport", choices=("tcp", "memory"), default="tcp")
+    parser.add_argument("--connect", default=None, metavar="HOST:PORT",
+                        help="test a running server instead of an in-process one")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    stats, elapsed, server = asyncio.run(run_load_test(
+        args.players, args.duration, args.think, args.transport, args.connect,
+        args.ramp, args.seed))
+    
+    print(f"{args.players} players over {args.transport} for {elapsed:.1f}s")
+    print(stats.summary(elapsed))
+    if server is not None:
+        print(f"Peak concurrent sessions: {server.peak}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Line-based TCP game server.
+
+Each connection plays one GameSession, all of them on a single asyncio
+event loop. The server sends text lines; a line starting with "?> " asks
+a question and expects one line in reply. Any line-oriented client works,
+e.g. `nc localhost 7777`. Won and lost games are appended to the run
+history of the leaderboards (see src/utils/run_history.py). With
+SURVIVAL_METRICS set, every session is timed (its waits on the player
+count as input, not processing) and the server dumps the sum of the
+finished sessions there (see src/game/metrics.py).
+
+Usage:
+    python -m src.server.server --port 7777
+"""
+
+import argparse
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from src.content.loader import default_content
+from src.game.metrics import LoopMetrics, from_environment
+from src.server.session import GameSession, StreamChannel
+from src.utils.run_history import RunHistory
+
+
+class GameServer:
+    """Hosts one game session per TCP connection"""
+    
+    # Seconds a player may take to answer before being disconnected
+    IDLE_TIMEOUT = 600
+    
+    def __init__(self, host="127.0.0.1", port=7777, content=None, idle_timeout=IDLE_TIMEOUT,
+                 run_history=None, metrics=None):
+        self.host = host
+        self.port = port
+        self.content = content if content is not None else default_content()
+        self.idle_timeout = idle_timeout
+        self.server = None
+        
+        # Where finished runs are appended (None: not recorded), from a thread
+        # of its own: commits must not stall the event loop, and the SQLite
+        # connection stays on the thread that opened it
+        self.run_history = run_history
+        self._recorder = None
+        
+        # Sum of the metrics of the finished sessions: a LoopMetrics, or from
+        # $SURVIVAL_METRICS (off by default); each session times its own
+        self.metrics = metrics if metrics is not None else from_environment()
+        
+        # Counters for monitoring and load tests
+        self.active = 0
+        self.peak = 0
+        self.sessions = 0
+        self.turns = 0
+    
+    async def start(self):
+        """Start listening. Return the bound port (useful with port 0)."""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                 backlog=4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+    
+    async def serve_forever(self):
+        """Start if needed and serve until cancelled"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+    
+    async def close(self):
+        """Stop accepting connections, then close the run history"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.metrics.maybe_dump(force=True)
+        await self.close_run_history()
+    
+    async def close_run_history(self):
+        """Wait for the runs being recorded, and close the run history"""
+        if self._recorder is None:
+            return
+        await asyncio.get_running_loop().run_in_executor(self._recorder, self.run_history.close)
+        self._recorder.shutdown()
+        self._recorder = None
+    
+    async def _handle(self, reader, writer):
+        channel = StreamChannel(reader, writer, self.idle_timeout)
+        metrics = LoopMetrics() if self.metrics.enabled else None
+        session = GameSession(channel, self.content, metrics=metrics)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            status = await session.run()
+        finally:
+            self.active -= 1
+            self.sessions += 1
+            self.turns += session.turns
+            channel.close()
+            if metrics is not None:
+                self.metrics.merge(metrics)
+                self.metrics.maybe_dump()
+        if status in ("won", "dead"):
+            await self._record_run(session, status)
+    
+    async def _record_run(self, session, status):
+        """Append a finished session to the run history, if there is one"""
+        if self.run_history is None:
+            return
+        if self._recorder is None:
+            self._recorder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-history")
+        player = session.player
+        cause = player.get_death_cause() if status == "dead" else None
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._recorder, self.run_history.add, player.name, status, player.day - 1, cause,
+                session.seed)
+        except (sqlite3.Error, OSError) as e:
+            print(f"❌ Error while recording a run: {e}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Host survival game sessions over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--idle-timeout", type=float, default=GameServer.IDLE_TIMEOUT,
+                        help="seconds before an idle player is disconnected")
+    parser.add_argument("--runs", default=RunHistory.PATH,
+                        help="run history of the leaderboards (default: %(default)s)")
+    parser.add_argument("--no-runs", action="store_true", help="do not record finished runs")
+    args = parser.parse_args()
+    
+    # Commits skip the fsync (WAL, synchronous=NORMAL): a power failure only
+    # loses the last runs
+    run_history = None if args.no_runs else RunHistory(args.runs, synchronous="NORMAL")
+    server = GameServer(args.host, args.port, idle_timeout=args.idle_timeout,
+                        run_history=run_history)
+    
+    async def run():
+        port = await server.start()
+        print(f"Survival game server listening on {args.host}:{port}")
+        try:
+            await server.serve_forever()
+        finally:
+            server.metrics.maybe_dump(force=True)
+            await server.close_run_history()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(f"\nServer stopped after {server.sessions} sessions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Game sessions driven by asyncio.
+
+A GameSession runs the day cycle of GameLoop as a coroutine: it plays
+GameLoop.play, a dialogue (see src/utils/dialogue.py), and every question
+it asks goes through a Channel, so a single event loop can host thousands
+of sessions at once with the same rules as the terminal game.
+"""
+
+import asyncio
+import io
+import random
+from functools import partial
+
+from src.content.loader import default_content
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.game.metrics import INPUT, NULL_METRICS
+from src.ui.display import Display
+from src.ui.renderer import FrameRenderer
+from src.utils.dialogue import Pause
+
+
+# Marks the line asking for input, so clients know when to answer
+PROMPT = "?> "
+
+
+class SessionClosed(Exception):
+    """Raised when the other end of a channel went away"""
+
+
+class Channel:
+    """Two-way text channel between a session and its player"""
+    
+    async def send(self, text):
+        """Send text to the player"""
+        raise NotImplementedError
+    
+    async def ask(self, text, prompt):
+        """Send text, then ask a question; return the answer line (stripped)"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Close the channel"""
+
+
+class StreamChannel(Channel):
+    """
+    Channel over an asyncio stream pair (a TCP connection).
+    Text goes out as lines; a question is a line starting with PROMPT,
+    answered by one line. A player who takes longer than timeout seconds to
+    answer, or to read what was sent, is disconnected.
+    """
+    
+    def __init__(self, reader, writer, timeout=None):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+    
+    def _deadline(self):
+        # A timer dropping the connection is much cheaper than wait_for,
+        # which wraps every read in a new task
+        if self.timeout is None:
+            return None
+        return asyncio.get_running_loop().call_later(self.timeout, self.writer.transport.abort)
+    
+    async def send(self, text):
+        if not text:
+            return
+        self.writer.write(text.encode("utf-8"))
+        timer = self._deadline()
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            raise SessionClosed()
+        finally:
+            if timer is not None:
+                timer.cancel()
+    
+    async def ask(self, text, prompt):
+        self.writer.write(f"{text}{PROMPT}{prompt}\n".encode("utf-8"))
+        timer = self._deadline()
+        try:
+            await self.writer.drain()
+            line = await self.reader.readline()
+        except (ConnectionError, ValueError):
+            # ValueError: line longer than the stream limit
+            raise SessionClosed()
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if not line:
+            raise SessionClosed()
+        return line.decode("utf-8", "replace").strip()
+    
+    def close(self):
+        self.writer.close()
+
+
+class QueueChannel(Channel):
+    """
+    In-memory channel, for load tests without sockets.
+    The session puts (text, prompt) pairs on outbox (prompt is None for
+    plain text, and the pair is None once the session is over) and reads
+    the answers from inbox.
+    """
+    
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.outbox = asyncio.Queue()
+    
+    async def send(self, text):
+        if text:
+            self.outbox.put_nowait((text, None))
+    
+    async def ask(self, text, prompt):
+        self.outbox.put_nowait((text, prompt))
+        answer = await self.inbox.get()
+        if answer is None:
+            raise SessionClosed()
+        return answer.strip()
+    
+    def close(self):
+        self.outbox.put_nowait(None)
+
+
+class SessionLoop(GameLoop):
+    """
+    GameLoop as hosted by the server: a session writes nothing to the
+    server's disk (no saves, session logs, telemetry or world map diffs,
+    the map of SURVIVAL_WORLD staying in memory), and the server appends
+    the finished runs to the run history and the session's metrics to its
+    own (see GameServer).
+    """
+    
+    AUTOSAVE = False
+    SAVES = False
+    SESSION_LOG = False
+    TELEMETRY = False
+    RUN_HISTORY = False
+    WORLD = False
+    WORLD_DIR = None
+
+
+class GameSession:
+    """One player's game, from the name prompt to victory, death or quit"""
+    
+    def __init__(self, channel, content=None, seed=None, metrics=None):
+        self.channel = channel
+        self.content = content if content is not None else default_content()
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.player = None
+        self.loop = None
+        
+        # This session's LoopMetrics (never read from the environment: the
+        # server keeps the sum of its sessions'), waits on answers as input
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        
+        # Screens are composed here, then sent with the next question
+        self._screen = io.StringIO()
+        self.display = Display(FrameRenderer(self._screen, ansi=False))
+        self.output = partial(print, file=self._screen)
+        
+        # Number of answers received (turn count for load tests)
+        self.turns = 0
+    
+    def _take_screen(self):
+        text = self._screen.getvalue()
+        self._screen.seek(0)
+        self._screen.truncate()
+        return text
+    
+    async def _ask(self, prompt):
+        answer = await self.channel.ask(self._take_screen(), prompt)
+        self.turns += 1
+        return answer
+    
+    async def run(self):
+        """Play the session. Return "won", "dead", "quit" or "disconnected"."""
+        try:
+            status = await self._play()
+            await self.channel.send(self._take_screen())
+            return status
+        except SessionClosed:
+            return "disconnected"
+    
+    async def _play(self):
+        name = (await self._ask("Enter your name (or Enter for 'Adventurer'):"))[:30]
+        self.player = Player(name or "Adventurer")
+        self.output(f"\nWelcome {self.player.name}! 🏝️")
+        self.output("You wake up on a deserted island...")
+        
+        # The day cycle of GameLoop, answered over the channel
+        self.loop = SessionLoop(self.player, self.seed, content=self.content,
+                                display=self.display, output=self.output, metrics=self.metrics)
+        dialogue = self.loop.play()
+        metrics = self.metrics
+        try:
+            prompt = next(dialogue)
+            while True:
+                # A pause only lets the player read: its text goes with the next question
+                if isinstance(prompt, Pause):
+                    answer = ""
+                else:
+                    with metrics.phase(INPUT):
+                        answer = await self._ask(prompt.strip())
+                prompt = dialogue.send(answer)
+        except StopIteration:
+            return self.loop.outcome
+        finally:
+            # Closed connection: abandon the game (GameLoop releases what it holds)
+            dialogue.close()
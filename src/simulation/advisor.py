@@ -0,0 +1,156 @@
+"""
+Monte Carlo advisor: each action's chance of winning from the current state.
+
+For every action, rollouts play that action today, then the greedy policy
+until victory or death, with the rules of the headless game. Rollouts run
+on a worker thread within a time budget; their counts go to a bounded LRU
+transposition table keyed by (day, hunger, thirst, energy), so a state
+seen before is answered at once, and refined further until it reaches
+ROLLOUTS per action. The rollouts draw from their own RNG, so asking for
+advice never changes the game's random sequence.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.simulation.headless import HeadlessGame
+from src.simulation.policies import GreedyPolicy
+
+
+def state_key(player):
+    """Transposition table key of a player state"""
+    return (player.day, player.hunger, player.thirst, player.energy)
+
+
+class TranspositionTable:
+    """Bounded LRU mapping of state keys to {action key: [wins, rollouts]}"""
+    
+    def __init__(self, size=4096):
+        self.size = size
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key):
+        """Return a state's counts (marking it recently used), or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def setdefault(self, key, actions):
+        """Return a state's counts, adding empty ones for new states"""
+        entry = self.get(key)
+        if entry is None:
+            entry = self._entries[key] = {action: [0, 0] for action in actions}
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+
+class Advisor:
+    """
+    Estimates the chance of winning of each action (see the module
+    docstring). estimate() never waits longer than the time budget: it
+    returns what the rollouts found by then.
+    """
+    
+    # Rollouts per action after which a state is not refined further
+    ROLLOUTS = 500
+    
+    # Rollouts per action between two publications of the counts
+    ROUND = 8
+    
+    def __init__(self, content=None, target_days=GameLoop.TARGET_DAYS, budget=0.05,
+                 table_size=4096, seed=None, policy=None):
+        self.budget = budget
+        self.game = HeadlessGame(policy or GreedyPolicy(), target_days,
+                                 rng=random.Random(seed), content=content)
+        self.actions = tuple(self.game.action_manager.actions)
+        self.table = TranspositionTable(table_size)
+        
+        # Rollouts run on a scratch player
+        self._player = Player()
+        
+        self._condition = threading.Condition()
+        self._pending = None
+        self._finished = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="advisor", daemon=True)
+        self._thread.start()
+    
+    def _complete(self, entry):
+        return all(runs >= self.ROLLOUTS for _, runs in entry.values())
+    
+    def estimate(self, player, timeout=None):
+        """
+        Return {action key: chance of winning} for a player state, waiting
+        at most timeout seconds (default: the budget) for the rollouts.
+        Actions without any rollout yet are left out; None if no advice.
+        """
+        if not player.is_alive() or player.day > self.game.target_days:
+            return None
+        
+        key = state_key(player)
+        timeout = self.budget if timeout is None else timeout
+        with self._condition:
+            entry = self.table.get(key)
+            if entry is None or not self._complete(entry):
+                self._pending = key
+                self._finished = None
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._finished == key, timeout)
+                entry = self.table.get(key)
+            if entry is None:
+                return None
+            rates = {action: wins / runs for action, (wins, runs) in entry.items() if runs}
+        return rates or None
+    
+    def _rollout(self, key, action):
+        """Play an action from a state, then the policy to the end. Return True if won."""
+        player = self._player
+        player.day, player.hunger, player.thirst, player.energy = key
+        self.game.play_action(player, action)
+        if player.day > self.game.target_days:
+            return True
+        if not player.is_alive():
+            return False
+        return self.game.play(player)[1]
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._closed:
+                    return
+                key = self._pending
+                self._pending = None
+                entry = self.table.setdefault(key, self.actions)
+            
+            deadline = time.perf_counter() + self.budget
+            while True:
+                wins = {action: sum(self._rollout(key, action) for _ in range(self.ROUND))
+                        for action in self.actions}
+                with self._condition:
+                    for action, won in wins.items():
+                        entry[action][0] += won
+                        entry[action][1] += self.ROUND
+                    if (self._pending is not None or self._closed or self._complete(entry)
+                            or time.perf_counter() >= deadline):
+                        break
+            
+            with self._condition:
+                self._finished = key
+                self._condition.notify_all()
+    
+    def close(self):
+        """Stop the worker thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
@@ -0,0 +1,139 @@
+"""
+Tunable rules as one config object.
+
+The tunables live where the rules use them: TARGET_DAYS and
+DAILY_EVENT_CHANCE on GameLoop, the daily decays on Player, the event gate
+on EventManager, and the costs, success rates, yields and event
+probabilities in the content packs. GameConfig gathers them into a flat
+mapping of parameter paths to values:
+
+    target_days                   days to survive
+    daily_event_chance            chance to roll for a morning event
+    event_chance                  chance that a roll yields an event
+    decay.hunger / .thirst / .energy
+    action.<key>.cost / .success_rate / .yield_min / .yield_max
+    event.<name>.probability
+
+and builds headless games playing by those values, without touching the
+defaults. Its digest identifies the config together with the rules code
+(RULES_VERSION) and the content packs, for caching results.
+"""
+
+import copy
+import hashlib
+import json
+
+from src.content.loader import ContentPack, default_content
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.simulation.headless import HeadlessGame
+from src.systems.events import EventManager
+
+
+# Bump when the rules code changes (Player, ActionManager, EventManager,
+# HeadlessGame) or what its results count, so results cached under older
+# rules are not reused
+RULES_VERSION = 2
+
+
+class GameConfig:
+    """
+    Values of every tunable (see the module docstring).
+    Unknown parameters raise KeyError, so typos do not go unnoticed.
+    """
+    
+    def __init__(self, values=None, content=None):
+        self.base = content if content is not None else default_content()
+        self.values = self.defaults(self.base)
+        if values:
+            self.update(values)
+    
+    @staticmethod
+    def defaults(content):
+        """The values the game uses, as {parameter: value}"""
+        values = {
+            "target_days": GameLoop.TARGET_DAYS,
+            "daily_event_chance": GameLoop.DAILY_EVENT_CHANCE,
+            "event_chance": EventManager.EVENT_CHANCE,
+            "decay.hunger": Player.HUNGER_DECAY,
+            "decay.thirst": Player.THIRST_DECAY,
+            "decay.energy": Player.ENERGY_DECAY
+        }
+        for spec in content.actions:
+            values[f"action.{spec.key}.cost"] = spec.cost
+            if spec.yield_gauge:
+                values[f"action.{spec.key}.success_rate"] = spec.success_rate
+                values[f"action.{spec.key}.yield_min"] = spec.yield_range[0]
+                values[f"action.{spec.key}.yield_max"] = spec.yield_range[1]
+        for event in content.events:
+            values[f"event.{event['name']}.probability"] = event["probability"]
+        return values
+    
+    def update(self, values):
+        """Change some parameters in place"""
+        for name, value in values.items():
+            if name not in self.values:
+                raise KeyError(f"unknown parameter '{name}'")
+            self.values[name] = value
+    
+    def replace(self, values):
+        """Return a copy with some parameters changed"""
+        config = copy.copy(self)
+        config.values = dict(self.values)
+        config.update(values)
+        return config
+    
+    def __getitem__(self, name):
+        return self.values[name]
+    
+    def changes(self):
+        """Parameters that differ from the defaults"""
+        defaults = self.defaults(self.base)
+        return {name: value for name, value in self.values.items() if defaults[name] != value}
+    
+    def digest(self, **extra):
+        """
+        SHA-256 identifying this config under the current rules and
+        content packs; extra (episodes, seed...) is hashed along
+        """
+        document = {"rules": RULES_VERSION, "content": self.base.digest,
+                    "values": self.values, "extra": extra}
+        text = json.dumps(document, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def content(self):
+        """The content packs with this config's costs, rates, yields and probabilities"""
+        actions = []
+        for spec in self.base.actions:
+            spec = copy.copy(spec)
+            prefix = f"action.{spec.key}."
+            spec.cost = self.values[prefix + "cost"]
+            if spec.yield_gauge:
+                spec.success_rate = self.values[prefix + "success_rate"]
+                spec.yield_range = (self.values[prefix + "yield_min"],
+                                    self.values[prefix + "yield_max"])
+            actions.append(spec)
+        
+        events = []
+        for event in self.base.events:
+            event = dict(event)
+            event["probability"] = self.values[f"event.{event['name']}.probability"]
+            events.append(event)
+        return ContentPack(actions, events, self.base.digest)
+    
+    def player_class(self):
+        """A Player subclass decaying by this config's values"""
+        return type("ConfiguredPlayer", (Player,), {
+            "__slots__": (),
+            "HUNGER_DECAY": self.values["decay.hunger"],
+            "THIRST_DECAY": self.values["decay.thirst"],
+            "ENERGY_DECAY": self.values["decay.energy"]
+        })
+    
+    def new_game(self, policy, rng=None):
+        """A HeadlessGame playing by this config"""
+        game = HeadlessGame(policy, self.values["target_days"], rng, self.content())
+        game.daily_event_chance = self.values["daily_event_chance"]
+        game.event_manager.EVENT_CHANCE = self.values["event_chance"]
+        game.new_player = self.player_class()
+        return game
@@ -0,0 +1,295 @@
+"""
+Win rate estimation to a requested precision.
+
+Instead of a fixed number of episodes, episodes are played in batches
+until the confidence interval of the estimate is narrow enough. Two
+variance reduction techniques cut the number of episodes needed:
+
+- Antithetic draws: episodes come in pairs, the second one replaying the
+  seed of the first with mirrored draws (u -> 1 - u for random(), k ->
+  a + b - k for randint), so a lucky episode tends to be paired with an
+  unlucky one. The pair average varies less than two independent games
+  when winning is monotone in the draws. With the base rules it is not
+  (a mirrored draw picks an unrelated event from the alias table, and
+  the policy adapts to the yields): pairs measured a correlation of
+  -0.03, no gain, so antithetic draws are off by default.
+- Common random numbers: when comparing two rule sets or policies, both
+  play every episode from the same seed, so the difference only reflects
+  the change being measured, not the luck of the draws. For a one point
+  change of the thirst decay this cuts the episodes needed about 3.5x.
+
+Both stay unbiased: each episode on its own is an ordinary game. Policies
+drawing from the global random module (RandomPolicy) get the same seed
+in both arms, but their draws are not mirrored.
+
+Intervals are Agresti-Coull style: the variance is that of the sampled
+units plus z² pseudo-units, half at each end of their range (for single
+episodes, exactly the Agresti-Coull interval). A run of identical units,
+such as 2,000 lost games or pairs that never diverge, then still has an
+interval as wide as its size warrants instead of none.
+
+Usage:
+    python -m src.simulation.estimate --policy greedy --half-width 0.005
+    python -m src.simulation.estimate --policy greedy --antithetic
+    python -m src.simulation.estimate --compare-set decay.thirst=16
+    python -m src.simulation.estimate --policy greedy --compare-policy random
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+from src.simulation.config import GameConfig
+from src.simulation.headless import HeadlessGame
+from src.simulation.policies import POLICIES
+
+
+class AntitheticRandom(random.Random):
+    """random.Random whose random() and randint() mirror those of the same seed"""
+    
+    def random(self):
+        return 1.0 - super().random()
+    
+    def randint(self, a, b):
+        return a + b - super().randint(a, b)
+
+
+class Arm:
+    """One side of a measurement: a policy playing by a config"""
+    
+    def __init__(self, policy, config=None, antithetic=False):
+        rng = AntitheticRandom() if antithetic else random.Random()
+        if config is not None:
+            self.game = config.new_game(policy, rng)
+        else:
+            self.game = HeadlessGame(policy, rng=rng)
+        self.episodes = 0
+        self.wins = 0
+    
+    def play(self, seed):
+        """Play one episode from a seed; return 1 if won, else 0"""
+        game = self.game
+        game.rng.seed(seed)
+        # Policies such as RandomPolicy draw from the global random module
+        random.seed(seed)
+        player = game.new_player()
+        won = 0
+        while player.is_alive():
+            if game.play_turn(player) and player.day > game.target_days:
+                won = 1
+                break
+        self.episodes += 1
+        self.wins += won
+        return won
+
+
+class Estimate:
+    """Mean of a sampled quantity with its confidence interval"""
+    
+    def __init__(self, mean, half_width, episodes, confidence, converged, elapsed,
+                 efficiency=None):
+        self.mean = mean
+        self.half_width = half_width
+        self.episodes = episodes
+        self.confidence = confidence
+        self.converged = converged
+        self.elapsed = elapsed
+        
+        # Episodes plain independent sampling would need for the same
+        # precision, per episode actually played
+        self.efficiency = efficiency
+    
+    @property
+    def low(self):
+        return self.mean - self.half_width
+    
+    @property
+    def high(self):
+        return self.mean + self.half_width
+    
+    def __str__(self):
+        text = (f"{self.mean:.4f} ± {self.half_width:.4f} ({self.confidence:.0%} CI) "
+                f"after {self.episodes:,} episodes in {self.elapsed:.2f}s")
+        if self.efficiency:
+            text += f", variance reduction x{self.efficiency:.1f}"
+        if not self.converged:
+            text += " (episode limit reached before the requested precision)"
+        return text
+
+
+class _Stats:
+    """Running mean and variance (Welford)"""
+    
+    __slots__ = ("n", "mean", "m2")
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+    
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+
+def _half_width(stats, z, low, high):
+    """
+    Half width of the interval of the mean of units within [low, high]:
+    the sample plus z² pseudo-units, half at low and half at high
+    """
+    pseudo = z * z
+    n = stats.n + pseudo
+    center = (low + high) / 2
+    m2 = (stats.m2 + pseudo * ((high - low) / 2) ** 2
+          + stats.n * pseudo / n * (stats.mean - center) ** 2)
+    return z * math.sqrt(m2 / (n - 1) / n)
+
+
+def _sample(unit, per_unit, bounds, half_width, confidence, min_episodes, max_episodes,
+            seed, batch):
+    """
+    Draw units (per_unit episodes each, from one seed, valued within
+    bounds) until the interval of their mean is within half_width.
+    Return (stats, interval half width, episodes, converged).
+    """
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    seeder = random.Random(seed)
+    stats = _Stats()
+    episodes = 0
+    while True:
+        for _ in range(max(1, batch // per_unit)):
+            stats.add(unit(seeder.getrandbits(64)))
+        episodes = stats.n * per_unit
+        width = _half_width(stats, z, *bounds)
+        if episodes >= min_episodes and width <= half_width:
+            return stats, width, episodes, True
+        if episodes >= max_episodes:
+            return stats, width, episodes, False
+
+
+def estimate_win_rate(policy, config=None, half_width=0.005, confidence=0.95,
+                      antithetic=False, min_episodes=2000, max_episodes=10_000_000,
+                      seed=None, batch=1000):
+    """
+    Estimate a policy's win rate under a config (None: the game's rules)
+    to within ±half_width at the given confidence. Return an Estimate.
+    """
+    start = time.perf_counter()
+    arm = Arm(policy, config)
+    if antithetic:
+        mirror = Arm(policy, config, antithetic=True)
+        unit, per_unit = (lambda s: (arm.play(s) + mirror.play(s)) / 2), 2
+    else:
+        unit, per_unit = arm.play, 1
+    
+    stats, width, episodes, converged = _sample(unit, per_unit, (0, 1), half_width, confidence,
+                                                min_episodes, max_episodes, seed, batch)
+    p = stats.mean
+    plain = p * (1 - p)
+    used = stats.variance * per_unit
+    return Estimate(p, width, episodes, confidence, converged, time.perf_counter() - start,
+                    plain / used if used else None)
+
+
+def compare_win_rates(policy_a, policy_b, config_a=None, config_b=None, half_width=0.005,
+                      confidence=0.95, antithetic=False, common=True, min_episodes=2000,
+                      max_episodes=10_000_000, seed=None, batch=1000):
+    """
+    Estimate win rate A - win rate B to within ±half_width, using common
+    random numbers (both arms play every seed) unless common is False.
+    Episodes count the games of both arms. Return an Estimate.
+    """
+    start = time.perf_counter()
+    arms = [Arm(policy_a, config_a), Arm(policy_b, config_b)]
+    if antithetic:
+        arms += [Arm(policy_a, config_a, antithetic=True), Arm(policy_b, config_b, antithetic=True)]
+    
+    if common:
+        def seeds(s):
+            return s, s
+    else:
+        def seeds(s):
+            return s, s ^ 0x5DEECE66D
+    
+    if antithetic:
+        def unit(s):
+            a, b = seeds(s)
+            return ((arms[0].play(a) + arms[2].play(a)) - (arms[1].play(b) + arms[3].play(b))) / 2
+        per_unit = 4
+    else:
+        def unit(s):
+            a, b = seeds(s)
+            return arms[0].play(a) - arms[1].play(b)
+        per_unit = 2
+    
+    stats, width, episodes, converged = _sample(unit, per_unit, (-1, 1), half_width, confidence,
+                                                min_episodes, max_episodes, seed, batch)
+    
+    # Variance of the difference of one plain episode per side, from the
+    # win rates seen (each side is a Bernoulli draw per episode)
+    p_a = sum(arm.wins for arm in arms[0::2]) / sum(arm.episodes for arm in arms[0::2])
+    p_b = sum(arm.wins for arm in arms[1::2]) / sum(arm.episodes for arm in arms[1::2])
+    plain = p_a * (1 - p_a) + p_b * (1 - p_b)
+    used = stats.variance * per_unit / 2
+    return Estimate(stats.mean, width, episodes, confidence, converged,
+                    time.perf_counter() - start, plain / used if used else None)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Estimate win rates to a requested precision")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="rule tunable of the (first) config, see sweep.py --list")
+    parser.add_argument("--compare-policy", choices=sorted(POLICIES),
+                        help="compare with another policy")
+    parser.add_argument("--compare-set", action="append", default=[], metavar="NAME=VALUE",
+                        help="compare with the config changed this way")
+    parser.add_argument("--half-width", type=float, default=0.005,
+                        help="half width of the confidence interval (default: %(default)s)")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--max-episodes", type=int, default=10_000_000)
+    parser.add_argument("--antithetic", action="store_true",
+                        help="play episodes in mirrored pairs (see the module docstring)")
+    parser.add_argument("--no-common", action="store_true",
+                        help="compare with independent seeds for the two sides")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    def parse(options):
+        values = {}
+        for option in options:
+            name, _, value = option.partition("=")
+            values[name] = float(value) if "." in value else int(value)
+        return values
+    
+    try:
+        config_a = GameConfig(parse(args.set))
+        config_b = config_a.replace(parse(args.compare_set))
+    except (KeyError, ValueError) as e:
+        raise SystemExit(f"❌ {e}")
+    
+    options = dict(half_width=args.half_width, confidence=args.confidence,
+                   antithetic=args.antithetic, max_episodes=args.max_episodes,
+                   seed=args.seed)
+    if args.compare_policy or args.compare_set:
+        policy_b = args.compare_policy or args.policy
+        estimate = compare_win_rates(POLICIES[args.policy](), POLICIES[policy_b](),
+                                     config_a, config_b, common=not args.no_common, **options)
+        print(f"Win rate difference ({args.policy} - {policy_b}"
+              f"{', changed config' if args.compare_set else ''}): {estimate}")
+    else:
+        estimate = estimate_win_rate(POLICIES[args.policy](), config_a, **options)
+        print(f"Win rate ({args.policy}): {estimate}")
+
+
+if __name__ == "__main__":
+    main()
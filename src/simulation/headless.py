@@ -0,0 +1,253 @@
+"""
+Headless batch simulation of the day cycle.
+
+Runs many games without any input() or print, using the same Player,
+ActionManager and EventManager rules as GameLoop. A policy object stands
+in for the keyboard (see src/simulation/policies.py). Batches start from
+new players, or from the players of a PlayerPool (see run_pool).
+
+Usage:
+    python -m src.simulation.headless --episodes 1000000 --policy greedy
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.simulation.policies import POLICIES
+from src.systems.actions import ActionManager
+from src.systems.events import EventManager
+
+
+class BatchResult:
+    """Aggregated outcome of a batch of episodes"""
+    
+    def __init__(self):
+        self.episodes = 0
+        self.wins = 0
+        self.death_causes = Counter()
+        self.days_survived = Counter()
+    
+    @property
+    def win_rate(self):
+        """Fraction of episodes won"""
+        return self.wins / self.episodes if self.episodes else 0.0
+    
+    @property
+    def average_days(self):
+        """Average number of full days survived"""
+        if not self.episodes:
+            return 0.0
+        total = sum(days * count for days, count in self.days_survived.items())
+        return total / self.episodes
+    
+    def record(self, player, won, target_days):
+        """Record the outcome of one finished episode"""
+        self.episodes += 1
+        if won:
+            self.wins += 1
+            self.days_survived[target_days] += 1
+        else:
+            # Full days survived: the player dies at the end of a day, on the
+            # next one (like the run history and the telemetry count them)
+            self.death_causes[player.get_death_cause()] += 1
+            self.days_survived[player.day - 1] += 1
+    
+    def merge(self, other):
+        """Add the counts of another result to this one"""
+        self.episodes += other.episodes
+        self.wins += other.wins
+        self.death_causes.update(other.death_causes)
+        self.days_survived.update(other.days_survived)
+        return self
+    
+    def summary(self):
+        """Return a human readable summary"""
+        lines = [
+            f"Episodes: {self.episodes}",
+            f"Win rate: {self.win_rate:.2%}",
+            f"Average days survived: {self.average_days:.2f}",
+            "Death causes:"
+        ]
+        for cause, count in self.death_causes.most_common():
+            lines.append(f"  {cause} {count} ({count / self.episodes:.2%})")
+        lines.append("Days survived:")
+        for days in sorted(self.days_survived):
+            lines.append(f"  {days}: {self.days_survived[days]}")
+        return "\n".join(lines)
+
+
+class HeadlessGame:
+    """
+    Play the GameLoop day cycle without any I/O.
+    The policy picks the daily action and the option of choice events
+    (told whether the event was met while exploring or in the morning).
+    All the rules draw from rng (the random module if None).
+    """
+    
+    def __init__(self, policy, target_days=GameLoop.TARGET_DAYS, rng=None, content=None):
+        self.policy = policy
+        self.target_days = target_days
+        self.rng = rng if rng is not None else random
+        self.action_manager = ActionManager(content, rng=self.rng)
+        self.event_manager = EventManager(content, rng=self.rng)
+        
+        # Changed by GameConfig.new_game (see config.py)
+        self.daily_event_chance = GameLoop.DAILY_EVENT_CHANCE
+        self.new_player = Player
+    
+    def play(self, player=None):
+        """
+        Play one episode until victory or death.
+        Return a (player, won) tuple.
+        """
+        if player is None:
+            player = self.new_player()
+        
+        while player.is_alive():
+            if self.play_turn(player) and player.day > self.target_days:
+                return player, True
+        
+        return player, False
+    
+    def play_turn(self, player):
+        """
+        Play one iteration of the GameLoop.start loop.
+        A policy may return None instead of an action key for iterations
+        where no action is taken (save, invalid input, cancelled quit):
+        the morning event roll still happens but the day does not advance.
+        Return True if the day advanced.
+        """
+        event_manager = self.event_manager
+        
+        # Random events at the start of the day
+        if self.rng.random() < self.daily_event_chance:
+            event = event_manager.trigger_random_event(player)
+            if event:
+                self._resolve_event(event, player)
+        
+        choice = self.policy.choose_action(player, self.action_manager.actions)
+        if choice is None:
+            return False
+        self.play_action(player, choice)
+        return True
+    
+    def play_action(self, player, choice):
+        """Perform an action, then end the day (the second half of a turn)"""
+        try:
+            rule = self.action_manager.actions[choice]["rule"]
+        except KeyError:
+            raise ValueError(f"Policy chose an unknown action: {choice!r}")
+        
+        # Exploring returns the event met on the way
+        outcome = rule(player, self.event_manager)
+        if type(outcome) is dict:
+            self._resolve_event(outcome, player, exploring=True)
+        
+        player.natural_evolution()
+        player.increment_day()
+    
+    def _resolve_event(self, event, player, exploring=False):
+        """Apply an event, asking the policy when there is a choice"""
+        choice = None
+        if event.get("type") == "choice":
+            choice = self.policy.choose_event(event, player, exploring)
+        self.event_manager.resolve_event(event, player, choice)
+
+
+def run_episodes(policy, episodes, seed=None, config=None):
+    """
+    Run episodes in the current process and return a BatchResult.
+    The seed feeds both the game rules and the global random module
+    (used by policies), with independent streams. A GameConfig (see
+    config.py) changes the rules' tunables.
+    """
+    seeder = random.Random(seed)
+    if seed is not None:
+        random.seed(seeder.getrandbits(64))
+    
+    rng = random.Random(seeder.getrandbits(64))
+    game = config.new_game(policy, rng) if config is not None else HeadlessGame(policy, rng=rng)
+    result = BatchResult()
+    for _ in range(episodes):
+        player, won = game.play()
+        result.record(player, won, game.target_days)
+    return result
+
+
+def run_pool(policy, pool, seed=None):
+    """
+    Play one episode for each player of a PlayerPool (see
+    src/entities/player_pool.py), from the state it holds, in the current
+    process. The final states stay in the pool, 5 bytes per player, for
+    what a BatchResult does not keep. Seeded like run_episodes: a pool of
+    new players replays the same games. Return a BatchResult.
+    """
+    seeder = random.Random(seed)
+    if seed is not None:
+        random.seed(seeder.getrandbits(64))
+    
+    game = HeadlessGame(policy, rng=random.Random(seeder.getrandbits(64)))
+    result = BatchResult()
+    for player in pool:
+        player, won = game.play(player)
+        result.record(player, won, game.target_days)
+    return result
+
+
+def run_batch(policy, episodes, workers=None, chunk_size=50000, seed=None):
+    """
+    Run episodes spread over a process pool.
+    Each chunk gets its own seed so workers do not replay the same games;
+    passing a seed makes the whole batch reproducible.
+    Return the merged BatchResult.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    seeder = random.Random(seed)
+    sizes = [chunk_size] * (episodes // chunk_size)
+    if episodes % chunk_size:
+        sizes.append(episodes % chunk_size)
+    seeds = [seeder.getrandbits(64) for _ in sizes]
+    
+    result = BatchResult()
+    if workers <= 1 or len(sizes) <= 1:
+        for size, chunk_seed in zip(sizes, seeds):
+            result.merge(run_episodes(policy, size, chunk_seed))
+        return result
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(run_episodes, [policy] * len(sizes), sizes, seeds):
+            result.merge(partial)
+    return result
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run headless survival game episodes")
+    parser.add_argument("--episodes", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    result = run_batch(POLICIES[args.policy](), args.episodes, workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    
+    print(result.summary())
+    print(f"Elapsed: {elapsed:.2f}s on {workers} worker(s)")
+    if elapsed > 0:
+        print(f"Throughput: {result.episodes / elapsed / workers * 60:,.0f} episodes per core-minute")
+
+
+if __name__ == "__main__":
+    main()
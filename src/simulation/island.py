@@ -0,0 +1,278 @@
+"""
+Multi-survivor mode: many survivors sharing the island's resources.
+
+Survivors are entities whose components are NumPy columns, one value per
+survivor: the gauges and day (as in PopulationSimulator, which Island
+extends), the AI state (each survivor's own thresholds to sleep and to
+take risks), whether the survivor is still alive and the day it died.
+Systems run over whole columns once per day: events, actions, decay.
+
+Fish and water are finite stocks shared by everybody: a successful catch
+takes its yield from the stock instead of getting it for free, survivors
+served in a random order each day, and the stocks regrow every night.
+Overfished, the fish population collapses; the spring refills anyway.
+
+The human player can take over survivor 0: a Survivor is a Player whose
+gauges are the columns of that entity, played by the regular GameLoop
+with the same stocks, and every day the human ends advances the island.
+
+Usage:
+    python -m src.simulation.island --survivors 100000 --days 30
+    python -m src.simulation.island --survivors 10000 --play
+"""
+
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.simulation.vectorized import PopulationSimulator
+from src.systems.events import EventManager
+
+
+class Stock:
+    """
+    A finite resource, in gauge points. Every night it regrows by
+    `regrowth` of what is missing (a spring), or when logistic by
+    regrowth * level * (1 - level / capacity) (a fish population: the
+    emptier, the slower it recovers, and it never comes back from 0).
+    """
+    
+    def __init__(self, name, capacity, regrowth, logistic=False, level=None):
+        self.name = name
+        self.capacity = capacity
+        self.regrowth = regrowth
+        self.logistic = logistic
+        self.level = capacity if level is None else level
+    
+    def take(self, amount):
+        """Take up to amount; return what was actually taken"""
+        taken = min(amount, self.level)
+        self.level -= taken
+        return taken
+    
+    def regrow(self):
+        """Regrow for one night"""
+        if self.logistic:
+            growth = self.regrowth * self.level * (1 - self.level / self.capacity)
+        else:
+            growth = self.regrowth * (self.capacity - self.level)
+        self.level = min(self.capacity, self.level + round(growth))
+
+
+def default_stocks(survivors):
+    """Fish and water stocks for a number of survivors, by the gauge they feed"""
+    return {
+        "hunger": Stock("🐟 Fish", 60 * survivors, 0.3, logistic=True),
+        "thirst": Stock("💧 Water", 40 * survivors, 0.4)
+    }
+
+
+class SurvivorPolicy:
+    """Greedy play, with each survivor's own thresholds (AI state columns)"""
+    
+    def choose_actions(self, island):
+        """Return the action code of every survivor"""
+        return np.where(island.energy < island.sleep_below, island.code("3"),
+                        np.where(island.thirst <= island.hunger, island.code("2"), island.code("1")))
+    
+    def choose_options(self, island, event, selection):
+        """Return the option index picked by the selected survivors (in choices order)"""
+        keys = list(event["choices"])
+        risky = keys.index("2") if "2" in keys else keys.index("1")
+        return np.where(island.energy[selection] > island.hunt_above[selection], risky, keys.index("1"))
+
+
+class Island(PopulationSimulator):
+    """
+    Survivors living on one island, day after day, until all are dead.
+    Yields of the gauges with a stock (see default_stocks) come from it.
+    """
+    
+    def __init__(self, survivors, seed=None, content=None, stocks=None, policy=None):
+        super().__init__(survivors, seed, content=content)
+        self.stocks = stocks if stocks is not None else default_stocks(survivors)
+        self.policy = policy if policy is not None else SurvivorPolicy()
+        self.days = 0
+        
+        # AI state: below which energy a survivor sleeps, above which it takes risks
+        self.sleep_below = self.rng.integers(20, 41, survivors, dtype=np.int16)
+        self.hunt_above = self.rng.integers(40, 71, survivors, dtype=np.int16)
+        
+        # Survivors played by a GameLoop (see control), skipped by the systems
+        self.controlled = np.zeros(survivors, dtype=bool)
+        self.alive = np.ones(survivors, dtype=bool)
+        self.died_on = np.zeros(survivors, dtype=np.int16)
+    
+    def control(self, index=0, name="Adventurer"):
+        """Hand survivor index over to a player; return its Survivor"""
+        self.controlled[index] = True
+        survivor = Survivor(self, index)
+        survivor.name = name
+        return survivor
+    
+    def apply_yield(self, spec, gained, amounts):
+        """Serve the catches from the stock in a random order, until it runs out"""
+        stock = self.stocks.get(spec.yield_gauge)
+        if stock is None:
+            return super().apply_yield(spec, gained, amounts)
+        
+        order = self.rng.permutation(len(amounts))
+        wanted = amounts[order].astype(np.int64)
+        before = np.cumsum(wanted) - wanted
+        served = np.zeros(len(amounts), dtype=np.int16)
+        served[order] = np.clip(stock.level - before, 0, wanted)
+        stock.level -= int(served.sum())
+        self.apply_delta(spec.yield_gauge, gained, served)
+    
+    def step(self, policy=None):
+        """
+        Play one day for every survivor alive and not controlled.
+        Return False once every survivor is dead.
+        """
+        policy = policy if policy is not None else self.policy
+        playing = self.alive & ~self.controlled
+        self.playing = playing
+        
+        # Random events at the start of the day, then the daily action
+        rng = self.rng
+        morning = (playing &
+                   (rng.random(self.size) < GameLoop.DAILY_EVENT_CHANCE) &
+                   (rng.random(self.size) < EventManager.EVENT_CHANCE))
+        self.apply_events(morning, policy)
+        codes = policy.choose_actions(self)
+        for code, spec in enumerate(self.actions):
+            self.perform(spec, playing & (codes == code), policy)
+        
+        # End of day
+        self.natural_evolution(playing)
+        self.day[playing] += 1
+        for stock in self.stocks.values():
+            stock.regrow()
+        self.days += 1
+        
+        # Deaths of the day, controlled survivors' included
+        alive = self.alive & self.is_alive()
+        self.died_on[self.alive & ~alive] = self.days
+        self.alive = alive
+        return bool(alive.any())
+    
+    def census(self):
+        """Survivors alive and stock levels, as a dictionary"""
+        census = {"day": self.days + 1, "alive": int(self.alive.sum())}
+        for stock in self.stocks.values():
+            census[stock.name] = stock.level
+        return census
+    
+    def deaths(self):
+        """Number of dead survivors by empty gauge (the first one, as Player reports)"""
+        dead = ~self.alive
+        starved = dead & (self.hunger <= Player.MIN_HUNGER)
+        dehydrated = dead & ~starved & (self.thirst <= Player.MIN_THIRST)
+        exhausted = dead & ~starved & ~dehydrated
+        return {"hunger": int(starved.sum()), "thirst": int(dehydrated.sum()),
+                "energy": int(exhausted.sum())}
+
+
+class Survivor(Player):
+    """
+    A survivor of an Island played as a Player (see PlayerView): gauge
+    attributes read and write the island's columns. Ending a day also
+    plays that day for the rest of the island.
+    """
+    
+    __slots__ = ("_island", "_index")
+    
+    def __init__(self, island, index):
+        self._island = island
+        self._index = index
+        self.name = "Adventurer"
+    
+    @property
+    def day(self):
+        return int(self._island.day[self._index])
+    
+    @day.setter
+    def day(self, value):
+        self._island.day[self._index] = value
+    
+    @property
+    def hunger(self):
+        return int(self._island.hunger[self._index])
+    
+    @hunger.setter
+    def hunger(self, value):
+        self._island.hunger[self._index] = value
+    
+    @property
+    def thirst(self):
+        return int(self._island.thirst[self._index])
+    
+    @thirst.setter
+    def thirst(self, value):
+        self._island.thirst[self._index] = value
+    
+    @property
+    def energy(self):
+        return int(self._island.energy[self._index])
+    
+    @energy.setter
+    def energy(self, value):
+        self._island.energy[self._index] = value
+    
+    def increment_day(self):
+        """Advance to the next day, the rest of the island with it"""
+        super().increment_day()
+        self._island.step()
+
+
+def play(island, name="Adventurer"):
+    """Play survivor 0 of an island in the terminal"""
+    loop = GameLoop(island.control(0, name))
+    loop.action_manager.stocks = island.stocks
+    loop.start()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Many survivors sharing the island's fish and water")
+    parser.add_argument("--survivors", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=30, help="days to simulate at most")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--play", action="store_true", help="play survivor 0 yourself")
+    args = parser.parse_args()
+    
+    if np is None:
+        raise SystemExit("❌ The multi-survivor mode requires NumPy (pip install numpy)")
+    island = Island(args.survivors, seed=args.seed)
+    if args.play:
+        play(island)
+        census = island.census()
+        stocks = ", ".join(f"{stock.name}: {stock.level:,}" for stock in island.stocks.values())
+        print(f"\n🏝️  Island on day {census['day']}: {census['alive']:,} survivors alive ({stocks})")
+        return
+    
+    names = [stock.name for stock in island.stocks.values()]
+    print(f"{'day':>4} | {'alive':>9} | " + " | ".join(f"{name:>12}" for name in names) + " | time")
+    elapsed = 0.0
+    for _ in range(args.days):
+        census = island.census()
+        start = time.perf_counter()
+        running = island.step()
+        spent = time.perf_counter() - start
+        elapsed += spent
+        print(f"{census['day']:>4} | {census['alive']:>9,} | "
+              + " | ".join(f"{census[name]:>12,}" for name in names) + f" | {spent * 1000:.0f} ms")
+        if not running:
+            break
+    print(f"Deaths by empty gauge: {island.deaths()}")
+    print(f"{island.days} days in {elapsed:.2f}s ({elapsed / max(island.days, 1) * 1000:.0f} ms per day)")
+
+
+if __name__ == "__main__":
+    main()
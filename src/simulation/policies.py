@@ -0,0 +1,52 @@
+"""Policies that play the game in place of the keyboard"""
+
+import random
+
+
+class RandomPolicy:
+    """Pick actions and event choices uniformly at random"""
+    
+    def __init__(self):
+        self._action_keys = None
+    
+    def choose_action(self, player, actions):
+        """Return the key of the action to perform today"""
+        if self._action_keys is None:
+            self._action_keys = tuple(actions)
+        return random.choice(self._action_keys)
+    
+    def choose_event(self, event, player, exploring=False):
+        """Return the key of the option picked for a choice event"""
+        return random.choice(tuple(event["choices"]))
+
+
+class GreedyPolicy:
+    """
+    Tend to the lowest gauge first.
+    Sleep when energy gets low, otherwise fish or search for water
+    depending on which of hunger or thirst is the most urgent.
+    """
+    
+    def __init__(self, sleep_below=30, hunt_above=50):
+        self.sleep_below = sleep_below
+        self.hunt_above = hunt_above
+    
+    def choose_action(self, player, actions):
+        """Return the key of the action to perform today"""
+        if player.energy < self.sleep_below:
+            return "3"
+        if player.thirst <= player.hunger:
+            return "2"
+        return "1"
+    
+    def choose_event(self, event, player, exploring=False):
+        """Hunt the boar only when rested enough, run away otherwise"""
+        if player.energy > self.hunt_above:
+            return "2"
+        return "1"
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy
+}
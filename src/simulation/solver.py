@@ -0,0 +1,336 @@
+"""
+Exact survival solver.
+
+Hunger, thirst and energy are integers between 0 and 100 and a game lasts
+GameLoop.TARGET_DAYS days, so the probability of winning from every state
+and the best action can be computed exactly by backward induction instead
+of sampling games. The transition distribution is built from the rules of
+ActionManager and EventManager: the random.randint ranges, the success
+rates, the daily event gate (GameLoop.DAILY_EVENT_CHANCE stacked on
+EventManager.EVENT_CHANCE) and the event met while exploring.
+
+Requires NumPy, like the vectorized simulator.
+
+Usage:
+    python -m src.simulation.solver --out tables/survival.tbl
+    python -m src.simulation.solver --table tables/survival.tbl --check 100000
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.content.loader import default_content
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.simulation.headless import run_episodes
+from src.systems.events import EventManager
+
+
+# Number of values a gauge can take (0 to 100)
+GAUGE_SIZE = 101
+
+# Axis of each gauge in the value arrays, indexed [hunger, thirst, energy]
+AXES = {"hunger": 0, "thirst": 1, "energy": 2}
+ENERGY = AXES["energy"]
+
+# Contexts in which a choice event can be met
+MORNING, EXPLORING = 0, 1
+
+# Table file: magic and metadata length, JSON metadata, then the raw arrays
+TABLE_MAGIC = b"SURVTBL3"
+TABLE_HEADER = struct.Struct("<8sI")
+
+
+class SurvivalSolver:
+    """
+    Backward induction over (day, hunger, thirst, energy).
+    
+    Value arrays hold, for every gauge combination, the probability of
+    winning from there. Applying a rule such as "hunger += 25, clamped"
+    to the state is the same as gathering the value array along the
+    hunger axis at clip(index + 25); those index arrays are memoized.
+    Choice events are worth the best of their options, since the player
+    picks after seeing the event. The induction runs in float64; the win
+    probabilities kept for every day are float32, which halves the table
+    (about 1e-7 off, far below any sampled estimate).
+    """
+    
+    def __init__(self, target_days=GameLoop.TARGET_DAYS, content=None):
+        if np is None:
+            raise ImportError("The survival solver requires NumPy (pip install numpy)")
+        if content is None:
+            content = default_content()
+        
+        self.target_days = target_days
+        self.content = content
+        self._indices = {}
+        
+        if any(e.get("when") for e in content.events):
+            raise ValueError("The solver does not support event preconditions ('when')")
+        total = sum(e["probability"] for e in content.events)
+        self._events = [(e, e["probability"] / total) for e in content.events]
+        self._choice_events = [e for e in content.events if e.get("type") == "choice"]
+        
+        gauge = np.arange(GAUGE_SIZE)
+        self._energy = gauge.reshape(1, 1, GAUGE_SIZE)
+        self._alive = ((gauge.reshape(-1, 1, 1) > Player.MIN_HUNGER) &
+                       (gauge.reshape(1, -1, 1) > Player.MIN_THIRST) &
+                       (self._energy > Player.MIN_ENERGY))
+    
+    def _shift(self, values, axis, delta):
+        """Return values composed with "gauge += delta" (clamped to 0-100)"""
+        if delta == 0:
+            return values
+        index = self._indices.get(delta)
+        if index is None:
+            index = np.clip(np.arange(GAUGE_SIZE) + delta, 0, GAUGE_SIZE - 1)
+            self._indices[delta] = index
+        return np.take(values, index, axis=axis)
+    
+    def _deltas(self, values, deltas):
+        """Return values composed with a list of (gauge, amount) changes"""
+        for gauge, amount in deltas:
+            values = self._shift(values, AXES[gauge], amount)
+        return values
+    
+    def _effect(self, after, effect):
+        """Expected values before a content Effect, given the values after it"""
+        values = after
+        if effect.chance is not None and effect.success:
+            values = (1 - effect.chance) * after + effect.chance * self._deltas(after, effect.success)
+        return self._deltas(values, effect.deltas)
+    
+    def _event(self, after):
+        """
+        Expected values over the event draw, given the values once the event
+        is applied. Return (values, choices) where choices holds, for every
+        choice event, the index of the best option (first one on ties).
+        """
+        total = np.zeros_like(after)
+        choices = []
+        for event, probability in self._events:
+            if event.get("type") == "choice":
+                options = np.stack([self._effect(after, choice["effect"])
+                                    for choice in event["choices"].values()])
+                best = options.argmax(axis=0)
+                choices.append(best.astype(np.uint8))
+                outcome = np.take_along_axis(options, best[None], axis=0)[0]
+            else:
+                outcome = self._effect(after, event["effect"])
+            total += probability * outcome
+        return total, choices
+    
+    def _action(self, spec, after, met):
+        """Win probability of an action, given the values at the end of it"""
+        values = after
+        if spec.explore:
+            rate = EventManager.EVENT_CHANCE
+            values = (1 - rate) * values + rate * met
+        
+        if spec.yield_gauge:
+            low, high = spec.yield_range
+            axis = AXES[spec.yield_gauge]
+            gained = sum(self._shift(values, axis, amount) for amount in range(low, high + 1))
+            values = (1 - spec.success_rate) * values + spec.success_rate * gained / (high - low + 1)
+        
+        values = self._deltas(values, spec.deltas)
+        if not spec.cost:
+            return values
+        values = self._shift(values, ENERGY, -spec.cost)
+        return np.where(self._energy < spec.cost, after, values)
+    
+    def solve(self):
+        """Run backward induction over every day and return a SolutionTable"""
+        shape = (self.target_days, GAUGE_SIZE, GAUGE_SIZE, GAUGE_SIZE)
+        win = np.empty(shape, dtype=np.float32)
+        actions = np.empty(shape, dtype=np.uint8)
+        choices = np.zeros((2, len(self._choice_events)) + shape, dtype=np.uint8)
+        morning_rate = GameLoop.DAILY_EVENT_CHANCE * EventManager.EVENT_CHANCE
+        
+        for day in range(self.target_days, 0, -1):
+            if day == self.target_days:
+                # Reaching the end of the last day wins, whatever the gauges
+                after = np.ones(shape[1:])
+            else:
+                after = self._shift(next_day, AXES["hunger"], -Player.HUNGER_DECAY)
+                after = self._shift(after, AXES["thirst"], -Player.THIRST_DECAY)
+                after = self._shift(after, ENERGY, -Player.ENERGY_DECAY)
+            
+            met, exploring = self._event(after)
+            values = np.stack([self._action(spec, after, met) for spec in self.content.actions])
+            best = values.argmax(axis=0)
+            chosen = np.take_along_axis(values, best[None], axis=0)[0]
+            
+            morning, in_morning = self._event(chosen)
+            start = (1 - morning_rate) * chosen + morning_rate * morning
+            next_day = np.where(self._alive, start, 0.0)
+            win[day - 1] = next_day
+            actions[day - 1] = best
+            for index in range(len(self._choice_events)):
+                choices[MORNING, index, day - 1] = in_morning[index]
+                choices[EXPLORING, index, day - 1] = exploring[index]
+        
+        metadata = {
+            "target_days": self.target_days,
+            "content": self.content.digest,
+            "actions": [spec.key for spec in self.content.actions],
+            "choice_events": [e["name"] for e in self._choice_events],
+            "options": [list(e["choices"]) for e in self._choice_events]
+        }
+        return SolutionTable(win, actions, choices, metadata)
+
+
+class SolutionTable:
+    """
+    Result of SurvivalSolver.solve.
+    win[day - 1, hunger, thirst, energy] is the probability of winning from
+    the start of that day, actions holds the best action code once the
+    morning event is over, and choices[context, event] the best option of
+    each choice event met in the morning or while exploring.
+    """
+    
+    def __init__(self, win, actions, choices, metadata):
+        self.win = win
+        self.actions = actions
+        self.choices = choices
+        self.metadata = metadata
+        self._choice_index = {name: i for i, name in enumerate(metadata["choice_events"])}
+    
+    @property
+    def target_days(self):
+        """Number of days covered by the table"""
+        return self.metadata["target_days"]
+    
+    def win_probability(self, player):
+        """Probability of winning from the start of the player's current day"""
+        if player.day > self.target_days:
+            return 1.0
+        return float(self.win[player.day - 1, player.hunger, player.thirst, player.energy])
+    
+    def best_action(self, player):
+        """Best action key once the morning event (if any) is over"""
+        code = self.actions[player.day - 1, player.hunger, player.thirst, player.energy]
+        return self.metadata["actions"][code]
+    
+    def best_option(self, event, player, exploring=False):
+        """Best option key of a choice event, before its effect is applied"""
+        index = self._choice_index[event["name"]]
+        context = EXPLORING if exploring else MORNING
+        code = self.choices[context, index, player.day - 1, player.hunger, player.thirst, player.energy]
+        return self.metadata["options"][index][code]
+    
+    def save(self, path):
+        """
+        Write the table as a small JSON header followed by the raw action
+        codes, option codes and float32 win probabilities, so load can
+        memory-map it.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        metadata = json.dumps(self.metadata, ensure_ascii=False).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(TABLE_HEADER.pack(TABLE_MAGIC, len(metadata)))
+            f.write(metadata)
+            f.write(np.ascontiguousarray(self.actions).tobytes())
+            f.write(np.ascontiguousarray(self.choices).tobytes())
+            f.write(np.ascontiguousarray(self.win, dtype="<f4").tobytes())
+    
+    @classmethod
+    def load(cls, path):
+        """Memory-map a table written by save (pages are read on first lookup)"""
+        if np is None:
+            raise ImportError("Solution tables require NumPy (pip install numpy)")
+        with open(path, "rb") as f:
+            magic, length = TABLE_HEADER.unpack(f.read(TABLE_HEADER.size))
+            if magic != TABLE_MAGIC:
+                raise ValueError(f"{path} is not a survival solution table "
+                                 f"(or was written by another version: solve again)")
+            metadata = json.loads(f.read(length).decode("utf-8"))
+        
+        shape = (metadata["target_days"], GAUGE_SIZE, GAUGE_SIZE, GAUGE_SIZE)
+        choices_shape = (2, len(metadata["choice_events"])) + shape
+        offset = TABLE_HEADER.size + length
+        actions = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+        offset += actions.size
+        if choices_shape[1]:
+            choices = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=choices_shape)
+        else:
+            choices = np.zeros(choices_shape, dtype=np.uint8)
+        offset += choices.size
+        win = np.memmap(path, dtype="<f4", mode="r", offset=offset, shape=shape)
+        return cls(win, actions, choices, metadata)
+
+
+class OptimalPolicy:
+    """
+    Headless policy playing the solved strategy.
+    The table is loaded lazily so the policy pickles cheaply to workers.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._table = None
+    
+    def __getstate__(self):
+        return {"path": self.path, "_table": None}
+    
+    @property
+    def table(self):
+        """The solution table, loaded on first use"""
+        if self._table is None:
+            self._table = SolutionTable.load(self.path)
+        return self._table
+    
+    def choose_action(self, player, actions):
+        """Return the key of the best action"""
+        return self.table.best_action(player)
+    
+    def choose_event(self, event, player, exploring=False):
+        """Return the best option of a choice event"""
+        return self.table.best_option(event, player, exploring)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Solve the survival game exactly")
+    parser.add_argument("--out", default=os.path.join("tables", "survival.tbl"),
+                        help="where to write the solution table")
+    parser.add_argument("--table", default=None,
+                        help="use an existing table instead of solving again")
+    parser.add_argument("--check", type=int, metavar="EPISODES", default=None,
+                        help="play the optimal policy headless and compare with the exact value")
+    args = parser.parse_args()
+    
+    if args.table:
+        start = time.perf_counter()
+        table = SolutionTable.load(args.table)
+        print(f"Loaded {args.table} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        path = args.table
+    else:
+        start = time.perf_counter()
+        table = SurvivalSolver().solve()
+        print(f"Solved in {time.perf_counter() - start:.2f}s")
+        table.save(args.out)
+        print(f"Table written to {args.out}")
+        path = args.out
+    
+    player = Player()
+    print(f"Win probability from a new game: {table.win_probability(player):.6f}")
+    print(f"Best first action: {table.best_action(player)}")
+    
+    if args.check:
+        result = run_episodes(OptimalPolicy(path), args.check)
+        print(f"Headless win rate over {result.episodes} episodes: {result.win_rate:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Parameter sweeps over the tunables of the rules (see config.py).
+
+A sweep evaluates every cell of a grid of configs with headless games,
+spread over a process pool. Each cell's result is cached on disk under
+the digest of its config, the rules version, the content packs, and the
+episode count, seed and policy, so running a sweep again only computes
+the cells whose values changed. All the cells use the same seed: they
+play the same random sequences, which makes differences between cells
+stand out from the sampling noise.
+
+A sweep file is JSON:
+
+    {
+        "episodes": 100000,
+        "seed": 1,
+        "policy": "greedy",
+        "base": {"target_days": 10},
+        "grid": {"decay.thirst": [10, 15, 20], "action.2.success_rate": [0.6, 0.8]}
+    }
+
+Usage:
+    python -m src.simulation.sweep sweeps/thirst.json --out sweeps/thirst-results.json
+    python -m src.simulation.sweep --set decay.thirst=10,15,20 --set event_chance=0.4,0.6
+    python -m src.simulation.sweep --list
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.simulation.config import GameConfig
+from src.simulation.headless import run_episodes
+from src.simulation.policies import POLICIES
+from src.utils.save_manager import atomic_write
+
+
+CACHE_DIR = os.path.join(".cache", "sweeps")
+
+
+def grid_cells(grid):
+    """Every combination of the grid's values, as {parameter: value} dicts"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def evaluate(values, episodes, seed, policy):
+    """Play a cell's episodes; return its result as a JSON-serializable dict"""
+    config = GameConfig(values)
+    result = run_episodes(POLICIES[policy](), episodes, seed, config)
+    return {
+        "episodes": result.episodes,
+        "win_rate": result.win_rate,
+        "average_days": result.average_days,
+        "death_causes": dict(result.death_causes),
+        "days_survived": {str(day): count for day, count in sorted(result.days_survived.items())}
+    }
+
+
+class Sweep:
+    """A grid of configs over a base config, with the cache of its cells"""
+    
+    def __init__(self, grid, base=None, episodes=100000, seed=0, policy="greedy",
+                 cache_dir=CACHE_DIR):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy '{policy}'")
+        self.base = GameConfig(base)
+        self.grid = grid
+        self.episodes = episodes
+        self.seed = seed
+        self.policy = policy
+        self.cache_dir = cache_dir
+        
+        # Configs of the cells; unknown parameters fail here, before any work
+        self.cells = [(cell, self.base.replace(cell)) for cell in grid_cells(grid)]
+    
+    def _cache_path(self, config):
+        key = config.digest(episodes=self.episodes, seed=self.seed, policy=self.policy)
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _cached(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def run(self, workers=None, progress=None):
+        """
+        Evaluate the cells, computing only those missing from the cache.
+        Return a list of (cell, result, cached) in grid order.
+        """
+        results = [None] * len(self.cells)
+        missing = []
+        for index, (cell, config) in enumerate(self.cells):
+            result = self._cached(self._cache_path(config))
+            if result is not None:
+                results[index] = (cell, result, True)
+            else:
+                missing.append(index)
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        arguments = [(self.cells[index][1].values, self.episodes, self.seed, self.policy)
+                     for index in missing]
+        if workers <= 1 or len(missing) <= 1:
+            computed = (evaluate(*args) for args in arguments)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=min(workers, len(missing)))
+            computed = pool.map(evaluate, *zip(*arguments))
+        
+        try:
+            for done, (index, result) in enumerate(zip(missing, computed), 1):
+                cell, config = self.cells[index]
+                self._store(self._cache_path(config), result)
+                results[index] = (cell, result, False)
+                if progress:
+                    progress(done, len(missing))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return results
+    
+    def _store(self, path, result):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(path, json.dumps(result, ensure_ascii=False))
+        except OSError:
+            # Caching is an optimization only
+            pass
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _parse_set(option):
+    """'name=v1,v2' from the command line to (name, [v1, v2])"""
+    name, _, values = option.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"expected name=value[,value...], got '{option}'")
+    return name, [_parse_value(value) for value in values.split(",")]
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Sweep the rules' tunables with cached results")
+    parser.add_argument("spec", nargs="?", help="sweep file (JSON)")
+    parser.add_argument("--set", action="append", type=_parse_set, default=[],
+                        metavar="NAME=V1,V2", help="add a grid axis")
+    parser.add_argument("--episodes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default=None)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--list", action="store_true", help="list the parameters and exit")
+    args = parser.parse_args()
+    
+    if args.list:
+        for name, value in GameConfig().values.items():
+            print(f"{name} = {value}")
+        return
+    
+    spec = {}
+    if args.spec:
+        with open(args.spec, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    grid = dict(spec.get("grid", {}))
+    grid.update(args.set)
+    if not grid:
+        parser.error("nothing to sweep: give a sweep file or --set")
+    
+    try:
+        sweep = Sweep(grid, spec.get("base"),
+                      episodes=args.episodes or spec.get("episodes", 100000),
+                      seed=args.seed if args.seed is not None else spec.get("seed", 0),
+                      policy=args.policy or spec.get("policy", "greedy"))
+    except (KeyError, ValueError) as e:
+        raise SystemExit(f"❌ {e}")
+    
+    start = time.perf_counter()
+    results = sweep.run(args.workers, lambda done, total: print(
+        f"\r{done}/{total} cells computed", end="", flush=True))
+    computed = sum(1 for _, _, cached in results if not cached)
+    if computed:
+        print()
+    
+    names = list(grid)
+    print(" | ".join(names) + " | win rate | avg days")
+    for cell, result, cached in results:
+        values = " | ".join(str(cell[name]) for name in names)
+        mark = "" if not cached else "  (cached)"
+        print(f"{values} | {result['win_rate']:8.2%} | {result['average_days']:8.2f}{mark}")
+    print(f"{len(results)} cells, {computed} computed, {len(results) - computed} from the cache, "
+          f"in {time.perf_counter() - start:.1f}s")
+    
+    if args.out:
+        document = {
+            "episodes": sweep.episodes, "seed": sweep.seed, "policy": sweep.policy,
+            "base": sweep.base.changes(),
+            "cells": [{"values": cell, "result": result} for cell, result, _ in results]
+        }
+        directory = os.path.dirname(args.out)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+NumPy-vectorized population simulator.
+
+Keeps the gauges of N players in arrays (struct of arrays) and advances
+all of them one day at a time with the GameLoop day cycle rules. Requires
+NumPy, which the game itself does not need.
+
+Usage:
+    python -m src.simulation.vectorized --players 10000000 --policy greedy
+    python -m src.simulation.vectorized --check 200000
+"""
+
+import argparse
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.content.loader import default_content
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.simulation.headless import BatchResult, run_episodes
+from src.simulation.policies import POLICIES
+from src.systems.events import EventManager
+
+
+class GreedyArrayPolicy:
+    """Vectorized counterpart of policies.GreedyPolicy"""
+    
+    def __init__(self, sleep_below=30, hunt_above=50):
+        self.sleep_below = sleep_below
+        self.hunt_above = hunt_above
+    
+    def choose_actions(self, sim):
+        """Return the action code of every player"""
+        return np.where(sim.energy < self.sleep_below, sim.code("3"),
+                        np.where(sim.thirst <= sim.hunger, sim.code("2"), sim.code("1")))
+    
+    def choose_options(self, sim, event, selection):
+        """Return the option index picked by the selected players (in choices order)"""
+        keys = list(event["choices"])
+        risky = keys.index("2") if "2" in keys else keys.index("1")
+        return np.where(sim.energy[selection] > self.hunt_above, risky, keys.index("1"))
+
+
+class RandomArrayPolicy:
+    """Vectorized counterpart of policies.RandomPolicy"""
+    
+    def choose_actions(self, sim):
+        """Return the action code of every player"""
+        return sim.rng.integers(0, len(sim.actions), sim.size)
+    
+    def choose_options(self, sim, event, selection):
+        """Return the option index picked by the selected players (in choices order)"""
+        return sim.rng.integers(0, len(event["choices"]), len(selection))
+
+
+ARRAY_POLICIES = {
+    "random": RandomArrayPolicy,
+    "greedy": GreedyArrayPolicy
+}
+
+
+class PopulationSimulator:
+    """
+    Simulate N independent players at once.
+    Hunger, thirst, energy and day are stored as int16 arrays. Every rule
+    works on a selection (boolean mask or index array) of the players it
+    applies to, and gauges are clamped to 0-100 with np.clip like Player
+    does with min/max. Actions and events come from the content packs.
+    """
+    
+    def __init__(self, size, seed=None, target_days=GameLoop.TARGET_DAYS, content=None):
+        if np is None:
+            raise ImportError("The vectorized simulator requires NumPy (pip install numpy)")
+        if content is None:
+            content = default_content()
+        
+        template = Player()
+        self.size = size
+        self.target_days = target_days
+        self.rng = np.random.default_rng(seed)
+        
+        self.hunger = np.full(size, template.hunger, dtype=np.int16)
+        self.thirst = np.full(size, template.thirst, dtype=np.int16)
+        self.energy = np.full(size, template.energy, dtype=np.int16)
+        self.day = np.full(size, template.day, dtype=np.int16)
+        
+        # Players still in the game loop, and players who reached the target
+        self.playing = np.ones(size, dtype=bool)
+        self.won = np.zeros(size, dtype=bool)
+        
+        # Action codes follow the order of the action menu
+        self.actions = list(content.actions)
+        self._codes = {spec.key: code for code, spec in enumerate(self.actions)}
+        
+        if any(e.get("when") for e in content.events):
+            raise ValueError("The vectorized simulator does not support event preconditions ('when')")
+        self._events = content.events
+        weights = np.array([e["probability"] for e in self._events], dtype=float)
+        self._event_probabilities = weights / weights.sum()
+    
+    def code(self, key):
+        """Return the action code of an action menu key"""
+        return self._codes[key]
+    
+    def apply_delta(self, gauge, selection, amount):
+        """Add amount (scalar or array) to the selected gauges, clamped to 0-100"""
+        values = getattr(self, gauge)
+        values[selection] = np.clip(values[selection] + amount, 0, 100)
+    
+    def is_alive(self):
+        """Vectorized Player.is_alive"""
+        return ((self.hunger > Player.MIN_HUNGER) &
+                (self.thirst > Player.MIN_THIRST) &
+                (self.energy > Player.MIN_ENERGY))
+    
+    def natural_evolution(self, mask):
+        """Vectorized Player.natural_evolution"""
+        self.apply_delta("hunger", mask, -Player.HUNGER_DECAY)
+        self.apply_delta("thirst", mask, -Player.THIRST_DECAY)
+        self.apply_delta("energy", mask, -Player.ENERGY_DECAY)
+    
+    def perform(self, spec, mask, policy):
+        """Vectorized ActionManager.apply_rule for one action"""
+        mask = mask & (self.energy >= spec.cost)
+        if spec.cost:
+            self.apply_delta("energy", mask, -spec.cost)
+        
+        for gauge, amount in spec.deltas:
+            self.apply_delta(gauge, mask, amount)
+        
+        if spec.yield_gauge:
+            low, high = spec.yield_range
+            gained = mask & (self.rng.random(self.size) < spec.success_rate)
+            amounts = self.rng.integers(low, high + 1, int(gained.sum()), dtype=np.int16)
+            self.apply_yield(spec, gained, amounts)
+        
+        if spec.explore:
+            self.apply_events(mask & (self.rng.random(self.size) < EventManager.EVENT_CHANCE), policy)
+    
+    def apply_yield(self, spec, gained, amounts):
+        """Give the players in the gained mask their yield (amounts in index order)"""
+        self.apply_delta(spec.yield_gauge, gained, amounts)
+    
+    def apply_effect(self, effect, selection):
+        """Vectorized content Effect, for the players at the given indices"""
+        for gauge, amount in effect.deltas:
+            self.apply_delta(gauge, selection, amount)
+        
+        if effect.chance is not None and effect.success:
+            lucky = selection[self.rng.random(len(selection)) < effect.chance]
+            for gauge, amount in effect.success:
+                self.apply_delta(gauge, lucky, amount)
+    
+    def apply_events(self, mask, policy):
+        """
+        Draw one event for every player in mask and apply its effect.
+        Options of choice events come from policy.choose_options.
+        """
+        where = np.flatnonzero(mask)
+        if not where.size:
+            return
+        
+        picks = self.rng.choice(len(self._events), size=where.size, p=self._event_probabilities)
+        
+        # Group players by event so the cost does not grow with the catalog size
+        order = np.argsort(picks, kind="stable")
+        picks = picks[order]
+        where = where[order]
+        drawn, starts = np.unique(picks, return_index=True)
+        ends = list(starts[1:]) + [len(picks)]
+        
+        for index, start, end in zip(drawn.tolist(), starts.tolist(), ends):
+            event = self._events[index]
+            selection = where[start:end]
+            
+            if event.get("type") == "choice":
+                choices = list(event["choices"].values())
+                options = policy.choose_options(self, event, selection)
+                for option, choice in enumerate(choices):
+                    self.apply_effect(choice["effect"], selection[options == option])
+            else:
+                self.apply_effect(event["effect"], selection)
+    
+    def step(self, policy):
+        """
+        Advance every player still playing by one day.
+        Return False once nobody is playing anymore.
+        """
+        # Same check as the GameLoop.start loop condition
+        self.playing &= self.is_alive()
+        playing = self.playing
+        if not playing.any():
+            return False
+        
+        # Random events at the start of the day
+        rng = self.rng
+        morning = (playing &
+                   (rng.random(self.size) < GameLoop.DAILY_EVENT_CHANCE) &
+                   (rng.random(self.size) < EventManager.EVENT_CHANCE))
+        self.apply_events(morning, policy)
+        
+        # Daily action
+        codes = policy.choose_actions(self)
+        for code, spec in enumerate(self.actions):
+            self.perform(spec, playing & (codes == code), policy)
+        
+        # End of day
+        self.natural_evolution(playing)
+        self.day[playing] += 1
+        
+        won = playing & (self.day > self.target_days)
+        self.won |= won
+        self.playing &= ~won
+        return True
+    
+    def run(self, policy):
+        """Play every player to the end and return a BatchResult"""
+        while self.step(policy):
+            pass
+        return self.result()
+    
+    def result(self):
+        """Summarize the population as a BatchResult"""
+        result = BatchResult()
+        result.episodes = self.size
+        result.wins = int(self.won.sum())
+        
+        lost = ~self.won
+        starved = lost & (self.hunger <= Player.MIN_HUNGER)
+        dehydrated = lost & ~starved & (self.thirst <= Player.MIN_THIRST)
+        exhausted = lost & ~starved & ~dehydrated & (self.energy <= Player.MIN_ENERGY)
+        for gauge, died in (("hunger", starved), ("thirst", dehydrated), ("energy", exhausted)):
+            count = int(died.sum())
+            if count:
+                result.death_causes[_death_cause(gauge)] += count
+        
+        days = np.where(self.won, self.target_days, self.day - 1)
+        values, counts = np.unique(days, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            result.days_survived[value] = count
+        return result
+
+
+def _death_cause(gauge):
+    """Return the Player.get_death_cause message for an empty gauge"""
+    player = Player()
+    setattr(player, gauge, 0)
+    return player.get_death_cause()
+
+
+def simulate(players, policy_name="greedy", seed=None, chunk_size=1000000):
+    """Simulate players in chunks of bounded memory and return a BatchResult"""
+    result = BatchResult()
+    seeds = np.random.SeedSequence(seed).spawn(math.ceil(players / chunk_size))
+    for index, chunk_seed in enumerate(seeds):
+        size = min(chunk_size, players - index * chunk_size)
+        sim = PopulationSimulator(size, seed=chunk_seed)
+        result.merge(sim.run(ARRAY_POLICIES[policy_name]()))
+    return result
+
+
+def _total_variation(a, b, episodes):
+    """Total variation distance between two Counters of the same number of episodes"""
+    return sum(abs(a[key] - b[key]) for key in set(a) | set(b)) / (2 * episodes)
+
+
+def _deaths_by_day(result):
+    """Deaths per full day survived (days_survived without the wins)"""
+    deaths = result.days_survived.copy()
+    deaths[GameLoop.TARGET_DAYS] -= result.wins
+    return +deaths
+
+
+def compare_with_scalar(episodes, policy_name="greedy", seed=None):
+    """
+    Run the same number of games with the scalar Player code and with the
+    vectorized simulator. Return (scalar, vectorized, statistics) where
+    statistics holds the win-rate z-score and the total variation distances
+    between the two days-survived distributions, the days of the deaths and
+    the death causes (deaths and causes as shares of all episodes, so a
+    difference in win rate shows there too).
+    """
+    scalar = run_episodes(POLICIES[policy_name](), episodes, seed)
+    vectorized = simulate(episodes, policy_name, seed)
+    
+    pooled = (scalar.wins + vectorized.wins) / (2 * episodes)
+    spread = math.sqrt(pooled * (1 - pooled) * 2 / episodes) or 1.0
+    
+    statistics = {
+        "win_rate_z": (scalar.win_rate - vectorized.win_rate) / spread,
+        "days_total_variation": _total_variation(scalar.days_survived, vectorized.days_survived,
+                                                 episodes),
+        "deaths_total_variation": _total_variation(_deaths_by_day(scalar),
+                                                   _deaths_by_day(vectorized), episodes),
+        "causes_total_variation": _total_variation(scalar.death_causes, vectorized.death_causes,
+                                                   episodes)
+    }
+    return scalar, vectorized, statistics
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Vectorized survival game population simulator")
+    parser.add_argument("--players", type=int, default=1000000)
+    parser.add_argument("--policy", choices=sorted(ARRAY_POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--check", type=int, metavar="EPISODES", default=None,
+                        help="compare the distributions against the scalar Player code")
+    args = parser.parse_args()
+    
+    if args.check:
+        scalar, vectorized, statistics = compare_with_scalar(args.check, args.policy, args.seed)
+        print("Scalar Player code:")
+        print(scalar.summary())
+        print("\nVectorized simulator:")
+        print(vectorized.summary())
+        print(f"\nWin rate z-score: {statistics['win_rate_z']:.2f} (|z| < 3 expected)")
+        print(f"Days survived total variation distance: {statistics['days_total_variation']:.4f}")
+        print(f"Deaths by day total variation distance: {statistics['deaths_total_variation']:.4f}")
+        print(f"Death causes total variation distance: {statistics['causes_total_variation']:.4f}")
+        return
+    
+    start = time.perf_counter()
+    result = simulate(args.players, args.policy, args.seed)
+    elapsed = time.perf_counter() - start
+    
+    print(result.summary())
+    print(f"Elapsed: {elapsed:.2f}s ({result.episodes / elapsed:,.0f} players per second)")
+
+
+if __name__ == "__main__":
+    main()
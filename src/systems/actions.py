@@ -1,106 +1,119 @@
 """Player actions manager"""
 
+import random
+from functools import partial
+
+from src.content.loader import apply_delta, default_content
+from src.utils.dialogue import CONTINUE, run
+
 
 class ActionManager:
-    """Manages the actions the player can take each day"""
-    
-    def __init__(self):
-        self.actions = {
-            "1": {
-                "name": "🎣 Fish",
-                "description": "Try to catch fish",
-                "function": self.fish
-            },
-            "2": {
-                "name": "💧 Search for water",
-                "description": "Look for a water source",
-                "function": self.search_water
-            },
-            "3": {
-                "name": "😴 Sleep",
-                "description": "Rest to recover energy",
-                "function": self.sleep
-            },
-            "4": {
-                "name": "🗺️ Explore",
-                "description": "Explore the surroundings (random event)",
-                "function": self.explore
-            }
-        }
+    """
+    Manages the actions the player can take each day.
+    Actions are declared in the content packs (src/content/packs).
+    """
     
-    def fish(self, player, event_manager=None):
-        """Fishing: increases hunger gauge (fills you up) but consumes energy."""
-        print("\n🎣 You try to fish...")
+    def __init__(self, content=None, rng=None):
+        if content is None:
+            content = default_content()
         
-        if player.energy < 15:
-            print("❌ You're too exhausted to fish!")
-            return
+        # Source of randomness (a random.Random, or the random module itself)
+        self.rng = rng if rng is not None else random
         
-        player.consume_energy(15)
+        # Reads the player's answers in execute_action, and writes what the
+        # player reads (a server session writes to its connection)
+        self.input = input
+        self.output = print
         
-        import random
-        if random.random() > 0.3:  # 70% success
-            fish = random.randint(20, 35)
-            player.eat(fish)
-            print(f"✅ You catch a fish! (+{fish} hunger)")
-        else:
-            print("❌ No catch today. You spent energy.")
+        # Finite stocks yields are taken from, by yield gauge (see
+        # src/simulation/island.py); gauges without a stock yield freely
+        self.stocks = {}
         
-        print(f"⚡ Energy consumed: -15")
+        # World map walked across by exploring actions (see src/systems/world.py)
+        self.world = None
+        
+        self.actions = {}
+        for spec in content.actions:
+            self.actions[spec.key] = {
+                "name": spec.name,
+                "description": spec.description,
+                "spec": spec,
+                "function": partial(self.perform, spec),
+                "rule": partial(self.apply_rule, spec)
+            }
     
-    def search_water(self, player, event_manager=None):
-        """Search for water: increases thirst gauge (hydrates you), consumes energy."""
-        print("\n💧 You search for water...")
+    def apply_rule(self, spec, player, event_manager=None):
+        """
+        Apply an action's rule without any I/O.
+        Return None if the player is too exhausted, the event met on the way
+        (not applied yet) for exploring actions, otherwise the amount gained
+        on the yield gauge (0 when the roll fails).
+        """
+        if player.energy < spec.cost:
+            return None
         
-        if player.energy < 10:
-            print("❌ You're too exhausted to search for water!")
-            return
+        if spec.cost:
+            player.consume_energy(spec.cost)
         
-        player.consume_energy(10)
+        for gauge, amount in spec.deltas:
+            apply_delta(player, gauge, amount)
         
-        import random
-        if random.random() > 0.2:  # 80% success
-            water = random.randint(25, 40)
-            player.drink(water)
-            print(f"✅ You find water! (+{water} thirst)")
-        else:
-            print("❌ No water source found. You spent energy.")
+        gained = 0
+        if spec.yield_gauge and self.rng.random() < spec.success_rate:
+            gained = self.rng.randint(*spec.yield_range)
+            if spec.yield_gauge in self.stocks:
+                gained = self.stocks[spec.yield_gauge].take(gained)
+            apply_delta(player, spec.yield_gauge, gained)
         
-        print(f"⚡ Energy consumed: -10")
+        if spec.explore:
+            if self.world is not None:
+                self.world.explore(self.rng)
+            if event_manager:
+                return event_manager.trigger_random_event(player)
+            return None
+        return gained
     
-    def sleep(self, player, event_manager=None):
-        """Sleep: restores energy but decreases hunger and thirst (you get hungry/thirsty)."""
-        print("\n😴 You settle down to sleep...")
-        
-        energy_recovered = 50
-        player.rest(energy_recovered)
-        
-        # Sleeping makes you hungry and thirsty (gauges decrease)
-        player.hunger = max(0, player.hunger - 15)
-        player.thirst = max(0, player.thirst - 20)
-        
-        print(f"✅ You rest well. (+{energy_recovered} energy)")
-        print(f"⚠️  While sleeping: -15 hunger, -20 thirst")
+    def perform(self, spec, player, event_manager=None):
+        """Perform an action interactively, printing its messages"""
+        run(self.perform_dialogue(spec, player, event_manager), self.input)
     
-    def explore(self, player, event_manager):
-        """Explore: triggers a random event (beneficial or dangerous)."""
-        print("\n🗺️ You go exploring the surroundings...")
+    def perform_dialogue(self, spec, player, event_manager=None):
+        """perform as a dialogue (see src/utils/dialogue.py)"""
+        output = self.output
+        messages = spec.messages
+        if "start" in messages:
+            output("\n" + messages["start"])
         
-        if player.energy < 10:
-            print("❌ You're too exhausted to explore!")
+        if player.energy < spec.cost:
+            output(messages.get("exhausted", "❌ You're too exhausted!"))
             return
         
-        player.consume_energy(10)
-        print(f"⚡ Energy consumed: -10")
+        outcome = self.apply_rule(spec, player, event_manager)
+        for line in self.report(spec, outcome):
+            output(line)
+        if spec.explore and self.world is not None:
+            output(self.world.describe())
         
-        # Trigger a random event
-        if event_manager:
-            event = event_manager.trigger_random_event(player)
-            if event:
-                input("\nPress Enter to continue...")
-                event_manager.apply_event(event, player)
-            else:
-                print("\n🌲 You explore the area but find nothing particular.")
+        # Exploring: face the event met on the way
+        if spec.explore and event_manager:
+            if outcome:
+                yield CONTINUE
+                yield from event_manager.event_dialogue(outcome, player)
+            elif "nothing" in messages:
+                output("\n" + messages["nothing"])
+    
+    @staticmethod
+    def report(spec, outcome):
+        """Lines telling the outcome returned by apply_rule (before any event)"""
+        messages = spec.messages
+        lines = []
+        if spec.yield_gauge:
+            if outcome:
+                lines.append(messages.get("success", "✅ +{amount}").format(amount=outcome))
+            elif "failure" in messages:
+                lines.append(messages["failure"])
+        lines.extend(messages.get("after", ()))
+        return lines
     
     def get_available_actions(self):
         """Return the list of available actions"""
@@ -108,14 +121,19 @@ class ActionManager:
     
     def execute_action(self, choice, player, event_manager=None):
         """Execute the action chosen by the player"""
+        return run(self.action_dialogue(choice, player, event_manager), self.input)
+    
+    def action_dialogue(self, choice, player, event_manager=None):
+        """execute_action as a dialogue (see src/utils/dialogue.py)"""
+        output = self.output
         if choice in self.actions:
             action = self.actions[choice]
-            print("\n" + "="*60)
-            print(f"⚡ ACTION: {action['name']}")
-            print("="*60)
-            action["function"](player, event_manager)
-            print("="*60)
+            output("\n" + "="*60)
+            output(f"⚡ ACTION: {action['name']}")
+            output("="*60)
+            yield from self.perform_dialogue(action["spec"], player, event_manager)
+            output("="*60)
             return True
         else:
-            print("\n❌ Invalid action. Please choose a valid number.")
+            output("\n❌ Invalid action. Please choose a valid number.")
             return False
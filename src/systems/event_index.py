@@ -0,0 +1,166 @@
+"""
+Index of an event catalog by precondition, for state-dependent draws.
+
+An event's "when" bounds (see src/content/loader.py) make it eligible on
+a box of the (hunger, thirst, energy, day) space. The bounds of all the
+events cut each field into intervals, and every interval holds the set
+of events eligible along that field as a bitmask (a Python int). A draw
+locates the player's interval on each field by bisection, ANDs the four
+masks, and samples the eligible events with an alias table cached for
+that cell of intervals: O(log n) per draw once the cell's table is
+built, instead of filtering thousands of events every day.
+
+Events with the same preconditions form a group with its own alias
+table, and the masks and cell tables are built over groups: a catalog of
+thousands of events written against a few thresholds only has a few
+groups, so building a cell's table stays cheap too. A draw picks a
+group, then an event within it.
+
+The biome of the world map is one more field, with one mask per biome;
+draws made without a biome (no map) ignore the biome preconditions.
+
+Probabilities are weights relative to the eligible events: when none is
+eligible, or their weights are all zero, no event occurs.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from operator import attrgetter
+
+from src.content.loader import BIOMES, CONDITION_FIELDS
+from src.utils.alias_table import AliasTable
+
+
+class _Group:
+    """Events sharing the same preconditions"""
+    
+    __slots__ = ("when", "events", "weight", "table")
+    
+    def __init__(self, when, events):
+        self.when = when
+        self.events = events
+        weights = [event["probability"] for event in events]
+        self.weight = sum(weights)
+        self.table = AliasTable(events, weights)
+
+
+class EventIndex:
+    """Draws events whose preconditions hold for a player"""
+    
+    # Alias tables kept for the most recently drawn cells
+    CACHE_SIZE = 4096
+    
+    def __init__(self, events, cache_size=CACHE_SIZE):
+        self.events = list(events)
+        self.cache_size = cache_size
+        self._tables = OrderedDict()
+        
+        members = {}
+        for event in self.events:
+            members.setdefault(tuple(sorted(event.get("when", ()))), []).append(event)
+        self._groups = [_Group(when, grouped) for when, grouped in members.items()]
+        
+        # Sorted cuts and mask of groups per interval of every field; interval
+        # i holds the values v with bisect_right(cuts, v) == i
+        self._values = attrgetter(*CONDITION_FIELDS)
+        self._cuts = []
+        self._masks = []
+        for field in CONDITION_FIELDS:
+            bounds = [(bit,) + condition[1:] for bit, group in enumerate(self._groups)
+                      for condition in group.when if condition[0] == field]
+            cuts, masks = self._axis(field, bounds)
+            self._cuts.append(cuts)
+            self._masks.append(masks)
+        
+        # Mask of groups per biome, then for draws without a biome
+        everything = (1 << len(self._groups)) - 1
+        self._biomes = {biome: code for code, biome in enumerate(BIOMES)}
+        self._biome_masks = [everything] * (len(BIOMES) + 1)
+        for bit, group in enumerate(self._groups):
+            for condition in group.when:
+                if condition[0] == "biome":
+                    for code, biome in enumerate(BIOMES):
+                        if biome not in condition[1]:
+                            self._biome_masks[code] &= ~(1 << bit)
+    
+    def _axis(self, field, bounds):
+        cuts = set()
+        for _, low, high in bounds:
+            if low is not None:
+                cuts.add(low)
+            if high is not None:
+                cuts.add(high + 1)
+        cuts = sorted(cuts)
+        
+        # Each group toggles its bit where its range starts and again where
+        # it ends; a running XOR then gives the mask of every interval
+        toggles = [0] * (len(cuts) + 2)
+        bounded = 0
+        for bit, low, high in bounds:
+            mask = 1 << bit
+            if bounded & mask:
+                # A second range would toggle the bit back and forth
+                raise ValueError(f"an event tests '{field}' twice: {self._groups[bit].when}")
+            bounded |= mask
+            start = bisect_right(cuts, low) if low is not None else 0
+            end = bisect_right(cuts, high) if high is not None else len(cuts)
+            toggles[start] ^= mask
+            toggles[end + 1] ^= mask
+        
+        unbounded = ((1 << len(self._groups)) - 1) & ~bounded
+        masks = []
+        running = 0
+        for toggle in toggles[:-1]:
+            running ^= toggle
+            masks.append(running | unbounded)
+        return cuts, masks
+    
+    def cell(self, player, biome=None):
+        """Interval of the player on each field, then the biome's code"""
+        return (*map(bisect_right, self._cuts, self._values(player)),
+                self._biomes.get(biome, len(BIOMES)))
+    
+    def _eligible_groups(self, cell):
+        """The groups eligible in a cell"""
+        mask = self._biome_masks[cell[-1]]
+        for masks, interval in zip(self._masks, cell):
+            mask &= masks[interval]
+        groups = []
+        while mask:
+            low = mask & -mask
+            groups.append(self._groups[low.bit_length() - 1])
+            mask ^= low
+        return groups
+    
+    def eligible(self, player, biome=None):
+        """The events whose preconditions hold for the player, group by group"""
+        return [event for group in self._eligible_groups(self.cell(player, biome))
+                for event in group.events]
+    
+    def table(self, player, biome=None):
+        """
+        Alias table of the groups eligible for the player, weighted by their
+        total probability (cached per cell)
+        """
+        cell = self.cell(player, biome)
+        tables = self._tables
+        table = tables.get(cell)
+        if table is None:
+            groups = self._eligible_groups(cell)
+            table = AliasTable(groups, [group.weight for group in groups])
+            tables[cell] = table
+            if len(tables) > self.cache_size:
+                tables.popitem(last=False)
+        else:
+            tables.move_to_end(cell)
+        return table
+    
+    def sample(self, player, rand, biome=None):
+        """Draw one eligible event (None if there is none)"""
+        group = self.table(player, biome).sample(rand)
+        return group.table.sample(rand) if group is not None else None
+    
+    def sample_many(self, k, player, rand, biome=None):
+        """Draw k eligible events at once"""
+        return [group.table.sample(rand) if group is not None else None
+                for group in self.table(player, biome).sample_many(k, rand)]
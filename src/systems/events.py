@@ -2,69 +2,85 @@
 
 import random
 
+from src.content.loader import default_content
+from src.systems.event_index import EventIndex
+from src.utils.alias_table import AliasTable
+from src.utils.dialogue import CONTINUE, run
+
 
 class EventManager:
     """Manage random game events"""
     
-    def __init__(self):
-        self.events = [
-            {
-                "name": "🌧️ Rain",
-                "description": "It's raining! You collect rainwater.",
-                "effect": lambda player: player.drink(20),
-                "probability": 0.2
-            },
-            {
-                "name": "🐗 Wild boar encounter",
-                "description": "A wild boar appears! What do you do?",
-                "type": "choice",
-                "choices": {
-                    "1": {
-                        "text": "Run away (costs energy)",
-                        "effect": lambda player: player.consume_energy(15)
-                    },
-                    "2": {
-                        "text": "Try to hunt (risky but food)",
-                        "effect": self._hunt_boar
-                    }
-                },
-                "probability": 0.15
-            },
-            {
-                "name": "🍎 Wild fruits discovery",
-                "description": "You find edible fruits!",
-                "effect": lambda player: player.eat(25),
-                "probability": 0.25
-            },
-            {
-                "name": "💧 Water source",
-                "description": "You discover a clear water source!",
-                "effect": lambda player: player.drink(30),
-                "probability": 0.2
-            },
-            {
-                "name": "🦅 Peaceful observation",
-                "description": "You watch an eagle soaring. Peaceful moment.",
-                "effect": lambda player: player.rest(5),
-                "probability": 0.15
-            },
-            {
-                "name": "🐍 Snake!",
-                "description": "A snake! You barely avoid it but are exhausted.",
-                "effect": lambda player: player.consume_energy(20),
-                "probability": 0.1
-            }
-        ]
+    # Chance that trigger_random_event actually yields an event
+    EVENT_CHANCE = 0.6
     
-    def _hunt_boar(self, player):
-        """Handle wild boar hunting (random)"""
-        player.consume_energy(25)
+    def __init__(self, content=None, rng=None):
+        if content is None:
+            content = default_content()
+        
+        # Source of randomness (a random.Random, or the random module itself)
+        self.rng = rng if rng is not None else random
+        
+        # Optional ActionLog recording the choices made in apply_event
+        self.action_log = None
+        
+        # Callables notified of each event applied by apply_event (GameLoop
+        # metrics and telemetry)
+        self.listeners = []
         
-        if random.random() > 0.5:  # 50% success
-            player.eat(40)
-            return "\n✅ Successful hunt! You eat meat."
+        # Reads the player's answers in apply_event, and writes what the
+        # player reads (a server session writes to its connection)
+        self.input = input
+        self.output = print
+        
+        # World map whose biome at the player's position selects the events
+        # (see src/systems/world.py); None: events happen anywhere
+        self.world = None
+        
+        # Events are declared in the content packs (src/content/packs);
+        # shallow copies keep probability changes local to this manager
+        self._events = []
+        self._sampler = AliasTable([], [])
+        self._index = None
+        self.events = [dict(event) for event in content.events]
+    
+    @property
+    def events(self):
+        """The event catalog"""
+        return self._events
+    
+    @events.setter
+    def events(self, events):
+        """Replace the event catalog and rebuild the sampler"""
+        self._events = list(events)
+        self.rebuild_sampler()
+    
+    def add_event(self, event):
+        """Add an event to the catalog"""
+        self._events.append(event)
+        self.rebuild_sampler()
+    
+    def set_probability(self, name, probability):
+        """Change the probability of the event with the given name"""
+        for event in self._events:
+            if event["name"] == name:
+                event["probability"] = probability
+                self.rebuild_sampler()
+                return
+        raise KeyError(name)
+    
+    def rebuild_sampler(self):
+        """
+        Rebuild the alias table used to draw events, and the precondition
+        index when some events have preconditions ("when").
+        Done automatically by the methods above; call it after editing
+        event dicts in place.
+        """
+        self._sampler = AliasTable(self._events, [e["probability"] for e in self._events])
+        if any(e.get("when") for e in self._events):
+            self._index = EventIndex(self._events)
         else:
-            return "\n❌ Hunt failed. You wasted energy."
+            self._index = None
     
     def trigger_random_event(self, player):
         """
@@ -72,47 +88,95 @@ class EventManager:
         Return None if no event occurs.
         """
         # 60% chance that an event occurs
-        if random.random() > 0.6:
+        if self.rng.random() >= self.EVENT_CHANCE:
             return None
         
         # Select an event based on probabilities
-        event = random.choices(
-            self.events,
-            weights=[e["probability"] for e in self.events],
-            k=1
-        )[0]
+        return self.sample_event(player)
+    
+    def sample_event(self, player=None):
+        """
+        Draw an event from the catalog, without the 60% gate: in O(1), or
+        O(log n) among the events whose preconditions hold for the player.
+        Without a player, preconditions are ignored.
+        """
+        if len(self._sampler) != len(self._events):
+            # The catalog list was appended to directly
+            self.rebuild_sampler()
+        if self._index is not None and player is not None:
+            return self._index.sample(player, self.rng.random, self._biome())
+        return self._sampler.sample(self.rng.random)
+    
+    def sample_events(self, k, player=None):
+        """Pre-draw k events at once, without the 60% gate (see sample_event)"""
+        if len(self._sampler) != len(self._events):
+            self.rebuild_sampler()
+        if self._index is not None and player is not None:
+            return self._index.sample_many(k, player, self.rng.random, self._biome())
+        return self._sampler.sample_many(k, self.rng.random)
+    
+    def _biome(self):
+        return self.world.biome() if self.world is not None else None
+    
+    def resolve_event(self, event, player, choice=None):
+        """
+        Apply the event effect to the player without any I/O.
+        For choice events, an unknown choice falls back to running away ("1").
+        Return a result message if any.
+        """
+        if event.get("type") == "choice":
+            choices = event["choices"]
+            if choice not in choices:
+                choice = "1"
+            return choices[choice]["effect"](player, self.rng)
         
-        return event
+        return event["effect"](player, self.rng)
+    
+    @staticmethod
+    def describe(event):
+        """Lines presenting an event, and its options for choice events"""
+        lines = ["", "="*60, f"📢 EVENT: {event['name']}", "="*60, event["description"]]
+        if event.get("type") == "choice":
+            lines += ["", "Options:"]
+            for key, choice in event["choices"].items():
+                lines.append(f"  {key}. {choice['text']}")
+        return lines
     
     def apply_event(self, event, player):
         """
         Apply the event effect to the player.
         Return a result message if any.
         """
-        print("\n" + "="*60)
-        print(f"📢 EVENT: {event['name']}")
-        print("="*60)
-        print(event['description'])
+        return run(self.event_dialogue(event, player), self.input)
+    
+    def event_dialogue(self, event, player):
+        """apply_event as a dialogue (see src/utils/dialogue.py)"""
+        for listener in self.listeners:
+            listener(event)
+        
+        output = self.output
+        output("\n".join(self.describe(event)))
         
         # Event with choices
+        result = None
         if event.get("type") == "choice":
-            print("\nOptions:")
-            for key, choice in event["choices"].items():
-                print(f"  {key}. {choice['text']}")
+            player_choice = (yield "\nYour choice: ").strip()
+            
+            if player_choice not in event["choices"]:
+                output("❌ Invalid choice. You run away by reflex.")
+                player_choice = "1"
             
-            player_choice = input("\nYour choice: ").strip()
+            if self.action_log is not None:
+                self.action_log.record(player_choice)
             
-            if player_choice in event["choices"]:
-                result = event["choices"][player_choice]["effect"](player)
-                if result:
-                    print(result)
-            else:
-                print("❌ Invalid choice. You run away by reflex.")
-                event["choices"]["1"]["effect"](player)
+            result = self.resolve_event(event, player, player_choice)
+            if result:
+                output(result)
         
         # Automatic event
         else:
-            event["effect"](player)
+            self.resolve_event(event, player)
         
-        print("="*60)
-        input("\nPress Enter to continue...")
+        output("="*60)
+        yield CONTINUE
+        return result
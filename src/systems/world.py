@@ -0,0 +1,289 @@
+"""
+Procedurally generated world map, explored a few tiles at a time.
+
+The map is an endless grid of tiles (sea or one of the land BIOMES),
+generated from the session seed with value noise: the terrain of a tile
+only depends on the seed and its coordinates, so any part of the map can
+be generated again identically, in any order. Tiles are grouped in
+chunks of CHUNK_SIZE x CHUNK_SIZE, generated the first time they are
+needed and kept in a bounded LRU cache; the terrain takes the same memory
+however far the explorer wanders.
+
+What play changes (the tiles visited so far) is kept as a diff per chunk,
+a bitmask of its visited tiles, in a persistent map (see
+src/utils/persistent.py): snapshot() is then just a reference to the
+current version, and the versions kept for rewinding share all the
+chunks they did not change. Diffs that changed are written to the world's
+directory on save() and read back when a chunk is needed again, so only
+diffs are ever stored.
+
+Memory stays flat however far a long session wanders: once saved, the
+masks of the chunks out of the cache leave the current version (they are
+read back from the directory, into a cache as small as the chunks'). Two
+limits: without a directory, every mask stays in memory; and the versions
+kept for rewinding keep theirs until the history lets go of them. A day
+rewound to whose version had not reached a chunk yet reads the chunk's
+stored diff, tiles visited later included: visited tiles are only shown,
+play does not depend on them.
+
+Exploring walks up to EXPLORE_DISTANCE tiles in a random direction,
+stopping at the shore, and the events then drawn are those allowed in
+the biome reached ("when": {"biome": [...]}, see src/content/loader.py).
+"""
+
+import json
+import os
+import shutil
+from collections import OrderedDict
+
+from src.content.loader import BIOMES
+from src.utils.persistent import PersistentMap
+
+
+CHUNK_SIZE = 16
+
+# Terrain of the tiles, by code: the sea, then the land biomes
+TERRAINS = ("sea",) + BIOMES
+LABELS = {"sea": "🌊 Sea", "beach": "🏖️ Beach", "jungle": "🌴 Jungle", "forest": "🌲 Forest",
+          "rocks": "🪨 Rocks", "mountain": "⛰️ Mountain"}
+
+# The eight directions of a walk
+DIRECTIONS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+MASK = 2**64 - 1
+
+
+def _hash(seed, x, y):
+    """Value in [0, 1) of a lattice point (splitmix64 finalizer)"""
+    h = (seed * 0x9E3779B97F4A7C15 + x * 0xBF58476D1CE4E5B9 + y * 0x94D049BB133111EB) & MASK
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & MASK
+    return (h ^ (h >> 31)) / 2**64
+
+
+def _noise(seed, scale, x0, y0, size):
+    """
+    Value noise over the size x size tiles from (x0, y0), row by row:
+    lattice values every `scale` tiles, smoothly interpolated between
+    """
+    lattice = {}
+    values = []
+    for y in range(y0, y0 + size):
+        cell_y, offset_y = divmod(y, scale)
+        ty = offset_y / scale
+        ty = ty * ty * (3 - 2 * ty)
+        for x in range(x0, x0 + size):
+            cell_x, offset_x = divmod(x, scale)
+            tx = offset_x / scale
+            tx = tx * tx * (3 - 2 * tx)
+            corners = []
+            for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+                key = (cell_x + dx, cell_y + dy)
+                value = lattice.get(key)
+                if value is None:
+                    value = lattice[key] = _hash(seed, *key)
+                corners.append(value)
+            top = corners[0] + (corners[1] - corners[0]) * tx
+            bottom = corners[2] + (corners[3] - corners[2]) * tx
+            values.append(top + (bottom - top) * ty)
+    return values
+
+
+def generate(seed, cx, cy):
+    """Terrain codes of chunk (cx, cy), row by row (a bytearray)"""
+    x0, y0 = cx * CHUNK_SIZE, cy * CHUNK_SIZE
+    broad = _noise(seed, 32, x0, y0, CHUNK_SIZE)
+    detail = _noise(seed + 1, 8, x0, y0, CHUNK_SIZE)
+    moisture = _noise(seed + 2, 24, x0, y0, CHUNK_SIZE)
+    
+    tiles = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+    for index, (low, high, wet) in enumerate(zip(broad, detail, moisture)):
+        elevation = 0.65 * low + 0.35 * high
+        if elevation < 0.3:
+            terrain = "sea"
+        elif elevation < 0.36:
+            terrain = "beach"
+        elif elevation > 0.7:
+            terrain = "mountain"
+        elif elevation > 0.62:
+            terrain = "rocks"
+        else:
+            terrain = "jungle" if wet > 0.5 else "forest"
+        tiles[index] = TERRAINS.index(terrain)
+    return tiles
+
+
+class WorldMap:
+    """
+    The map of a session: its seed, the explorer's position, the cache of
+    generated chunks and the diffs of the chunks. Diffs are stored in
+    directory, or only kept in memory when it is None.
+    """
+    
+    # Chunks kept in memory
+    CACHE_SIZE = 64
+    
+    # Longest walk of an exploring action, in tiles
+    EXPLORE_DISTANCE = 6
+    
+    def __init__(self, seed, directory=None, cache_size=CACHE_SIZE, position=None):
+        self.seed = seed
+        self.directory = directory
+        self.cache_size = cache_size
+        self._chunks = OrderedDict()
+        
+        # Visited tiles bitmask per chunk: those changed and not stored yet
+        # (or in the cache), the version last stored, and those read back
+        # from the directory (LRU, as many as the chunks cached)
+        self._visited = PersistentMap()
+        self._saved = self._visited
+        self._loaded = OrderedDict()
+        
+        # Chunks generated since the map was created (cache misses)
+        self.generated = 0
+        
+        self.position = tuple(position) if position is not None else self._spawn()
+        self.visit(*self.position)
+    
+    def chunk(self, cx, cy):
+        """Terrain codes of chunk (cx, cy), generated if not cached"""
+        key = (cx, cy)
+        chunks = self._chunks
+        tiles = chunks.get(key)
+        if tiles is not None:
+            chunks.move_to_end(key)
+            return tiles
+        
+        tiles = chunks[key] = generate(self.seed, cx, cy)
+        self.generated += 1
+        if len(chunks) > self.cache_size:
+            chunks.popitem(last=False)
+        return tiles
+    
+    def terrain(self, x, y):
+        """Terrain name of tile (x, y)"""
+        cx, ox = divmod(x, CHUNK_SIZE)
+        cy, oy = divmod(y, CHUNK_SIZE)
+        return TERRAINS[self.chunk(cx, cy)[oy * CHUNK_SIZE + ox]]
+    
+    def biome(self):
+        """Biome of the explorer's position"""
+        return self.terrain(*self.position)
+    
+    def visit(self, x, y):
+        """Mark tile (x, y) visited"""
+        cx, ox = divmod(x, CHUNK_SIZE)
+        cy, oy = divmod(y, CHUNK_SIZE)
+        key = (cx, cy)
+        bit = 1 << (oy * CHUNK_SIZE + ox)
+        mask = self._mask(key)
+        if not mask & bit:
+            self._visited = self._visited.set(key, mask | bit)
+    
+    def visited(self, x, y):
+        """Whether tile (x, y) was visited"""
+        cx, ox = divmod(x, CHUNK_SIZE)
+        cy, oy = divmod(y, CHUNK_SIZE)
+        return bool(self._mask((cx, cy)) >> (oy * CHUNK_SIZE + ox) & 1)
+    
+    def _mask(self, key):
+        """Visited tiles bitmask of a chunk"""
+        mask = self._visited.get(key)
+        if mask is not None:
+            return mask
+        loaded = self._loaded
+        mask = loaded.get(key)
+        if mask is not None:
+            loaded.move_to_end(key)
+            return mask
+        diff = self._load(key) or {}
+        mask = loaded[key] = sum(1 << index for index in set(diff.get("visited", ())))
+        if len(loaded) > self.cache_size:
+            loaded.popitem(last=False)
+        return mask
+    
+    def explore(self, rng):
+        """
+        Walk up to EXPLORE_DISTANCE tiles in a random direction (one draw
+        from rng), stopping before the sea. Return the new position.
+        """
+        dx, dy = DIRECTIONS[rng.randrange(len(DIRECTIONS))]
+        x, y = self.position
+        for _ in range(self.EXPLORE_DISTANCE):
+            if self.terrain(x + dx, y + dy) == "sea":
+                break
+            x, y = x + dx, y + dy
+            self.visit(x, y)
+        self.position = (x, y)
+        return self.position
+    
+    def describe(self):
+        """Line telling where the explorer stands"""
+        x, y = self.position
+        return f"🧭 You reach the {LABELS[self.biome()]} ({x}, {y})."
+    
+    def state(self):
+        """
+        What a save keeps of the map: its seed and the explorer's position
+        (the visited tiles are in the directory), for WorldMap(**state)
+        """
+        return {"seed": self.seed, "position": list(self.position)}
+    
+    def snapshot(self):
+        """The explorer's position and the visited tiles, in constant time and memory"""
+        return self.position, self._visited
+    
+    def restore(self, snapshot):
+        """Go back to a snapshot, in constant time"""
+        self.position, self._visited = snapshot
+    
+    def _spawn(self):
+        """The land tile closest to (0, 0), searching square rings outwards"""
+        for radius in range(CHUNK_SIZE * 64):
+            for y in range(-radius, radius + 1):
+                step = 1 if abs(y) == radius else 2 * radius or 1
+                for x in range(-radius, radius + 1, step):
+                    if self.terrain(x, y) != "sea":
+                        return (x, y)
+        raise ValueError(f"no land near the origin with seed {self.seed}")
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"chunk_{key[0]}_{key[1]}.json")
+    
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def save(self):
+        """
+        Store the diffs of the chunks that changed since the last save
+        (found by comparing the two versions), then drop the masks of the
+        chunks out of the cache. Raises OSError on failure.
+        """
+        changed = sorted(self._visited.changed(self._saved))
+        if self.directory is None or not changed:
+            return
+        # Imported here: only needed once something is written
+        from src.utils.save_manager import atomic_write
+        os.makedirs(self.directory, exist_ok=True)
+        for key in changed:
+            mask = self._mask(key)
+            diff = {"visited": [index for index in range(CHUNK_SIZE * CHUNK_SIZE) if mask >> index & 1]}
+            atomic_write(self._path(key), json.dumps(diff, separators=(",", ":")))
+        
+        visited = self._visited
+        for key in [key for key in visited if key not in self._chunks]:
+            visited = visited.remove(key)
+        self._visited = self._saved = visited
+    
+    def delete(self):
+        """Delete the stored diffs (the map of a finished game). Raises OSError on failure."""
+        if self.directory is not None and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self._saved = PersistentMap()
+        self._loaded.clear()
@@ -1,99 +1,113 @@
 """Terminal user interface rendering"""
 
+from src.ui.renderer import FrameRenderer
+
+
+# Length of the gauge bars, in characters
+BAR_LENGTH = 20
+
+
+def _bar(value, length=BAR_LENGTH):
+    """Bar that empties from right to left as value decreases"""
+    filled = min(length, max(0, int((value / 100) * length)))
+    return f"[{'█' * filled}{'·' * (length - filled)}]"
+
+
+def _levels(critical, low, good):
+    """Emoji of every gauge value: critical <= 20, low <= 50, good above"""
+    return tuple(critical if value <= 20 else low if value <= 50 else good
+                 for value in range(101))
+
+
+# Precomputed for every gauge value (0-100)
+BARS = tuple(_bar(value) for value in range(101))
+HUNGER_EMOJIS = _levels("🍖", "🍞", "✅")  # Starving, hungry, full
+THIRST_EMOJIS = _levels("💧", "🚰", "✅")  # Dehydrated, thirsty, hydrated
+ENERGY_EMOJIS = _levels("😴", "😐", "⚡")  # Exhausted, tired, energized
+
+
+def _in_range(value):
+    """Whether value indexes the precomputed tables"""
+    return type(value) is int and 0 <= value <= 100
+
+
+def _level(emojis, value):
+    """Emoji of a gauge value (values outside 0-100 get the nearest level)"""
+    if _in_range(value):
+        return emojis[value]
+    return emojis[0] if value <= 20 else emojis[50] if value <= 50 else emojis[100]
+
 
 class Display:
-    """Handles terminal output and simple UI rendering"""
+    """
+    Handles terminal output and simple UI rendering.
+    Every screen is composed into a list of lines and written at once by
+    a FrameRenderer; on ANSI terminals the gauges stay pinned at the top.
+    """
     
-    @staticmethod
-    def clear_screen():
-        """Clear the screen (optional; comment out if inconvenient)"""
-        import os
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def __init__(self, renderer=None):
+        self.renderer = renderer or FrameRenderer()
     
-    @staticmethod
-    def show_gauges(player):
+    def clear_screen(self):
+        """Clear the screen"""
+        self.renderer.clear()
+    
+    def close(self):
+        """Release the pinned gauge panel"""
+        self.renderer.close()
+    
+    def show_gauges(self, player):
         """Show player's gauges with visual bars"""
-        print("\n" + "="*60)
-        print(f"📅 DAY {player.day} - {player.name}")
-        print("="*60)
+        # All gauges work the same: 100 = full/good, 0 = empty/death
+        header = f"📅 DAY {player.day} - {player.name}"
+        hunger, thirst, energy = player.hunger, player.thirst, player.energy
+        bar = self._create_bar
+        gauges = [
+            f"{_level(HUNGER_EMOJIS, hunger)} Hunger: {bar(hunger)} {hunger}/100",
+            f"{_level(THIRST_EMOJIS, thirst)} Thirst: {bar(thirst)} {thirst}/100",
+            f"{_level(ENERGY_EMOJIS, energy)} Energy: {bar(energy)} {energy}/100"
+        ]
+        alerts = self._alerts(player)
         
-        # All gauges now work the same: 100 = full/good, 0 = empty/death
-        # Hunger bar (100 = full, 0 = starving)
-        hunger_bar = Display._create_bar(player.hunger, inverse=False)
-        hunger_emoji = Display._get_hunger_emoji(player.hunger)
-        print(f"{hunger_emoji} Hunger: {hunger_bar} {player.hunger}/100")
-        
-        # Thirst bar (100 = hydrated, 0 = dehydrated)
-        thirst_bar = Display._create_bar(player.thirst, inverse=False)
-        thirst_emoji = Display._get_thirst_emoji(player.thirst)
-        print(f"{thirst_emoji} Thirst: {thirst_bar} {player.thirst}/100")
-        
-        # Energy bar (100 = rested, 0 = exhausted)
-        energy_bar = Display._create_bar(player.energy, inverse=False)
-        energy_emoji = Display._get_energy_emoji(player.energy)
-        print(f"{energy_emoji} Energy: {energy_bar} {player.energy}/100")
-        
-        print("="*60)
+        if self.renderer.ansi:
+            # Fixed height, so only the lines that changed are redrawn
+            self.renderer.panel(["="*60, header, "="*60] + gauges + ["="*60, "  ".join(alerts)])
+            return
         
+        lines = ["", "="*60, header, "="*60] + gauges + ["="*60]
         # Show alerts if gauges are in critical zones
-        Display._show_alerts(player)
+        if alerts:
+            lines += [""] + alerts + [""]
+        self.renderer.frame(lines)
     
     @staticmethod
-    def _create_bar(value, length=20, inverse=False):
+    def _create_bar(value, length=BAR_LENGTH, inverse=False):
         """
         Create a visual progress bar that empties as value decreases.
-        All gauges now work the same way: 100 = full bar, 0 = empty bar.
-        Color changes based on danger level (red < 20, orange < 50, green >= 50).
+        All gauges work the same way: 100 = full bar, 0 = empty bar.
         """
-        filled = int((value / 100) * length)
-        empty = length - filled
-        
-        # Choose character color based on danger level
-        """if value <= 20:"""
-        char = "█"  # Red (critical)
-        """
-        elif value <= 50:
-            char = "▓"  # Orange (medium)
-        else:
-            char = "░"  # Green (good)
-        """
-        
-        # Bar empties from right to left as value decreases
-        return f"[{char * filled}{'·' * empty}]"
+        if length == BAR_LENGTH and _in_range(value):
+            return BARS[value]
+        return _bar(value, length)
     
     @staticmethod
     def _get_hunger_emoji(value):
         """Return an emoji matching hunger level (100 = full, 0 = starving)"""
-        if value <= 20:
-            return "🍖"  # Starving
-        elif value <= 50:
-            return "🍞"  # Hungry
-        else:
-            return "✅"  # Full
+        return _level(HUNGER_EMOJIS, value)
     
     @staticmethod
     def _get_thirst_emoji(value):
         """Return an emoji matching thirst level (100 = hydrated, 0 = dehydrated)"""
-        if value <= 20:
-            return "💧"  # Dehydrated
-        elif value <= 50:
-            return "🚰"  # Thirsty
-        else:
-            return "✅"  # Hydrated
+        return _level(THIRST_EMOJIS, value)
     
     @staticmethod
     def _get_energy_emoji(value):
         """Return an emoji matching energy level (100 = rested, 0 = exhausted)"""
-        if value <= 20:
-            return "😴"  # Exhausted
-        elif value <= 50:
-            return "😐"  # Tired
-        else:
-            return "⚡"  # Energized
+        return _level(ENERGY_EMOJIS, value)
     
     @staticmethod
-    def _show_alerts(player):
-        """Show alerts if gauges are critical"""
+    def _alerts(player):
+        """Alerts for the gauges in critical zones"""
         alerts = []
         
         if player.hunger <= 20:
@@ -103,52 +117,91 @@ class Display:
         if player.energy <= 20:
             alerts.append("⚠️  DANGER: You're exhausted!")
         
-        if alerts:
-            print("\n" + "\n".join(alerts))
-            print()
+        return alerts
     
-    @staticmethod
-    def show_action_menu(actions):
-        """Display the available actions menu"""
-        print("\n🎮 WHAT DO YOU WANT TO DO?")
-        print("-"*60)
+    def show_action_menu(self, actions, can_save=True, advice=None, can_rewind=False):
+        """
+        Display the available actions menu, and under it the advisor's
+        chance of winning of each action ({key: probability}) if given
+        """
+        lines = ["", "🎮 WHAT DO YOU WANT TO DO?", "-"*60]
         
         for key, action in actions.items():
-            print(f"  {key}. {action['name']} - {action['description']}")
+            lines.append(f"  {key}. {action['name']} - {action['description']}")
         
-        print("\n  S. 💾 Save game")
-        print("  Q. 🚪 Quit")
-        print("-"*60)
+        lines.append("")
+        if can_save:
+            lines.append("  S. 💾 Save game")
+        if can_rewind:
+            lines.append("  R. ⏪ Rewind")
+        lines += ["  Q. 🚪 Quit", "-"*60]
+        if advice:
+            odds = " | ".join(f"{key}. {advice[key]:.0%}" for key in actions if key in advice)
+            lines.append(f"🧭 Advisor (chance of winning): {odds}")
+        self.renderer.frame(lines)
     
-    @staticmethod
-    def show_game_over(player, target_days):
+    def show_game_over(self, player, target_days):
         """Display the game over screen"""
-        print("\n\n" + "="*60)
-        print("                    ⚰️  GAME OVER  ⚰️")
-        print("="*60)
-        print(f"\n{player.get_death_cause()}")
-        print(f"\n📅 You survived {player.day} day(s).")
-        print(f"🎯 Goal: {target_days} days")
-        print("\n" + "="*60)
+        self.renderer.frame([
+            "", "", "="*60,
+            "                    ⚰️  GAME OVER  ⚰️",
+            "="*60,
+            "", player.get_death_cause(),
+            "", f"📅 You survived {player.day} day(s).",
+            f"🎯 Goal: {target_days} days",
+            "", "="*60
+        ])
     
-    @staticmethod
-    def show_victory(player, target_days):
+    def show_victory(self, player, target_days):
         """Display the victory screen"""
-        print("\n\n" + "="*60)
-        print("                      🎉 VICTORY! 🎉")
-        print("="*60)
-        print(f"\n🏆 Congratulations {player.name}!")
-        print(f"📅 You survived {target_days} full days!")
-        print("\n✨ You are a true survivor!")
-        print("\n" + "="*60)
+        self.renderer.frame([
+            "", "", "="*60,
+            "                      🎉 VICTORY! 🎉",
+            "="*60,
+            "", f"🏆 Congratulations {player.name}!",
+            f"📅 You survived {target_days} full days!",
+            "", "✨ You are a true survivor!",
+            "", "="*60
+        ])
     
-    @staticmethod
-    def show_main_menu():
+    def show_main_menu(self):
         """Display the main menu"""
-        print("\n" + "="*60)
-        print("                        MAIN MENU")
-        print("="*60)
-        print("\n1. 🆕 New game")
-        print("2. 📂 Load game")
-        print("3. 🚪 Quit")
-        print("\n" + "="*60)
+        self.renderer.frame([
+            "", "="*60,
+            "                        MAIN MENU",
+            "="*60,
+            "", "1. 🆕 New game",
+            "2. 📂 Load game",
+            "3. 🏆 Leaderboard",
+            "4. 🚪 Quit",
+            "", "="*60
+        ])
+    
+    def show_leaderboard(self, title, runs, total, causes):
+        """Display a leaderboard of runs (see RunHistory) and how to pick another"""
+        lines = ["", "="*60, f"🏆 {title} ({total:,} runs played)", "="*60]
+        if not runs:
+            lines.append("  No run yet.")
+        for rank, run in enumerate(runs, 1):
+            ending = "🎉 Survived" if run["outcome"] == "won" else f"💀 {run['cause']}"
+            lines.append(f"  {rank:>2}. {run['name']:<16} {run['days']:>3} day(s)  {ending}"
+                         f"  ({run['ended']})")
+        lines += ["-"*60, "  R. Best runs", "  P. Best run of each player", "  N. Runs of a player"]
+        for number, cause in enumerate(causes, 1):
+            lines.append(f"  {number}. Best runs that ended: {cause}")
+        lines.append("  Enter. Back to menu")
+        self.renderer.frame(lines)
+    
+    def show_save_list(self, saves, first, total):
+        """Display one page of saves, numbered from 1"""
+        lines = ["", f"Saved games {first + 1}-{first + len(saves)} of {total}:", "-"*60]
+        for number, (slot, info) in enumerate(saves, 1):
+            lines.append(f"  {number}. {info.get('name', 'Adventurer')} - Day {info.get('day', '?')}"
+                         f" ({info.get('save_date', 'Unknown')})")
+        lines.append("-"*60)
+        if first + len(saves) < total:
+            lines.append("  N. Next page")
+        if first:
+            lines.append("  P. Previous page")
+        lines.append("  Enter. Back to menu")
+        self.renderer.frame(lines)
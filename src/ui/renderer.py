@@ -0,0 +1,126 @@
+"""Buffered terminal output"""
+
+import os
+import sys
+
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[2K"
+SAVE_CURSOR = "\x1b7"
+RESTORE_CURSOR = "\x1b8"
+RESET_SCROLL_REGION = "\x1b[r"
+
+
+def _move_to(row):
+    return f"\x1b[{row};1H"
+
+
+def _supports_ansi(stream):
+    """Whether stream is a terminal understanding ANSI escape sequences"""
+    if not (hasattr(stream, "isatty") and stream.isatty()):
+        return False
+    if os.environ.get("TERM") == "dumb":
+        return False
+    if os.name == "nt":
+        # Classic Windows consoles print escape sequences verbatim
+        return "WT_SESSION" in os.environ or "ANSICON" in os.environ
+    return True
+
+
+class FrameRenderer:
+    """
+    Writes each frame in a single write instead of a burst of prints.
+    
+    On an ANSI terminal, a status panel of fixed height is pinned to the
+    top of the screen (the rest of the screen scrolls below it, in a
+    scroll region), and each new panel only rewrites the lines that
+    changed since the previous one. Elsewhere (pipes, files, dumb
+    terminals) the panel is written like any other frame.
+    """
+    
+    def __init__(self, stream=None, ansi=None):
+        # None writes to the current sys.stdout, so redirections apply
+        self._stream = stream
+        self.ansi = _supports_ansi(self.stream) if ansi is None else ansi
+        
+        self._panel = None
+        self._panel_size = None
+    
+    @property
+    def stream(self):
+        """Stream written to"""
+        return self._stream if self._stream is not None else sys.stdout
+    
+    def write(self, text):
+        """Write text at once and flush it"""
+        stream = self.stream
+        stream.write(text)
+        stream.flush()
+    
+    def frame(self, lines):
+        """Write lines as one frame, like print would have, one line each"""
+        self.write("\n".join(lines) + "\n")
+    
+    def clear(self):
+        """
+        Clear the screen (and the status panel), without spawning a process
+        on ANSI terminals; other terminals still run cls or clear. Pipes
+        and files are left alone.
+        """
+        if self.ansi:
+            self.write(RESET_SCROLL_REGION + CLEAR_SCREEN)
+            self._panel = None
+        elif self._stream is None and hasattr(sys.stdout, "isatty") and sys.stdout.isatty():
+            self.stream.flush()
+            os.system('cls' if os.name == 'nt' else 'clear')
+    
+    def panel(self, lines):
+        """Show the status panel, redrawing only the lines that changed"""
+        if not self.ansi:
+            self.frame(lines)
+            return
+        
+        # shutil (and re through it) is slow to import: only ANSI terminals need it
+        import shutil
+        size = shutil.get_terminal_size()
+        height = len(lines)
+        if (self._panel is None or len(self._panel) != height or size != self._panel_size
+                or size.lines <= height + 1):
+            self._draw_panel(lines, size)
+            return
+        
+        changed = [row for row, line in enumerate(lines) if line != self._panel[row]]
+        if not changed:
+            return
+        parts = [SAVE_CURSOR]
+        for row in changed:
+            parts.append(_move_to(row + 1) + CLEAR_LINE + lines[row])
+        parts.append(RESTORE_CURSOR)
+        self.write("".join(parts))
+        self._panel = list(lines)
+    
+    def _draw_panel(self, lines, size):
+        """Reserve the top of the screen for the panel and draw all of it"""
+        height = len(lines)
+        if size.lines <= height + 1:
+            # Too small to pin the panel: print it inline
+            self.close()
+            self.frame(lines)
+            return
+        
+        parts = [RESET_SCROLL_REGION, CLEAR_SCREEN]
+        for row, line in enumerate(lines):
+            parts.append(_move_to(row + 1) + line)
+        # Everything else scrolls below the panel
+        parts.append(f"\x1b[{height + 1};{size.lines}r")
+        parts.append(_move_to(height + 1))
+        self.write("".join(parts))
+        self._panel = list(lines)
+        self._panel_size = size
+    
+    def close(self):
+        """Release the status panel and give the whole screen back"""
+        if self.ansi and self._panel is not None:
+            self.write(RESET_SCROLL_REGION + _move_to(self._panel_size.lines) + "\n")
+        self._panel = None
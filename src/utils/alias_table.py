@@ -0,0 +1,76 @@
+"""Walker/Vose alias table for O(1) weighted sampling"""
+
+import random
+
+
+class AliasTable:
+    """
+    Sample items with fixed weights in constant time.
+    
+    Building the table is O(n) (Vose's method); each draw then costs one
+    random number, whatever the number of items. Rebuild the table when
+    the items or their weights change.
+    """
+    
+    def __init__(self, items, weights):
+        items = list(items)
+        weights = [float(w) for w in weights]
+        if len(items) != len(weights):
+            raise ValueError("items and weights must have the same length")
+        if any(w < 0 for w in weights):
+            raise ValueError("weights must not be negative")
+        
+        total = sum(weights)
+        self.size = len(items)
+        self._slots = []
+        if not self.size or total <= 0:
+            return
+        
+        # Scale weights so that their average is 1
+        scaled = [w * self.size / total for w in weights]
+        probability = [1.0] * self.size
+        alias = list(range(self.size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            probability[low] = scaled[low]
+            alias[low] = high
+            scaled[high] = scaled[high] + scaled[low] - 1.0
+            if scaled[high] < 1.0:
+                small.append(high)
+            else:
+                large.append(high)
+        
+        # Leftovers are only off by rounding errors: they keep their own item
+        self._slots = [(probability[i], items[i], items[alias[i]]) for i in range(self.size)]
+    
+    def __len__(self):
+        return self.size
+    
+    def sample(self, rand=random.random):
+        """Draw one item (None if the table is empty)"""
+        if not self._slots:
+            return None
+        # One random number picks the slot and the coin flip inside it
+        u = rand() * self.size
+        index = int(u)
+        probability, item, alias = self._slots[index]
+        return item if u - index < probability else alias
+    
+    def sample_many(self, k, rand=random.random):
+        """Draw k items at once"""
+        slots = self._slots
+        if not slots:
+            return [None] * k
+        size = self.size
+        drawn = []
+        append = drawn.append
+        for _ in range(k):
+            u = rand() * size
+            index = int(u)
+            probability, item, alias = slots[index]
+            append(item if u - index < probability else alias)
+        return drawn
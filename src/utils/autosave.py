@@ -0,0 +1,77 @@
+"""Background autosave"""
+
+import threading
+
+
+class Autosaver:
+    """
+    Writes player states to a save slot on a background thread, so the
+    game never waits on the disk.
+    Only the latest submitted state is kept: states submitted while a write
+    is in progress replace each other, and a single write catches up.
+    """
+    
+    def __init__(self, save_manager):
+        self.save_manager = save_manager
+        
+        # Last write error, reported by flush (printing from the writer
+        # thread would garble the screen)
+        self.error = None
+        
+        self._condition = threading.Condition()
+        self._pending = None
+        self._writing = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+    
+    def submit(self, state, slot):
+        """Queue a state (see Player.get_state) for writing to a slot; never blocks on I/O"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the autosaver is closed")
+            self._pending = (dict(state), slot)
+            self._condition.notify_all()
+    
+    def discard(self):
+        """Drop the pending state, if it has not started being written"""
+        with self._condition:
+            self._pending = None
+    
+    def flush(self, timeout=None):
+        """
+        Wait until every submitted state is on disk.
+        Return False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._writing, timeout)
+    
+    def close(self, timeout=None):
+        """Flush, then stop the writer thread"""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if flushed:
+            self._thread.join(timeout)
+        return flushed
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                state, slot = self._pending
+                self._pending = None
+                self._writing = True
+            
+            try:
+                self.save_manager.write(state, slot)
+            except Exception as e:
+                self.error = e
+            
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
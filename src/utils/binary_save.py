@@ -0,0 +1,274 @@
+"""
+Compact binary save format.
+
+A record is a fixed header followed by a payload:
+    
+    header   magic "SGSV", version (B), flags (B), payload length (I), CRC-32 of the payload (I)
+    payload  day (I), hunger, thirst, energy (B each), save time (q, Unix seconds),
+             name length (H), name (UTF-8), extra length (I), extra (JSON)
+
+Extra holds any other key of the state (e.g. a future history), so the
+format follows Player.get_state as it grows. With the zlib flag set the
+payload is compressed. Records can be concatenated: every header gives
+the length of its payload, so an archive of saves is read in one pass
+without parsing JSON.
+
+Usage:
+    python -m src.utils.binary_save pack saves/ archive.bin
+    python -m src.utils.binary_save check archive.bin
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+from datetime import datetime
+
+
+MAGIC = b"SGSV"
+VERSION = 1
+
+# Header flags
+COMPRESSED = 0x01
+
+HEADER = struct.Struct("<4sBBII")
+FIELDS = struct.Struct("<IBBBqH")
+EXTRA_LENGTH = struct.Struct("<I")
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Keys stored in the fixed fields; any other key goes to extra
+FIXED_KEYS = ("name", "day", "hunger", "thirst", "energy", "save_date")
+
+# Range of the integer fields (day is an I, the gauges are B)
+FIELD_RANGES = (("day", 1, 2**32 - 1), ("hunger", 0, 255), ("thirst", 0, 255), ("energy", 0, 255))
+
+# Save files in a directory or zip (the index is not a save)
+SAVE_EXTENSIONS = (".json", ".sav")
+INDEX_FILE = "index.json"
+
+
+class SaveFormatError(ValueError):
+    """Raised when save data is truncated, corrupted or of an unknown version"""
+
+
+def is_binary(data):
+    """Whether data (bytes) starts with a binary save record"""
+    return data[:len(MAGIC)] == MAGIC
+
+
+def is_save_file(filename):
+    """Whether a file name is a save slot's (not the index or another file)"""
+    filename = os.path.basename(filename)
+    return os.path.splitext(filename)[1] in SAVE_EXTENSIONS and filename != INDEX_FILE
+
+
+def check_state(state):
+    """
+    Raise SaveFormatError unless state is a saved game the binary fields can
+    hold: a text name, a day from 1 and integer gauges in 0-255.
+    """
+    if not isinstance(state, dict):
+        raise SaveFormatError("invalid save: expected an object")
+    if not isinstance(state.get("name", ""), str):
+        raise SaveFormatError("invalid save: the name must be text")
+    for key, low, high in FIELD_RANGES:
+        value = state.get(key)
+        if type(value) is not int or not low <= value <= high:
+            raise SaveFormatError(f"invalid save: '{key}' must be an integer from {low} to {high}, "
+                                  f"not {value!r}")
+
+
+def encode(state, compress=False):
+    """
+    Return the binary record of a saved state (see SaveManager.write).
+    Raises SaveFormatError if a field does not fit (see check_state) or
+    the save date is not in DATE_FORMAT.
+    """
+    check_state(state)
+    name = state.get("name", "Adventurer").encode("utf-8")
+    save_date = state.get("save_date")
+    try:
+        timestamp = (int(datetime.strptime(save_date, DATE_FORMAT).timestamp())
+                     if save_date else 0)
+    except (TypeError, ValueError):
+        raise SaveFormatError(f"bad save_date {save_date!r}")
+    extra = {key: value for key, value in state.items() if key not in FIXED_KEYS}
+    extra = json.dumps(extra, ensure_ascii=False).encode("utf-8") if extra else b""
+    
+    payload = b"".join((
+        FIELDS.pack(state["day"], state["hunger"], state["thirst"], state["energy"],
+                    timestamp, len(name)),
+        name,
+        EXTRA_LENGTH.pack(len(extra)),
+        extra
+    ))
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= COMPRESSED
+    return HEADER.pack(MAGIC, VERSION, flags, len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_from(buffer, offset=0):
+    """
+    Decode the record starting at offset in buffer (bytes or memoryview).
+    Return (state, offset of the next record).
+    """
+    if len(buffer) - offset < HEADER.size:
+        raise SaveFormatError(f"truncated header at byte {offset}")
+    magic, version, flags, length, crc = HEADER.unpack_from(buffer, offset)
+    if magic != MAGIC:
+        raise SaveFormatError(f"not a binary save at byte {offset}")
+    if version != VERSION:
+        raise SaveFormatError(f"unsupported save version {version} at byte {offset}")
+    
+    start = offset + HEADER.size
+    end = start + length
+    if end > len(buffer):
+        raise SaveFormatError(f"truncated record at byte {offset}")
+    payload = buffer[start:end]
+    if zlib.crc32(payload) != crc:
+        raise SaveFormatError(f"checksum mismatch at byte {offset}")
+    if flags & COMPRESSED:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise SaveFormatError(f"corrupted compressed record at byte {offset}: {e}")
+    
+    try:
+        day, hunger, thirst, energy, timestamp, name_length = FIELDS.unpack_from(payload)
+        position = FIELDS.size + name_length
+        name = bytes(payload[FIELDS.size:position]).decode("utf-8")
+        extra_length, = EXTRA_LENGTH.unpack_from(payload, position)
+        position += EXTRA_LENGTH.size
+        extra = bytes(payload[position:position + extra_length])
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SaveFormatError(f"malformed record at byte {offset}: {e}")
+    
+    state = {"name": name, "day": day, "hunger": hunger, "thirst": thirst, "energy": energy}
+    if timestamp:
+        # Same text as DATE_FORMAT, several times faster than strftime
+        state["save_date"] = datetime.fromtimestamp(timestamp).isoformat(" ")
+    if extra:
+        try:
+            state.update(json.loads(extra.decode("utf-8")))
+        except (UnicodeDecodeError, ValueError) as e:
+            raise SaveFormatError(f"malformed extra data at byte {offset}: {e}")
+    return state, end
+
+
+def decode(data):
+    """Decode a single binary record"""
+    state, end = decode_from(data)
+    if end != len(data):
+        raise SaveFormatError("trailing data after the save record")
+    return state
+
+
+def parse_save(data):
+    """Decode save file contents (bytes), binary or JSON"""
+    if is_binary(data):
+        return decode(data)
+    try:
+        state = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise SaveFormatError(f"invalid save: {e}")
+    if not isinstance(state, dict):
+        raise SaveFormatError("invalid save: expected an object")
+    return state
+
+
+def iter_records(data):
+    """Decode every record of concatenated binary saves, in order"""
+    buffer = memoryview(data)
+    offset = 0
+    while offset < len(buffer):
+        state, offset = decode_from(buffer, offset)
+        yield state
+
+
+def load_archive(path):
+    """
+    Load every save of an archive: a file of concatenated binary records,
+    or a zip of save files (binary or JSON; other members, like the index,
+    are skipped). Return a list of states. Any invalid save raises
+    SaveFormatError, naming its member.
+    """
+    import zipfile
+    if zipfile.is_zipfile(path):
+        states = []
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or not is_save_file(member.filename):
+                    continue
+                data = archive.read(member)
+                try:
+                    if is_binary(data):
+                        states.extend(iter_records(data))
+                    else:
+                        state = parse_save(data)
+                        check_state(state)
+                        states.append(state)
+                except SaveFormatError as e:
+                    raise SaveFormatError(f"{member.filename}: {e}")
+        return states
+    
+    with open(path, "rb") as f:
+        return list(iter_records(f.read()))
+
+
+def pack_directory(directory, path, compress=False):
+    """
+    Concatenate every save of a directory into one archive. Return the count.
+    Raises SaveFormatError, naming the file, if a save is invalid.
+    """
+    count = 0
+    with open(path, "wb") as out:
+        for filename in sorted(os.listdir(directory)):
+            if not is_save_file(filename):
+                continue
+            with open(os.path.join(directory, filename), "rb") as f:
+                data = f.read()
+            try:
+                states = list(iter_records(data)) if is_binary(data) else [parse_save(data)]
+                records = [encode(state, compress) for state in states]
+            except SaveFormatError as e:
+                raise SaveFormatError(f"{filename}: {e}")
+            out.writelines(records)
+            count += len(records)
+    return count
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Pack and check binary save archives")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="pack a save directory into one archive")
+    pack.add_argument("directory")
+    pack.add_argument("archive")
+    pack.add_argument("--compress", action="store_true", help="zlib-compress every record")
+    check = commands.add_parser("check", help="validate an archive (binary or zip)")
+    check.add_argument("archive")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    if args.command == "pack":
+        try:
+            count = pack_directory(args.directory, args.archive, args.compress)
+        except SaveFormatError as e:
+            raise SystemExit(f"❌ {args.directory}: {e}")
+        print(f"Packed {count} saves into {args.archive}")
+    else:
+        try:
+            states = load_archive(args.archive)
+        except SaveFormatError as e:
+            raise SystemExit(f"❌ {args.archive}: {e}")
+        print(f"{len(states)} valid saves in {args.archive}")
+    print(f"Done in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Dialogues: game code that asks the player questions, written once for
+every front end.
+
+A dialogue is a generator: it yields each prompt and receives the
+player's answer from send(), and writes what the player reads through an
+output callable (print by default). The terminal game answers with
+input() (see run); the game server answers from a coroutine, over the
+player's connection (see src/server/session.py). Both run the same rules.
+"""
+
+
+class Pause(str):
+    """A prompt that only lets the player read on: any answer will do"""
+
+
+CONTINUE = Pause("\nPress Enter to continue...")
+
+
+def run(dialogue, answer=input):
+    """Play a dialogue to its end, answering each prompt with answer(prompt). Return its value."""
+    try:
+        prompt = next(dialogue)
+        while True:
+            prompt = dialogue.send(answer(prompt))
+    except StopIteration as stop:
+        return stop.value
@@ -0,0 +1,179 @@
+"""Persistent (immutable) hash map with structural sharing"""
+
+
+BITS = 5
+WIDTH_MASK = (1 << BITS) - 1
+HASH_MASK = 2**64 - 1
+
+
+class _Leaf:
+    """Keys sharing the same 64-bit hash, as a tuple of (key, value) pairs"""
+    
+    __slots__ = ("hash", "pairs")
+    
+    def __init__(self, hash_, pairs):
+        self.hash = hash_
+        self.pairs = pairs
+
+
+class _Node:
+    """Branch: one child per set bit of bitmap, in bit order"""
+    
+    __slots__ = ("bitmap", "children")
+    
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+
+def _set(node, shift, hash_, key, value):
+    """Return (node with key set, whether key is new)"""
+    if node is None:
+        return _Leaf(hash_, ((key, value),)), True
+    
+    if type(node) is _Leaf:
+        if node.hash == hash_:
+            pairs = tuple(pair for pair in node.pairs if pair[0] != key)
+            return _Leaf(hash_, pairs + ((key, value),)), len(pairs) == len(node.pairs)
+        # Different hashes: push the leaf one level down, they part further on
+        branch = _Node(1 << ((node.hash >> shift) & WIDTH_MASK), (node,))
+        return _set(branch, shift, hash_, key, value)
+    
+    bit = 1 << ((hash_ >> shift) & WIDTH_MASK)
+    index = bin(node.bitmap & (bit - 1)).count("1")
+    children = node.children
+    if node.bitmap & bit:
+        child, added = _set(children[index], shift + BITS, hash_, key, value)
+        return _Node(node.bitmap, children[:index] + (child,) + children[index + 1:]), added
+    leaf = _Leaf(hash_, ((key, value),))
+    return _Node(node.bitmap | bit, children[:index] + (leaf,) + children[index:]), True
+
+
+def _remove(node, shift, hash_, key):
+    """Return (node without key, or None when empty; whether key was there)"""
+    if node is None:
+        return None, False
+    
+    if type(node) is _Leaf:
+        if node.hash != hash_:
+            return node, False
+        pairs = tuple(pair for pair in node.pairs if pair[0] != key)
+        if len(pairs) == len(node.pairs):
+            return node, False
+        return (_Leaf(hash_, pairs) if pairs else None), True
+    
+    bit = 1 << ((hash_ >> shift) & WIDTH_MASK)
+    if not node.bitmap & bit:
+        return node, False
+    index = bin(node.bitmap & (bit - 1)).count("1")
+    children = node.children
+    child, removed = _remove(children[index], shift + BITS, hash_, key)
+    if not removed:
+        return node, False
+    if child is not None:
+        return _Node(node.bitmap, children[:index] + (child,) + children[index + 1:]), True
+    if len(children) == 1:
+        return None, True
+    return _Node(node.bitmap & ~bit, children[:index] + children[index + 1:]), True
+
+
+def _items(node):
+    if type(node) is _Leaf:
+        yield from node.pairs
+    else:
+        for child in node.children:
+            yield from _items(child)
+
+
+def _changed(a, b):
+    """Keys set differently in subtrees a and b (at the same depth)"""
+    if a is b:
+        return
+    if a is None or b is None:
+        for key, _ in _items(a if b is None else b):
+            yield key
+        return
+    if type(a) is _Node and type(b) is _Node:
+        bits = a.bitmap | b.bitmap
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            child_a = a.children[bin(a.bitmap & (bit - 1)).count("1")] if a.bitmap & bit else None
+            child_b = b.children[bin(b.bitmap & (bit - 1)).count("1")] if b.bitmap & bit else None
+            yield from _changed(child_a, child_b)
+        return
+    # A leaf against a subtree: compare their contents
+    pairs_a, pairs_b = dict(_items(a)), dict(_items(b))
+    for key in pairs_a.keys() | pairs_b.keys():
+        marker = object()
+        if pairs_a.get(key, marker) != pairs_b.get(key, marker):
+            yield key
+
+
+class PersistentMap:
+    """
+    Immutable mapping (a hash array mapped trie). set and remove return a
+    new map that shares every node with this one except the O(log n) on
+    the path to the key, so keeping many versions of a large map costs
+    little more than their differences.
+    """
+    
+    __slots__ = ("_root", "_size")
+    
+    def __init__(self, root=None, size=0):
+        self._root = root
+        self._size = size
+    
+    def __len__(self):
+        return self._size
+    
+    def __contains__(self, key):
+        marker = object()
+        return self.get(key, marker) is not marker
+    
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+    
+    def get(self, key, default=None):
+        """Value of key, or default"""
+        hash_ = hash(key) & HASH_MASK
+        node = self._root
+        shift = 0
+        while node is not None:
+            if type(node) is _Leaf:
+                if node.hash == hash_:
+                    for candidate, value in node.pairs:
+                        if candidate == key:
+                            return value
+                return default
+            bit = 1 << ((hash_ >> shift) & WIDTH_MASK)
+            if not node.bitmap & bit:
+                return default
+            node = node.children[bin(node.bitmap & (bit - 1)).count("1")]
+            shift += BITS
+        return default
+    
+    def set(self, key, value):
+        """Return a map with key set to value"""
+        root, added = _set(self._root, 0, hash(key) & HASH_MASK, key, value)
+        return PersistentMap(root, self._size + added)
+    
+    def remove(self, key):
+        """Return a map without key (this map if key is missing)"""
+        root, removed = _remove(self._root, 0, hash(key) & HASH_MASK, key)
+        return PersistentMap(root, self._size - 1) if removed else self
+    
+    def items(self):
+        """(key, value) pairs, in no particular order"""
+        if self._root is None:
+            return iter(())
+        return _items(self._root)
+    
+    def changed(self, other):
+        """
+        Keys whose value differs between this map and other (or that only
+        one of them has). Subtrees the two maps share are skipped, so
+        comparing two versions costs in proportion to their differences.
+        """
+        return _changed(self._root, other._root)
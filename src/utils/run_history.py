@@ -0,0 +1,202 @@
+"""
+Persistent history of finished runs, and its leaderboards.
+
+Every game that ends in a victory or a death is appended to a SQLite
+database (saves/runs.db by default), never rewritten. The runs table is
+indexed on days survived, on (cause of death, days) and on (player name,
+days), and a second table keeps the best run of each player, updated in
+the same transaction as each new run. Every leaderboard query is then an
+ordered walk of one index that stops after k rows: O(k log n), the same
+with a million runs as with ten, and nothing ever scans the history.
+
+Usage:
+    python -m src.utils.run_history                 # best runs
+    python -m src.utils.run_history --players       # best run of each player
+    python -m src.utils.run_history --name Bob      # a player's best runs
+    python -m src.utils.run_history --fill 1000000  # random runs, to measure
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime
+
+from src.entities.player import Player
+
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        outcome TEXT NOT NULL,
+        days INTEGER NOT NULL,
+        cause TEXT,
+        seed INTEGER,
+        ended TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS runs_by_days ON runs (days DESC, id)",
+    "CREATE INDEX IF NOT EXISTS runs_by_cause ON runs (cause, days DESC, id)",
+    "CREATE INDEX IF NOT EXISTS runs_by_name ON runs (name, days DESC, id)",
+    """CREATE TABLE IF NOT EXISTS bests (
+        name TEXT PRIMARY KEY,
+        run INTEGER NOT NULL,
+        days INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS bests_by_days ON bests (days DESC, run)",
+)
+
+# Constant statement texts, so sqlite3's statement cache keeps them prepared
+# (ties go to the earlier run: ids grow with time)
+COLUMNS = "id, name, outcome, days, cause, seed, ended"
+INSERT = "INSERT INTO runs (name, outcome, days, cause, seed, ended) VALUES (?, ?, ?, ?, ?, ?)"
+UPDATE_BEST = ("INSERT INTO bests (name, run, days) VALUES (?, ?, ?) "
+               "ON CONFLICT (name) DO UPDATE SET run = excluded.run, days = excluded.days "
+               "WHERE excluded.days > bests.days")
+TOP = f"SELECT {COLUMNS} FROM runs ORDER BY days DESC, id LIMIT ?"
+TOP_BY_CAUSE = f"SELECT {COLUMNS} FROM runs WHERE cause = ? ORDER BY days DESC, id LIMIT ?"
+TOP_BY_NAME = f"SELECT {COLUMNS} FROM runs WHERE name = ? ORDER BY days DESC, id LIMIT ?"
+TOP_PLAYERS = (f"SELECT {', '.join('runs.' + column for column in COLUMNS.split(', '))} "
+               "FROM bests JOIN runs ON runs.id = bests.run ORDER BY bests.days DESC, bests.run LIMIT ?")
+LAST_ID = "SELECT MAX(id) FROM runs"
+
+
+def _run(row):
+    run_id, name, outcome, days, cause, seed, ended = row
+    return {"id": run_id, "name": name, "outcome": outcome, "days": days, "cause": cause,
+            "seed": seed, "ended": ended}
+
+
+class RunHistory:
+    """Finished runs in a SQLite database (see the module docstring)"""
+    
+    PATH = os.path.join("saves", "runs.db")
+    
+    def __init__(self, path=PATH, synchronous="FULL"):
+        self.path = path
+        self.synchronous = synchronous
+        
+        # Opened on first use: most games only add a run when they end
+        self._connection = None
+    
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, cached_statements=32)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+    
+    def add(self, name, outcome, days, cause=None, seed=None, ended=None):
+        """
+        Append a finished run: outcome "won" or "dead", the full days
+        survived and the cause of death. Return its id. Raises sqlite3.Error
+        or OSError on failure.
+        """
+        ended = ended or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        connection = self._connect()
+        with connection:
+            run_id = connection.execute(INSERT, (name, outcome, days, cause, seed, ended)).lastrowid
+            connection.execute(UPDATE_BEST, (name, run_id, days))
+        return run_id
+    
+    def add_many(self, runs):
+        """Append (name, outcome, days, cause, seed, ended) tuples in one transaction"""
+        connection = self._connect()
+        with connection:
+            for run in runs:
+                run_id = connection.execute(INSERT, run).lastrowid
+                connection.execute(UPDATE_BEST, (run[0], run_id, run[2]))
+    
+    def top(self, k=10, cause=None):
+        """The k runs that survived the most days, of one cause of death if given"""
+        if cause is None:
+            rows = self._connect().execute(TOP, (k,))
+        else:
+            rows = self._connect().execute(TOP_BY_CAUSE, (cause, k))
+        return [_run(row) for row in rows]
+    
+    def player_runs(self, name, k=10):
+        """The k best runs of a player"""
+        return [_run(row) for row in self._connect().execute(TOP_BY_NAME, (name, k))]
+    
+    def player_best(self, name):
+        """The best run of a player, or None"""
+        runs = self.player_runs(name, 1)
+        return runs[0] if runs else None
+    
+    def top_players(self, k=10):
+        """The best run of each of the k best players"""
+        return [_run(row) for row in self._connect().execute(TOP_PLAYERS, (k,))]
+    
+    def count(self):
+        """Number of runs recorded (runs are never deleted: the last id)"""
+        return self._connect().execute(LAST_ID).fetchone()[0] or 0
+    
+    def close(self):
+        """Close the database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def fill(history, runs, seed=None, batch=10000):
+    """Append random runs (to measure the queries on a large history)"""
+    rng = random.Random(seed)
+    names = [f"Player{number}" for number in range(max(1, runs // 20))]
+    causes = list(Player.DEATH_CAUSES.values())
+    ended = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for first in range(0, runs, batch):
+        rows = []
+        for _ in range(min(batch, runs - first)):
+            days = min(int(rng.expovariate(0.3)), 7)
+            won = days == 7
+            rows.append((rng.choice(names), "won" if won else "dead", days,
+                         None if won else rng.choice(causes), rng.randrange(2**32), ended))
+        history.add_many(rows)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Leaderboards of the finished runs")
+    parser.add_argument("--db", default=RunHistory.PATH)
+    parser.add_argument("-k", type=int, default=10, help="rows to show")
+    parser.add_argument("--players", action="store_true", help="best run of each player")
+    parser.add_argument("--name", help="best runs of one player")
+    parser.add_argument("--cause", help="best runs that ended with this cause of death")
+    parser.add_argument("--fill", type=int, metavar="RUNS", help="append random runs first")
+    args = parser.parse_args()
+    
+    history = RunHistory(args.db)
+    try:
+        if args.fill:
+            start = time.perf_counter()
+            fill(history, args.fill)
+            print(f"Appended {args.fill:,} runs in {time.perf_counter() - start:.1f}s")
+        
+        start = time.perf_counter()
+        if args.players:
+            runs = history.top_players(args.k)
+        elif args.name:
+            runs = history.player_runs(args.name, args.k)
+        else:
+            runs = history.top(args.k, args.cause)
+        elapsed = time.perf_counter() - start
+        
+        for rank, run in enumerate(runs, 1):
+            print(f"{rank:>3}. {run['name']:<20} {run['days']:>3} days  "
+                  f"{run['cause'] or run['outcome']}  ({run['ended']})")
+        print(f"{len(runs)} of {history.count():,} runs in {elapsed * 1000:.2f} ms")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
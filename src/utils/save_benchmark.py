@@ -0,0 +1,87 @@
+"""
+Benchmark of the save backends.
+
+Several threads save at once (as the autosavers of many sessions or a
+server would), then random slots are loaded back. Reports the saves per
+second and the load latency of FileBackend and SQLiteBackend, each in a
+fresh temporary directory.
+
+Usage:
+    python -m src.utils.save_benchmark --threads 16 --saves 200
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from src.utils.save_manager import FileBackend, SaveManager
+from src.utils.sqlite_backend import SQLiteBackend
+
+
+BACKENDS = {
+    "files": lambda directory: FileBackend(directory),
+    "sqlite": lambda directory: SQLiteBackend(os.path.join(directory, "saves.db"))
+}
+
+
+def _state(rng, index):
+    return {"name": f"Player {index}", "day": rng.randint(1, 7), "hunger": rng.randint(0, 100),
+            "thirst": rng.randint(0, 100), "energy": rng.randint(0, 100)}
+
+
+def benchmark(kind, threads, saves, loads, seed=0):
+    """Return (saves per second, sorted load latencies in seconds) of a backend"""
+    directory = tempfile.mkdtemp(prefix=f"saves-{kind}-")
+    try:
+        manager = SaveManager(backend=BACKENDS[kind](directory))
+        slots = [f"slot-{i}" for i in range(threads * saves)]
+        
+        def writer(part):
+            rng = random.Random(seed + part)
+            for index in range(part * saves, (part + 1) * saves):
+                manager.write(_state(rng, index), slots[index])
+        
+        workers = [threading.Thread(target=writer, args=(part,)) for part in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        rate = len(slots) / (time.perf_counter() - start)
+        
+        rng = random.Random(seed)
+        latencies = []
+        for _ in range(loads):
+            slot = rng.choice(slots)
+            start = time.perf_counter()
+            manager.backend.read(slot)
+            latencies.append(time.perf_counter() - start)
+        manager.close()
+        return rate, sorted(latencies)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Compare the save backends")
+    parser.add_argument("--threads", type=int, default=16, help="threads saving at once")
+    parser.add_argument("--saves", type=int, default=200, help="saves per thread")
+    parser.add_argument("--loads", type=int, default=2000, help="random loads afterwards")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), action="append",
+                        help="backend to test (default: all)")
+    args = parser.parse_args()
+    
+    for kind in args.backend or sorted(BACKENDS):
+        rate, latencies = benchmark(kind, args.threads, args.saves, args.loads)
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+        print(f"{kind:>6}: {rate:,.0f} saves/s, load p50 {p50:.0f} µs, p99 {p99:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,80 +2,340 @@
 
 import json
 import os
+import re
+import threading
 from datetime import datetime
 
+from src.utils import binary_save
+
+
+def atomic_write(path, data):
+    """
+    Write bytes or text to path atomically: the data goes to a temporary
+    file in the same directory, which then replaces the target, so a crash
+    leaves either the old file or the new one, never a truncated one.
+    """
+    # tempfile is slow to import and only needed once something is saved
+    import tempfile
+    directory = os.path.dirname(path) or "."
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def index_entry(data):
+    """Listing metadata of a save"""
+    return {
+        "name": data.get("name", "Adventurer"),
+        "day": data.get("day", 1),
+        "save_date": data.get("save_date", "Unknown")
+    }
+
+
+class FileBackend:
+    """
+    Stores each save slot in its own file, JSON or binary (see
+    binary_save.py); reading detects the format. The index file keeps the
+    metadata of every slot (player name, day, save date), so listing the
+    saves reads a single small file. The index is only a cache of the slot
+    files: it is rebuilt from them when missing or unreadable.
+    
+    Backends implement write, read, delete, list and location; write and
+    delete must be safe to call from several threads.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    # Format of the files written ("json" or "binary") and their extensions
+    EXTENSIONS = {"json": ".json", "binary": ".sav"}
+    
+    def __init__(self, directory="saves", save_format="json"):
+        if save_format not in self.EXTENSIONS:
+            raise ValueError(f"unknown save format '{save_format}'")
+        self.directory = directory
+        self.save_format = save_format
+        
+        # The save directory is only created by the first write
+        self._directory_ready = False
+        
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+        
+        # Cached index and the (mtime, size) of the file it was read from
+        self._index = None
+        self._index_stamp = None
+        
+        # Serializes slot and index updates (the autosaver writes from its own thread)
+        self._lock = threading.RLock()
+    
+    def slot_path(self, slot, save_format=None):
+        """Path of a slot's save file in the given format (default: the one written)"""
+        extension = self.EXTENSIONS[save_format or self.save_format]
+        return os.path.join(self.directory, f"{slot}{extension}")
+    
+    def _slot_paths(self, slot):
+        """Possible paths of a slot's file, the written format first"""
+        formats = sorted(self.EXTENSIONS, key=lambda name: name != self.save_format)
+        return [self.slot_path(slot, name) for name in formats]
+    
+    def location(self, slot):
+        """Where a slot is stored, for messages"""
+        return self.slot_path(slot)
+    
+    def _read_index(self):
+        """Return the slot index, rereading the file only when it changed"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return self.rebuild_index()
+        
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._index is not None and stamp == self._index_stamp:
+            return self._index
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if not isinstance(index, dict):
+                raise ValueError("the save index must be an object")
+        except (OSError, ValueError):
+            return self.rebuild_index()
+        
+        self._index = index
+        self._index_stamp = stamp
+        return index
+    
+    def _write_index(self, index):
+        atomic_write(self.index_path, json.dumps(index, ensure_ascii=False, separators=(",", ":")))
+        stat = os.stat(self.index_path)
+        self._index = index
+        self._index_stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    def rebuild_index(self):
+        """Rebuild the index by reading every slot file (slow, recovery only)"""
+        index = {}
+        try:
+            filenames = os.listdir(self.directory)
+        except FileNotFoundError:
+            # Nothing saved yet: the directory is created by the first write
+            self._index = index
+            self._index_stamp = None
+            return index
+        
+        for filename in filenames:
+            slot, extension = os.path.splitext(filename)
+            if extension not in self.EXTENSIONS.values() or filename == self.INDEX_FILE:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), 'rb') as f:
+                    data = binary_save.parse_save(f.read())
+                index[slot] = index_entry(data)
+            except (OSError, ValueError):
+                # Unreadable slot: leave it out of the listing
+                continue
+        
+        try:
+            self._write_index(index)
+        except OSError:
+            self._index = index
+            self._index_stamp = None
+        return index
+    
+    def list(self):
+        """Return the index: {slot: metadata}"""
+        return self._read_index()
+    
+    def write(self, slot, data):
+        """Write a save (a dict with its save_date) to a slot, then index it"""
+        if self.save_format == "binary":
+            contents = binary_save.encode(data)
+        else:
+            contents = json.dumps(data, ensure_ascii=False)
+        
+        with self._lock:
+            if not self._directory_ready:
+                os.makedirs(self.directory, exist_ok=True)
+                self._directory_ready = True
+            atomic_write(self.slot_path(slot), contents)
+            for path in self._slot_paths(slot)[1:]:
+                # The slot was saved in another format before
+                if os.path.exists(path):
+                    os.remove(path)
+            index = dict(self._read_index())
+            index[slot] = index_entry(data)
+            self._write_index(index)
+    
+    def read(self, slot):
+        """Return a slot's save. Raises FileNotFoundError if there is none."""
+        for path in self._slot_paths(slot):
+            if os.path.exists(path):
+                break
+        with open(path, 'rb') as f:
+            return binary_save.parse_save(f.read())
+    
+    def delete(self, slot):
+        """Delete a slot. Return True if it existed."""
+        with self._lock:
+            removed = False
+            for path in self._slot_paths(slot):
+                try:
+                    os.remove(path)
+                    removed = True
+                except FileNotFoundError:
+                    pass
+            
+            index = dict(self._read_index())
+            if index.pop(slot, None) is not None:
+                self._write_index(index)
+                removed = True
+        return removed
+    
+    def close(self):
+        """Nothing to release"""
+
 
 class SaveManager:
-    """Manages saving and loading game sessions to/from JSON"""
+    """
+    Manages saving and loading game sessions to/from save slots.
+    Where the slots live is up to the storage backend: FileBackend (one
+    file per slot, the default) or SQLiteBackend (see sqlite_backend.py),
+    chosen with the SURVIVAL_SAVE_BACKEND environment variable ("files" or
+    "sqlite") unless a backend is given.
+    """
     
     SAVE_DIR = "saves"
-    SAVE_FILE = "savegame.json"
     
-    def __init__(self):
-        # Create save directory if it doesn't exist
-        if not os.path.exists(self.SAVE_DIR):
-            os.makedirs(self.SAVE_DIR)
+    # Slot used by saves made before multi-slot support
+    LEGACY_SLOT = "savegame"
+    
+    # Format of the files written by the default backend ("json" or "binary")
+    FORMAT = "json"
+    
+    def __init__(self, save_format=None, backend=None):
+        self.save_format = save_format or self.FORMAT
         
-        self.save_path = os.path.join(self.SAVE_DIR, self.SAVE_FILE)
+        # The default backend is only opened when the saves are first used
+        self._backend = backend
+        
+        # Serializes slot allocation with the writes
+        self._lock = threading.RLock()
+    
+    @property
+    def backend(self):
+        """The storage backend, opened on first use"""
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._default_backend(self.save_format)
+        return self._backend
+    
+    def _default_backend(self, save_format):
+        kind = os.environ.get("SURVIVAL_SAVE_BACKEND", "files")
+        if kind == "sqlite":
+            from src.utils.sqlite_backend import SQLiteBackend
+            return SQLiteBackend(os.path.join(self.SAVE_DIR, "saves.db"))
+        if kind != "files":
+            raise ValueError(f"unknown save backend '{kind}' (expected 'files' or 'sqlite')")
+        return FileBackend(self.SAVE_DIR, save_format)
+    
+    def new_slot(self, name):
+        """Return an unused slot id derived from a player name"""
+        base = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "adventurer"
+        if base == "index":
+            base += "-save"
+        index = self.backend.list()
+        slot = base
+        number = 2
+        while slot in index:
+            slot = f"{base}-{number}"
+            number += 1
+        return slot
+    
+    def list_saves(self):
+        """
+        Return the saves as (slot, metadata) pairs, most recent first.
+        Only the index is read.
+        """
+        index = self.backend.list()
+        return sorted(index.items(), key=lambda item: item[1].get("save_date", ""), reverse=True)
+    
+    def write(self, state, slot):
+        """
+        Write a player state (see Player.get_state) to a slot and update
+        the index, without any output. Raises OSError on failure, or
+        SaveFormatError (a ValueError) if a binary save cannot hold the state.
+        """
+        data = dict(state)
+        data["save_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.backend.write(slot, data)
     
-    def save(self, player):
+    def save(self, player, slot=None, state=None):
         """
-        Saves the player's state to a JSON file.
-        Returns True on success, False otherwise.
+        Saves the player's state (or state, a dict holding it and more) to
+        a slot (a new one if slot is None).
+        Returns the slot on success, None otherwise.
         """
         try:
-            data = {
-                "name": player.name,
-                "day": player.day,
-                "hunger": player.hunger,
-                "thirst": player.thirst,
-                "energy": player.energy,
-                "save_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            with open(self.save_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            with self._lock:
+                if slot is None:
+                    slot = self.new_slot(player.name)
+                self.write(state if state is not None else player.get_state(), slot)
             
             print(f"\n✅ Game saved successfully!")
-            print(f"📁 File: {self.save_path}")
-            return True
+            print(f"📁 File: {self.backend.location(slot)}")
+            return slot
         
         except Exception as e:
             print(f"\n❌ Error while saving: {e}")
-            return False
+            return None
     
-    def load(self):
+    def load(self, slot=LEGACY_SLOT):
         """
-        Loads the player's state from the JSON file.
+        Loads the player's state from a slot.
         Returns a dictionary with the data, or None on failure.
         """
-        if not os.path.exists(self.save_path):
+        try:
+            data = self.backend.read(slot)
+        
+        except (FileNotFoundError, KeyError):
             print(f"\n❌ No saved game found.")
             return None
         
-        try:
-            with open(self.save_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            print(f"\n✅ Game loaded successfully!")
-            print(f"📅 Saved on: {data.get('save_date', 'Unknown')}")
-            return data
-        
         except Exception as e:
             print(f"\n❌ Error while loading: {e}")
             return None
+        
+        print(f"\n✅ Game loaded successfully!")
+        print(f"📅 Saved on: {data.get('save_date', 'Unknown')}")
+        return data
     
-    def save_exists(self):
-        """Checks if a save file exists"""
-        return os.path.exists(self.save_path)
+    def save_exists(self, slot=None):
+        """Checks if a slot (or, without a slot, any save) exists"""
+        index = self.backend.list()
+        if slot is None:
+            return bool(index)
+        return slot in index
     
-    def delete_save(self):
-        """Deletes the save file"""
-        if os.path.exists(self.save_path):
-            try:
-                os.remove(self.save_path)
-                return True
-            except Exception as e:
-                print(f"❌ Error while deleting: {e}")
-                return False
-        return False
+    def delete_save(self, slot=LEGACY_SLOT):
+        """Deletes a slot's save. Returns True if it existed."""
+        try:
+            return self.backend.delete(slot)
+        except Exception as e:
+            print(f"❌ Error while deleting: {e}")
+            return False
+    
+    def close(self):
+        """Release the backend (connections, writer thread), if it was opened"""
+        if self._backend is not None:
+            self._backend.close()
@@ -0,0 +1,190 @@
+"""
+SQLite save backend for SaveManager.
+
+All the slots live in one database in WAL mode, so readers never wait for
+the writer. Reads use a connection per thread. Writes and deletes are
+queued to a single writer thread, which commits everything queued since
+its last commit in one transaction (group commit): with many players
+saving at once, one fsync covers a whole batch of saves instead of one
+save each. The callers still wait until their save is durable.
+"""
+
+import os
+import sqlite3
+import threading
+
+from src.utils import binary_save
+from src.utils.save_manager import index_entry
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    slot TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    save_date TEXT NOT NULL,
+    data BLOB NOT NULL
+)
+"""
+
+# Constant statement texts, so sqlite3's statement cache keeps them prepared
+UPSERT = "INSERT OR REPLACE INTO saves (slot, name, day, save_date, data) VALUES (?, ?, ?, ?, ?)"
+DELETE = "DELETE FROM saves WHERE slot = ?"
+SELECT = "SELECT data FROM saves WHERE slot = ?"
+LIST = "SELECT slot, name, day, save_date FROM saves"
+
+
+class _Request:
+    """A queued write (data) or delete (data is None), and its result"""
+    
+    __slots__ = ("slot", "row", "done", "result", "error")
+    
+    def __init__(self, slot, row):
+        self.slot = slot
+        self.row = row
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SQLiteBackend:
+    """Save slots in a SQLite database (see the module docstring)"""
+    
+    # Most requests committed in one transaction
+    MAX_BATCH = 1000
+    
+    def __init__(self, path, synchronous="FULL"):
+        self.path = path
+        self.synchronous = synchronous
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Connections of the threads that used the backend, as (thread, connection)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(SCHEMA)
+        connection.commit()
+        
+        self._condition = threading.Condition()
+        self._queue = []
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="sqlite-saves", daemon=True)
+        self._writer.start()
+    
+    def _connection(self):
+        """
+        This thread's connection, opened on first use. The connections of
+        threads that have ended are closed then, so short-lived reader
+        threads do not leave their connections open.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # check_same_thread is off so other threads can close it
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                         cached_statements=32)
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.connection = connection
+            with self._connections_lock:
+                ended = [pair for pair in self._connections if not pair[0].is_alive()]
+                self._connections = [pair for pair in self._connections if pair[0].is_alive()]
+                self._connections.append((threading.current_thread(), connection))
+            for _, old in ended:
+                old.close()
+        return connection
+    
+    def location(self, slot):
+        """Where a slot is stored, for messages"""
+        return f"{self.path} (slot {slot})"
+    
+    def _submit(self, slot, row):
+        request = _Request(slot, row)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the save backend is closed")
+            self._queue.append(request)
+            self._condition.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+    
+    def write(self, slot, data):
+        """Write a save (a dict with its save_date) to a slot; return once committed"""
+        entry = index_entry(data)
+        row = (slot, entry["name"], entry["day"], entry["save_date"], binary_save.encode(data))
+        self._submit(slot, row)
+    
+    def delete(self, slot):
+        """Delete a slot. Return True if it existed."""
+        return self._submit(slot, None)
+    
+    def read(self, slot):
+        """Return a slot's save. Raises KeyError if there is none."""
+        row = self._connection().execute(SELECT, (slot,)).fetchone()
+        if row is None:
+            raise KeyError(slot)
+        return binary_save.decode(row[0])
+    
+    def list(self):
+        """Return {slot: metadata} for every slot"""
+        rows = self._connection().execute(LIST).fetchall()
+        return {slot: {"name": name, "day": day, "save_date": save_date}
+                for slot, name, day, save_date in rows}
+    
+    def _run(self):
+        connection = None
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                batch = self._queue[:self.MAX_BATCH]
+                del self._queue[:self.MAX_BATCH]
+            
+            # Every request is answered, whatever goes wrong: the callers wait for it
+            try:
+                if connection is None:
+                    connection = self._connection()
+                self._commit(connection, batch)
+            except sqlite3.Error:
+                # Find the failing request: retry one transaction each
+                for request in batch:
+                    try:
+                        self._commit(connection, [request])
+                    except Exception as e:
+                        request.error = e
+            except Exception as e:
+                # Rolled back: the whole batch failed
+                for request in batch:
+                    request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
+    
+    @staticmethod
+    def _commit(connection, batch):
+        """Apply requests in one transaction"""
+        with connection:
+            for request in batch:
+                if request.row is None:
+                    request.result = connection.execute(DELETE, (request.slot,)).rowcount > 0
+                else:
+                    connection.execute(UPSERT, request.row)
+    
+    def close(self):
+        """Commit what is queued, stop the writer and close every connection"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._writer.join()
+        with self._connections_lock:
+            for _, connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
@@ -0,0 +1,35 @@
+"""Shared fixtures: every test runs in its own directory"""
+
+import builtins
+
+import pytest
+
+from src.content import loader
+
+
+@pytest.fixture(autouse=True)
+def sandbox(tmp_path, monkeypatch):
+    """Run in an empty directory, where saves, logs and caches are written"""
+    monkeypatch.chdir(tmp_path)
+    
+    # The compiled packs go to a cache of the test's own, never the user's
+    # (XDG_CACHE_HOME for the processes tests start)
+    cache = tmp_path.parent / f"{tmp_path.name}-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    monkeypatch.setattr(loader, "CACHE_DIR", str(cache / "content"))
+    return tmp_path
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Script the player's answers: call it with the answers, in order"""
+    def script(*replies):
+        pending = iter(replies)
+        
+        def reply(prompt=""):
+            try:
+                return next(pending)
+            except StopIteration:
+                raise AssertionError(f"no scripted answer left for {prompt!r}") from None
+        monkeypatch.setattr(builtins, "input", reply)
+    return script
@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.utils.alias_table import AliasTable
+
+
+ITEMS = ["a", "b", "c", "d", "e"]
+WEIGHTS = [5, 0, 1, 2.5, 11.5]
+
+# Chi-square with 3 degrees of freedom (the four items that can be drawn)
+# exceeded with probability 0.001
+CRITICAL = 16.27
+
+
+def chi_square(counts, weights, draws):
+    total = sum(weights)
+    statistic = 0.0
+    for item, weight in zip(ITEMS, weights):
+        if weight:
+            expected = draws * weight / total
+            statistic += (counts[item] - expected) ** 2 / expected
+    return statistic
+
+
+@pytest.mark.parametrize("many", [False, True])
+def test_draws_follow_the_weights(many):
+    table = AliasTable(ITEMS, WEIGHTS)
+    rand = random.Random(11).random
+    draws = 100_000
+    if many:
+        counts = Counter(table.sample_many(draws, rand))
+    else:
+        counts = Counter(table.sample(rand) for _ in range(draws))
+    
+    assert counts["b"] == 0
+    assert sum(counts.values()) == draws
+    assert chi_square(counts, WEIGHTS, draws) < CRITICAL
+
+
+def test_an_empty_table_draws_none():
+    for table in (AliasTable([], []), AliasTable(["a", "b"], [0, 0])):
+        assert table.sample() is None
+        assert table.sample_many(3) == [None, None, None]
+    assert len(AliasTable([], [])) == 0
+
+
+def test_invalid_weights_are_refused():
+    with pytest.raises(ValueError):
+        AliasTable(["a", "b"], [1])
+    with pytest.raises(ValueError):
+        AliasTable(["a", "b"], [1, -1])
@@ -0,0 +1,55 @@
+import json
+import os
+
+from src.content import loader
+
+
+def shape(value):
+    """Compiled content as plain nested tuples, types included"""
+    if isinstance(value, (loader.Effect, loader.ActionSpec)):
+        return type(value).__name__, shape(value.__getstate__())
+    if isinstance(value, dict):
+        return "dict", tuple((key, shape(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(shape(item) for item in value)
+    return type(value).__name__, value
+
+
+DIRECTORIES = loader.pack_directories() + [loader.WORLD_PACK]
+
+
+def test_the_cache_loads_the_compiled_packs(sandbox):
+    compiled = loader.load_packs(DIRECTORIES, str(sandbox))
+    cached = loader.load_packs(DIRECTORIES, str(sandbox))
+    
+    assert os.listdir(sandbox) == [f"{compiled.digest}.json"]
+    assert shape(cached.actions) == shape(compiled.actions)
+    assert shape(cached.events) == shape(compiled.events)
+    assert cached.digest == compiled.digest
+
+
+def test_a_cache_that_does_not_match_is_compiled_again(sandbox):
+    pack = loader.load_packs(DIRECTORIES, str(sandbox))
+    path = sandbox / f"{pack.digest}.json"
+    document = json.loads(path.read_text(encoding="utf-8"))
+    
+    document["digest"] = "0" * 64
+    document["actions"] = []
+    path.write_text(json.dumps(document), encoding="utf-8")
+    assert shape(loader.load_packs(DIRECTORIES, str(sandbox)).actions) == shape(pack.actions)
+    
+    path.write_text("{broken", encoding="utf-8")
+    assert shape(loader.load_packs(DIRECTORIES, str(sandbox)).events) == shape(pack.events)
+
+
+def test_a_failed_cache_write_leaves_no_temporary_file(sandbox, monkeypatch):
+    def fail(source, target):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    
+    loader.load_packs(DIRECTORIES, str(sandbox))
+    assert os.listdir(sandbox) == []
+
+
+def test_the_cache_is_per_user():
+    assert os.path.isabs(loader.CACHE_DIR)
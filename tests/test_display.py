@@ -0,0 +1,29 @@
+import io
+
+import pytest
+
+from src.entities.player import Player
+from src.ui.display import Display
+from src.ui.renderer import FrameRenderer
+
+
+def screen(player):
+    stream = io.StringIO()
+    Display(FrameRenderer(stream, ansi=False)).show_gauges(player)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("value, emoji", [(-5, "🍖"), (0, "🍖"), (35, "🍞"), (50.5, "✅"), (140, "✅")])
+def test_gauges_outside_the_usual_range_are_shown(value, emoji):
+    player = Player("Bob")
+    player.hunger = value
+    line = next(line for line in screen(player).splitlines() if "Hunger" in line)
+    assert line.startswith(emoji)
+    bar = line[line.index("[") + 1:line.index("]")]
+    assert len(bar) == 20
+
+
+def test_clearing_a_stream_writes_nothing():
+    stream = io.StringIO()
+    FrameRenderer(stream, ansi=False).clear()
+    assert stream.getvalue() == ""
@@ -0,0 +1,41 @@
+import math
+
+from src.simulation.config import GameConfig
+from src.simulation.estimate import _half_width, _Stats, compare_win_rates, estimate_win_rate
+from src.simulation.headless import run_episodes
+from src.simulation.policies import GreedyPolicy, RandomPolicy
+
+
+def test_bernoulli_intervals_are_agresti_coull():
+    z = 1.96
+    for wins, episodes in ((0, 2000), (3, 500), (250, 500)):
+        stats = _Stats()
+        for index in range(episodes):
+            stats.add(1 if index < wins else 0)
+        
+        n = episodes + z * z
+        p = (wins + z * z / 2) / n
+        assert math.isclose(_half_width(stats, z, 0, 1), z * math.sqrt(p * (1 - p) / n),
+                            rel_tol=1e-3)
+
+
+def test_games_that_are_all_lost_do_not_stop_at_once():
+    hopeless = GameConfig({"decay.thirst": 50})
+    estimate = estimate_win_rate(GreedyPolicy(), hopeless, half_width=0.0005, seed=1,
+                                 max_episodes=20000)
+    
+    assert estimate.mean == 0
+    assert estimate.episodes > 2000 and estimate.half_width > 0
+
+
+def test_identical_arms_differ_by_nothing_within_a_real_interval():
+    estimate = compare_win_rates(GreedyPolicy(), GreedyPolicy(), half_width=0.01, seed=2)
+    assert estimate.mean == 0 and 0 < estimate.half_width <= 0.01
+
+
+def test_estimates_cover_the_win_rate():
+    estimate = estimate_win_rate(RandomPolicy(), half_width=0.02, seed=3)
+    reference = run_episodes(RandomPolicy(), 20000, seed=4).win_rate
+    
+    assert estimate.converged and estimate.half_width <= 0.02
+    assert abs(estimate.mean - reference) < 2 * estimate.half_width + 0.01
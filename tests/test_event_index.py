@@ -0,0 +1,90 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.content.loader import BIOMES, CONDITION_FIELDS
+from src.entities.player import Player
+from src.systems.event_index import EventIndex
+
+
+def holds(event, player, biome):
+    """The preconditions of an event, checked one by one"""
+    for condition in event.get("when", ()):
+        if condition[0] == "biome":
+            if biome is not None and biome not in condition[1]:
+                return False
+            continue
+        field, low, high = condition
+        value = getattr(player, field)
+        if (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+def catalog(rng, size):
+    # Few thresholds, as content is written: many events share their preconditions
+    thresholds = [None, 10, 30, 50, 70, 90]
+    events = []
+    for number in range(size):
+        when = []
+        for field in rng.sample(CONDITION_FIELDS, rng.randint(0, 3)):
+            low, high = sorted(rng.sample(thresholds[1:], 2))
+            when.append((field, rng.choice([None, low]), rng.choice([None, high])))
+        if rng.random() < 0.3:
+            when.append(("biome", tuple(sorted(rng.sample(BIOMES, rng.randint(1, 3))))))
+        event = {"name": f"event {number}", "probability": rng.choice([0, 1, 2, 5])}
+        if when:
+            event["when"] = tuple(when)
+        events.append(event)
+    return events
+
+
+def random_player(rng):
+    player = Player()
+    player.hunger, player.thirst, player.energy = (rng.randint(0, 100) for _ in range(3))
+    player.day = rng.randint(1, 100)
+    return player
+
+
+def test_eligible_events_match_a_linear_scan():
+    rng = random.Random(4)
+    events = catalog(rng, 300)
+    # A small cache, so cells are evicted and built again
+    index = EventIndex(events, cache_size=8)
+    
+    for _ in range(2000):
+        player = random_player(rng)
+        biome = rng.choice(BIOMES + (None,))
+        expected = [event for event in events if holds(event, player, biome)]
+        found = index.eligible(player, biome)
+        assert sorted(e["name"] for e in found) == sorted(e["name"] for e in expected)
+        
+        event = index.sample(player, rng.random, biome)
+        if any(e["probability"] for e in expected):
+            assert holds(event, player, biome) and event["probability"] > 0
+        else:
+            assert event is None
+
+
+def test_draws_follow_the_weights_of_the_eligible_events():
+    rng = random.Random(8)
+    events = catalog(rng, 100)
+    index = EventIndex(events)
+    player = random_player(rng)
+    eligible = [event for event in events if holds(event, player, "beach")]
+    total = sum(event["probability"] for event in eligible)
+    assert total
+    
+    draws = 50000
+    counts = Counter(event["name"] for event in
+                     index.sample_many(draws, player, rng.random, "beach"))
+    for event in eligible:
+        expected = draws * event["probability"] / total
+        assert abs(counts[event["name"]] - expected) < 5 * expected ** 0.5 + 1
+
+
+def test_a_field_tested_twice_is_refused():
+    event = {"name": "twice", "probability": 1, "when": (("day", 1, 3), ("day", 5, None))}
+    with pytest.raises(ValueError, match="day"):
+        EventIndex([event])
@@ -0,0 +1,52 @@
+import json
+
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.utils.run_history import RunHistory
+from src.utils.save_manager import SaveManager
+
+
+class LastGasp(Player):
+    """A player whose water runs out at the end of every day"""
+    
+    __slots__ = ()
+    
+    def natural_evolution(self):
+        super().natural_evolution()
+        self.thirst = 0
+
+
+def telemetry(sandbox):
+    path = sandbox / GameLoop.TELEMETRY_DIR / "telemetry.jsonl"
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_victory_with_an_empty_gauge_ends_the_game_once(sandbox, answers, monkeypatch):
+    monkeypatch.setattr(GameLoop, "DAILY_EVENT_CHANCE", 0)
+    player = LastGasp("Bob")
+    player.day = GameLoop.TARGET_DAYS
+    history = RunHistory(str(sandbox / "runs.db"))
+    answers("", "3", "")
+    
+    GameLoop(player, seed=1, run_history=history).start()
+    
+    runs = history.top(10)
+    assert [(run["outcome"], run["days"], run["cause"]) for run in runs] == [
+        ("won", GameLoop.TARGET_DAYS, None)]
+    assert history.player_best("Bob")["outcome"] == "won"
+    ends = [record for record in telemetry(sandbox) if record["type"] == "end"]
+    assert [end["outcome"] for end in ends] == ["won"]
+    history.close()
+
+
+def test_quitting_without_saving_drops_the_autosaves(sandbox, answers, monkeypatch):
+    monkeypatch.setattr(GameLoop, "DAILY_EVENT_CHANCE", 0)
+    answers("", "3", "", "q", "2")
+    GameLoop(Player("Bob"), seed=1, run_history=RunHistory(":memory:")).start()
+    assert SaveManager().list_saves() == []
+    
+    # A game saved by hand keeps its slot, and the autosaves since
+    answers("", "s", "", "3", "", "q", "2")
+    GameLoop(Player("Ann"), seed=1, run_history=RunHistory(":memory:")).start()
+    saves = SaveManager().list_saves()
+    assert [(info["name"], info["day"]) for _, info in saves] == [("Ann", 2)]
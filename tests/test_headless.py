@@ -0,0 +1,40 @@
+from src.entities.player import Player
+from src.entities.player_pool import PlayerPool
+from src.game.game_loop import GameLoop
+from src.simulation.headless import BatchResult, run_episodes, run_pool
+from src.simulation.policies import POLICIES
+
+
+def test_days_survived_are_full_days():
+    result = BatchResult()
+    dead = Player()
+    dead.day, dead.thirst = 4, 0
+    result.record(dead, False, GameLoop.TARGET_DAYS)
+    won = Player()
+    won.day = GameLoop.TARGET_DAYS + 1
+    result.record(won, True, GameLoop.TARGET_DAYS)
+    
+    assert dict(result.days_survived) == {3: 1, GameLoop.TARGET_DAYS: 1}
+    assert result.average_days == (3 + GameLoop.TARGET_DAYS) / 2
+
+
+def test_episodes_are_reproducible():
+    first = run_episodes(POLICIES["greedy"](), 300, seed=5)
+    second = run_episodes(POLICIES["greedy"](), 300, seed=5)
+    assert first.summary() == second.summary()
+    assert sum(first.days_survived.values()) == 300
+    assert set(first.days_survived) <= set(range(GameLoop.TARGET_DAYS + 1))
+    assert first.days_survived[GameLoop.TARGET_DAYS] == first.wins
+
+
+def test_pooled_players_play_like_players():
+    pool = PlayerPool(300)
+    result = run_pool(POLICIES["greedy"](), pool, seed=5)
+    
+    assert result.summary() == run_episodes(POLICIES["greedy"](), 300, seed=5).summary()
+    assert sum(1 for player in pool if player.day > GameLoop.TARGET_DAYS) == result.wins
+    assert not hasattr(pool[0], "__dict__")
+    last = pool[-1]
+    assert last.get_state() == {"name": "Adventurer", "day": pool.day[-1],
+                                "hunger": pool.hunger[-1], "thirst": pool.thirst[-1],
+                                "energy": pool.energy[-1]}
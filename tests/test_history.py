@@ -0,0 +1,64 @@
+import itertools
+import random
+
+import pytest
+
+from src.entities.player import Player
+from src.game.action_log import ActionLog
+from src.game.game_loop import GameLoop
+from src.game.history import History
+from src.game.replay import Replayer
+
+
+def test_older_days_are_thinned_out_to_keyframes():
+    history = History(max_snapshots=20, keyframe_every=2)
+    player = Player()
+    rng = random.Random(1)
+    states = {}
+    for day in range(1, 101):
+        player.day, player.hunger = day, day % 100
+        states[day] = (player.hunger, rng.getstate())
+        history.record(player, rng)
+        rng.random()
+    
+    days = history.days()
+    assert len(days) <= 20
+    assert days[-10:] == list(range(91, 101))
+    assert history.get(days[0] - 1) is None
+    for day in range(days[0], 101):
+        snapshot = history.get(day)
+        assert snapshot.day == max(kept for kept in days if kept <= day)
+        assert (snapshot.state()["hunger"], snapshot.rng_state()) == states[snapshot.day]
+    
+    history.truncate(95)
+    assert history.latest() == 95
+
+
+@pytest.mark.parametrize("world", [False, True])
+def test_rewound_games_replay_to_the_same_state(monkeypatch, world):
+    monkeypatch.setattr(GameLoop, "REWIND", True)
+    monkeypatch.setattr(GameLoop, "WORLD", world)
+    monkeypatch.setattr(GameLoop, "TARGET_DAYS", 40)
+    monkeypatch.setattr(GameLoop, "TELEMETRY", False)
+    monkeypatch.setattr(GameLoop, "RUN_HISTORY", False)
+    
+    for seed in range(4):
+        # Actions with rewinds among them, some back to days that do not exist
+        choices = itertools.cycle(["2", "1", "3", "r", "4", "1", "2", "3", "r", "1"])
+        days = itertools.cycle(["-2", "1", "-1", "x", "3"])
+        rewinds = []
+        
+        def reply(prompt=""):
+            if "Back to" in prompt:
+                rewinds.append(prompt)
+                return next(days)
+            return next(choices) if "choice" in prompt else ""
+        monkeypatch.setattr("builtins.input", reply)
+        
+        loop = GameLoop(Player("Bob"), seed=seed)
+        loop.start()
+        assert rewinds
+        
+        player, status = Replayer(ActionLog.load(loop.log_path)).replay()
+        assert player.get_state() == loop.player.get_state()
+        assert status == loop.outcome or (status, loop.outcome) == ("ended", "quit")
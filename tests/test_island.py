@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.simulation.island import Island, Stock
+
+
+def test_stocks_regrow_by_their_rule():
+    spring = Stock("water", 1000, 0.5, level=0)
+    spring.regrow()
+    assert spring.level == 500
+    
+    fish = Stock("fish", 1000, 0.5, logistic=True, level=0)
+    fish.regrow()
+    assert fish.level == 0
+    fish.level = 500
+    fish.regrow()
+    assert fish.level == 625
+    assert fish.take(700) == 625 and fish.level == 0
+
+
+def test_island_days_keep_the_counts_consistent():
+    island = Island(2000, seed=3)
+    alive = [int(island.alive.sum())]
+    while island.step() and island.days < 60:
+        alive.append(int(island.alive.sum()))
+        for stock in island.stocks.values():
+            assert 0 <= stock.level <= stock.capacity
+    
+    assert alive == sorted(alive, reverse=True)
+    dead = ~island.alive
+    assert dead.any()
+    assert sum(island.deaths().values()) == int(dead.sum())
+    assert (island.died_on[dead] > 0).all() and (island.died_on[island.alive] == 0).all()
+
+
+def test_a_controlled_survivor_is_left_to_its_player():
+    island = Island(100, seed=5)
+    survivor = island.control(0, "Bob")
+    survivor.hunger, survivor.thirst, survivor.energy = 50, 40, 30
+    
+    survivor.eat(10)
+    survivor.increment_day()
+    
+    assert island.days == 1
+    assert survivor.get_state() == {"name": "Bob", "day": 2, "hunger": 60, "thirst": 40,
+                                    "energy": 30}
+    assert int(island.day[1:].min()) == 2
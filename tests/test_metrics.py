@@ -0,0 +1,73 @@
+import types
+
+import pytest
+
+from src.game import metrics as metrics_module
+from src.game.metrics import INPUT, NULL_METRICS, LoopMetrics, from_environment
+
+
+class Clock:
+    """perf_counter moved by hand"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def perf_counter(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    fake_time = types.SimpleNamespace(perf_counter=clock.perf_counter)
+    monkeypatch.setattr(metrics_module, "time", fake_time)
+    return clock
+
+
+def test_input_time_is_left_out_of_the_enclosing_phases(clock):
+    metrics = LoopMetrics()
+    
+    with metrics.phase("turn"):
+        clock.now += 1
+        with metrics.phase("action"):
+            clock.now += 2
+            with metrics.phase(INPUT):
+                clock.now += 10
+            clock.now += 3
+        with metrics.phase(INPUT):
+            clock.now += 20
+        clock.now += 4
+    
+    # name: [count, total, busy, max busy]
+    assert metrics.phases["action"] == [1, 15, 5, 5]
+    assert metrics.phases["turn"] == [1, 40, 10, 10]
+    assert metrics.phases[INPUT] == [2, 30, 0, 0]
+    
+    snapshot = metrics.snapshot()
+    assert (snapshot["turns"], snapshot["processing_s"], snapshot["input_s"]) == (1, 10, 30)
+    assert snapshot["turn_busy"]["p50_ms"] == 10000
+
+
+def test_a_phase_nested_in_itself_is_timed_twice(clock):
+    metrics = LoopMetrics()
+    
+    with metrics.phase("events"):
+        clock.now += 1
+        with metrics.phase("events"):
+            clock.now += 2
+    assert metrics.phases["events"] == [2, 5, 5, 3]
+
+
+def test_null_metrics_record_nothing(sandbox, monkeypatch):
+    monkeypatch.delenv("SURVIVAL_METRICS", raising=False)
+    metrics = from_environment()
+    assert metrics is NULL_METRICS and not metrics.enabled
+    
+    with metrics.phase("turn"):
+        with metrics.phase(INPUT):
+            pass
+    metrics.count_event("🌧️ Rain")
+    metrics.maybe_dump(force=True)
+    metrics.dump("metrics.json")
+    assert not hasattr(metrics, "phases")
+    assert list(sandbox.iterdir()) == []
@@ -0,0 +1,76 @@
+import random
+
+from src.utils.persistent import PersistentMap, _Node
+
+
+class Collider:
+    """A key whose hash it shares with every other Collider"""
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __hash__(self):
+        return 7
+    
+    def __eq__(self, other):
+        return isinstance(other, Collider) and other.name == self.name
+
+
+def nodes(root):
+    """Every node and leaf of a trie"""
+    found = []
+    pending = [root] if root is not None else []
+    while pending:
+        node = pending.pop()
+        found.append(node)
+        if type(node) is _Node:
+            pending.extend(node.children)
+    return found
+
+
+def test_maps_behave_like_dicts_and_keep_their_versions():
+    rng = random.Random(2)
+    versions = [(PersistentMap(), {})]
+    for _ in range(3000):
+        current, expected = versions[-1]
+        key = rng.randrange(500)
+        if rng.random() < 0.3:
+            current = current.remove(key)
+            expected = {k: v for k, v in expected.items() if k != key}
+        else:
+            value = rng.random()
+            current = current.set(key, value)
+            expected = {**expected, key: value}
+        versions.append((current, expected))
+    
+    # Every version still holds what it held when it was made
+    for current, expected in versions[::50] + versions[-1:]:
+        assert len(current) == len(expected)
+        assert dict(current.items()) == expected
+        assert all(current.get(key) == value for key, value in expected.items())
+        assert -1 not in current and current.get(-1, "missing") == "missing"
+
+
+def test_colliding_keys_share_a_leaf():
+    first, second = Collider("first"), Collider("second")
+    both = PersistentMap().set(first, 1).set(second, 2).set(first, 3)
+    
+    assert len(both) == 2
+    assert (both.get(first), both.get(second)) == (3, 2)
+    alone = both.remove(first)
+    assert len(alone) == 1 and first not in alone and alone.get(second) == 2
+    assert alone.remove(first) is alone
+
+
+def test_new_versions_share_the_untouched_nodes():
+    base = PersistentMap()
+    for key in range(10000):
+        base = base.set(key, key)
+    changed = base.set(5000, -1).remove(42)
+    
+    old = {id(node) for node in nodes(base._root)}
+    new = [node for node in nodes(changed._root) if id(node) not in old]
+    # Only the paths to the two keys were copied (a few levels each)
+    assert len(new) <= 8
+    assert sorted(base.changed(changed)) == [42, 5000]
+    assert list(base.changed(base)) == []
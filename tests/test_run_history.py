@@ -0,0 +1,34 @@
+from src.utils.run_history import RunHistory
+
+
+def test_bests_keep_each_players_longest_run(sandbox):
+    history = RunHistory(str(sandbox / "runs.db"))
+    history.add("Bob", "dead", 3, "Died of thirst 💧")
+    history.add("Ann", "dead", 5, "Died of hunger 🍗")
+    history.add("Bob", "won", 7)
+    history.add("Bob", "dead", 2, "Died of exhaustion 💤")
+    history.add("Ann", "dead", 5, "Died of thirst 💧")
+    
+    assert history.count() == 5
+    assert [run["days"] for run in history.top(10)] == [7, 5, 5, 3, 2]
+    assert [(run["name"], run["days"]) for run in history.top_players()] == [("Bob", 7), ("Ann", 5)]
+    
+    # A tie does not replace the best: the earlier run stands
+    assert history.player_best("Ann")["cause"] == "Died of hunger 🍗"
+    assert [run["days"] for run in history.player_runs("Bob")] == [7, 3, 2]
+    assert [run["name"] for run in history.top(10, cause="Died of thirst 💧")] == ["Ann", "Bob"]
+    assert history.player_best("Eve") is None
+    history.close()
+
+
+def test_runs_survive_reopening(sandbox):
+    path = str(sandbox / "runs.db")
+    history = RunHistory(path)
+    history.add_many([("Bob", "dead", days, "Died of thirst 💧", None, "2024-01-01 00:00:00")
+                      for days in range(4)])
+    history.close()
+    
+    history = RunHistory(path)
+    assert history.count() == 4
+    assert history.top_players(1)[0]["days"] == 3
+    history.close()
@@ -0,0 +1,125 @@
+import json
+import sqlite3
+import threading
+import zipfile
+
+import pytest
+
+from src.entities.player import Player
+from src.utils import binary_save
+from src.utils.binary_save import SaveFormatError
+from src.utils.save_manager import FileBackend, SaveManager
+from src.utils.sqlite_backend import SQLiteBackend
+
+
+def player(name="Bob"):
+    player = Player(name)
+    player.day, player.hunger, player.thirst, player.energy = 4, 12, 0, 100
+    return player
+
+
+@pytest.mark.parametrize("save_format", ["json", "binary"])
+def test_saves_round_trip(sandbox, save_format):
+    manager = SaveManager(backend=FileBackend("saves", save_format))
+    slot = manager.save(player())
+    loaded = Player()
+    loaded.load_state(manager.load(slot))
+    
+    assert loaded.get_state() == player().get_state()
+    assert [slot for slot, _ in manager.list_saves()] == [slot]
+    manager.close()
+
+
+def test_sqlite_saves_round_trip(sandbox):
+    manager = SaveManager(backend=SQLiteBackend("saves.db"))
+    names = [f"Player {number}" for number in range(20)]
+    threads = [threading.Thread(target=manager.save, args=(player(name),)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    saves = dict(manager.list_saves())
+    assert sorted(meta["name"] for meta in saves.values()) == sorted(names)
+    slot = next(iter(saves))
+    loaded = Player()
+    loaded.load_state(manager.load(slot))
+    assert loaded.get_state() == player(saves[slot]["name"]).get_state()
+    
+    assert manager.delete_save(slot)
+    assert not manager.delete_save(slot)
+    assert manager.load(slot) is None
+    manager.close()
+
+
+def test_sqlite_writer_errors_reach_the_caller(sandbox, monkeypatch):
+    backend = SQLiteBackend("saves.db")
+    state = dict(player().get_state(), save_date="2024-05-01 12:30:00")
+    
+    def broken(connection, batch):
+        raise RuntimeError("disk on fire")
+    monkeypatch.setattr(SQLiteBackend, "_commit", staticmethod(broken))
+    with pytest.raises(RuntimeError, match="disk on fire"):
+        backend.write("bob", state)
+    
+    # The writer survived the error
+    monkeypatch.undo()
+    backend.write("bob", state)
+    assert backend.read("bob") == state
+    backend.close()
+
+
+def test_sqlite_connections_of_ended_threads_are_closed(sandbox):
+    backend = SQLiteBackend("saves.db")
+    readers = [threading.Thread(target=backend.list) for _ in range(10)]
+    for thread in readers:
+        thread.start()
+        thread.join()
+    connections = [connection for _, connection in backend._connections]
+    
+    # Only this thread's and the last reader's connections are left (the
+    # writer opens its own on its first write)
+    assert len(connections) == 2
+    backend.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_binary_records_round_trip(compress):
+    state = dict(player("Zoé 🏝️").get_state(), save_date="2024-05-01 12:30:00", history=[1, 2])
+    assert binary_save.decode(binary_save.encode(state, compress)) == state
+
+
+def test_out_of_range_gauges_are_refused(sandbox):
+    with pytest.raises(SaveFormatError, match="hunger"):
+        binary_save.encode(dict(player().get_state(), hunger=300))
+    with pytest.raises(SaveFormatError, match="bad save_date '01/05/2024'"):
+        binary_save.encode(dict(player().get_state(), save_date="01/05/2024"))
+    
+    directory = sandbox / "saves"
+    directory.mkdir()
+    (directory / "bob.json").write_text(json.dumps(dict(player().get_state(), energy=-1)))
+    with pytest.raises(SaveFormatError, match="bob.json.*energy"):
+        binary_save.pack_directory(str(directory), str(sandbox / "archive.bin"))
+
+
+def test_archives_hold_the_slot_files_only(sandbox):
+    manager = SaveManager(backend=FileBackend("saves", "json"))
+    manager.save(player("Bob"))
+    manager.save(player("Ann"))
+    manager.close()
+    
+    assert binary_save.pack_directory("saves", "archive.bin", compress=True) == 2
+    assert sorted(state["name"] for state in binary_save.load_archive("archive.bin")) == ["Ann", "Bob"]
+    
+    with zipfile.ZipFile("archive.zip", "w") as archive:
+        for path in (sandbox / "saves").iterdir():
+            archive.write(path, f"saves/{path.name}")
+        archive.writestr("README.txt", "not a save")
+    assert sorted(state["name"] for state in binary_save.load_archive("archive.zip")) == ["Ann", "Bob"]
+    
+    with zipfile.ZipFile("archive.zip", "a") as archive:
+        archive.writestr("saves/eve.json", json.dumps({"name": "Eve", "day": "three"}))
+    with pytest.raises(SaveFormatError, match="eve.json"):
+        binary_save.load_archive("archive.zip")
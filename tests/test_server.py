@@ -0,0 +1,99 @@
+import asyncio
+import random
+
+import pytest
+
+from src.game.metrics import INPUT, LoopMetrics
+from src.server.server import GameServer
+from src.server.session import PROMPT, SessionClosed, StreamChannel
+from src.utils.run_history import RunHistory
+
+
+async def play(port, rng, delay=0.0):
+    """Answer every question with a random action until the game ends; return the text read"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    text = []
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return "".join(text)
+            line = line.decode("utf-8")
+            text.append(line)
+            if line.startswith(PROMPT):
+                answer = "Bot" if "name" in line else rng.choice("1234")
+                await asyncio.sleep(delay)
+                writer.write(f"{answer}\n".encode("utf-8"))
+    finally:
+        writer.close()
+
+
+def test_sessions_play_to_the_end_and_record_their_runs(sandbox):
+    history = RunHistory(str(sandbox / "runs.db"))
+    
+    async def main():
+        server = GameServer(port=0, run_history=history)
+        port = await server.start()
+        rng = random.Random(7)
+        texts = await asyncio.gather(*(play(port, rng) for _ in range(5)))
+        await server.close()
+        return server, texts
+    
+    server, texts = asyncio.run(main())
+    assert server.sessions == 5
+    assert all("Press Enter" not in text for text in texts)
+    
+    # Recorded and closed on the recorder's thread: reopen to read
+    history = RunHistory(str(sandbox / "runs.db"))
+    assert history.count() == 5
+    assert {run["name"] for run in history.top()} == {"Bot"}
+    history.close()
+    
+    # Sessions save nothing and log nothing on the server
+    assert sorted(path.name for path in sandbox.iterdir() if not path.name.startswith("runs.db")) == []
+
+
+def test_server_metrics_time_answers_as_input(sandbox, monkeypatch):
+    monkeypatch.setenv("SURVIVAL_WORLD", "1")
+    monkeypatch.setenv("SURVIVAL_METRICS", str(sandbox / "metrics.json"))
+    metrics = LoopMetrics()
+    
+    async def main():
+        server = GameServer(port=0, run_history=RunHistory(":memory:"), metrics=metrics)
+        port = await server.start()
+        rng = random.Random(3)
+        await asyncio.gather(*(play(port, rng, delay=0.002) for _ in range(3)))
+        await server.close()
+    
+    asyncio.run(main())
+    
+    # The waits on the players are input, left out of the turns' processing
+    turns, total, busy, _ = metrics.phases["turn"]
+    waiting = metrics.phases[INPUT][1]
+    assert turns > 0
+    assert waiting >= 0.002 * turns
+    assert busy < total - 0.002 * turns
+    
+    # Sessions dump no metrics of their own and keep the map in memory
+    assert list(sandbox.iterdir()) == []
+
+
+def test_sending_to_a_dropped_connection_closes_the_session():
+    async def main():
+        accepted = asyncio.get_running_loop().create_future()
+        
+        async def handle(reader, writer):
+            accepted.set_result(StreamChannel(reader, writer, timeout=5))
+        
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        channel = await accepted
+        channel.writer.transport.abort()
+        with pytest.raises(SessionClosed):
+            await channel.send("x" * 2**20)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+    
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+import math
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.entities.player import Player
+from src.simulation.headless import HeadlessGame
+from src.simulation.policies import RandomPolicy
+from src.simulation.solver import OptimalPolicy, SolutionTable, SurvivalSolver
+
+
+DAYS = 3
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("solver") / "survival.tbl"
+    SurvivalSolver(target_days=DAYS).solve().save(str(path))
+    return str(path)
+
+
+def hard_start():
+    player = Player()
+    player.hunger, player.thirst, player.energy = 40, 30, 25
+    return player
+
+
+def test_tables_round_trip(table_path):
+    table = SolutionTable.load(table_path)
+    solved = SurvivalSolver(target_days=DAYS).solve()
+    
+    assert table.metadata == solved.metadata
+    assert (table.actions == solved.actions).all()
+    assert (table.choices == solved.choices).all()
+    assert (table.win == solved.win).all()
+    
+    dead = Player()
+    dead.thirst = 0
+    assert table.win_probability(dead) == 0.0
+
+
+def test_optimal_policy_wins_as_often_as_solved(table_path):
+    policy = OptimalPolicy(table_path)
+    expected = policy.table.win_probability(hard_start())
+    assert 0.2 < expected < 0.8
+    
+    # Two games sharing the policy, as the arms of estimate.py do
+    games = [HeadlessGame(policy, target_days=DAYS, rng=random.Random(seed)) for seed in (1, 2)]
+    episodes = 10000
+    wins = sum(game.play(hard_start())[1] for _ in range(episodes // 2) for game in games)
+    
+    sigma = math.sqrt(expected * (1 - expected) / episodes)
+    assert abs(wins / episodes - expected) < 4 * sigma
+
+
+def test_policies_are_told_where_events_are_met():
+    calls = []
+    
+    class Recording(RandomPolicy):
+        def choose_action(self, player, actions):
+            calls.append(("action", player.day))
+            return super().choose_action(player, actions)
+        
+        def choose_event(self, event, player, exploring=False):
+            calls.append((exploring, player.day))
+            return super().choose_event(event, player, exploring)
+    
+    # RandomPolicy draws from the random module
+    random.seed(3)
+    game = HeadlessGame(Recording(), rng=random.Random(3))
+    for _ in range(300):
+        game.play()
+    
+    events = [(previous, call) for previous, call in zip([None] + calls, calls)
+              if call[0] != "action"]
+    assert {exploring for _, (exploring, _) in events} == {False, True}
+    for previous, (exploring, day) in events:
+        # Exploring events come after the day's action, morning events before it
+        assert exploring == (previous == ("action", day))
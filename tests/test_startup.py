@@ -0,0 +1,7 @@
+from src.benchmarks.startup import cold_start
+
+
+def test_cold_start_reaches_the_menu_and_quits():
+    # A wrong menu answer waits for more input, hits the end of stdin and fails
+    game, bare = cold_start(runs=1)
+    assert len(game) == len(bare) == 1
@@ -0,0 +1,48 @@
+import pytest
+
+from src.simulation import sweep as sweep_module
+from src.simulation.config import GameConfig
+from src.simulation.sweep import Sweep
+
+
+def run(sandbox, grid):
+    sweep = Sweep(grid, episodes=200, seed=1, cache_dir=str(sandbox / "cache"))
+    return sweep.run(workers=1)
+
+
+def test_a_second_run_is_read_from_the_cache(sandbox):
+    first = run(sandbox, {"decay.thirst": [10, 15]})
+    assert [cached for _, _, cached in first] == [False, False]
+    
+    second = run(sandbox, {"decay.thirst": [10, 15]})
+    assert [cached for _, _, cached in second] == [True, True]
+    assert [result for _, result, _ in second] == [result for _, result, _ in first]
+
+
+def test_changing_a_value_recomputes_only_its_cell(sandbox, monkeypatch):
+    run(sandbox, {"decay.thirst": [10, 15]})
+    
+    evaluated = []
+    evaluate = sweep_module.evaluate
+    
+    def spy(values, *args):
+        evaluated.append(values["decay.thirst"])
+        return evaluate(values, *args)
+    monkeypatch.setattr(sweep_module, "evaluate", spy)
+    
+    results = run(sandbox, {"decay.thirst": [10, 20]})
+    assert [(cell["decay.thirst"], cached) for cell, _, cached in results] == [
+        (10, True), (20, False)]
+    assert evaluated == [20]
+
+
+def test_unknown_parameters_are_refused(sandbox):
+    with pytest.raises(KeyError, match="decay.thrist"):
+        GameConfig({"decay.thrist": 10})
+    with pytest.raises(KeyError, match="decay.thrist"):
+        GameConfig().replace({"decay.thrist": 10})
+    
+    # Before any cell is computed
+    with pytest.raises(KeyError):
+        run(sandbox, {"decay.thirst": [10], "decay.thrist": [10]})
+    assert not (sandbox / "cache").exists()
@@ -0,0 +1,43 @@
+from src.game.telemetry import TelemetryReport, TelemetryWriter, analyze, analyze_files
+
+
+def records():
+    return [
+        {"type": "start", "session": 1, "name": "Bob", "day": 1},
+        {"type": "day", "session": 1, "day": 1, "action": "1", "events": []},
+        {"type": "day", "session": 1, "day": 2, "action": "2", "events": ["🌧️ Rain"]},
+        {"type": "rewind", "session": 1, "day": 3, "to": 1},
+        {"type": "day", "session": 1, "day": 1, "action": "3", "events": []},
+        {"type": "end", "session": 1, "outcome": "won", "start_day": 1, "day": 8},
+        {"type": "start", "session": 2, "name": "Ann", "day": 1},
+        {"type": "end", "session": 2, "outcome": "quit", "start_day": 1, "day": 1},
+    ]
+
+
+def test_each_end_is_counted():
+    report = analyze(records())
+    assert report.sessions == 2
+    assert dict(report.outcomes) == {"won": 1, "quit": 1}
+    assert not report.death_causes
+    assert "Sessions: 2 (2 finished)" in report.summary()
+
+
+def test_rewound_days_are_counted_as_played():
+    report = analyze(records())
+    assert report.days == 3
+    assert (report.rewinds, report.rewound_days) == (1, 2)
+    assert report.to_dict()["rewound_days"] == 2
+
+
+def test_files_merge_into_the_same_report(sandbox):
+    writer = TelemetryWriter(str(sandbox), max_bytes=1)
+    for record in records():
+        # One file per session
+        if record["type"] == "start":
+            writer.flush()
+        writer.record(record.pop("type"), **record)
+    writer.close()
+    merged = analyze_files([str(sandbox)], workers=2)
+    single = analyze(records())
+    assert merged.to_dict() == single.to_dict()
+    assert isinstance(merged, TelemetryReport)
@@ -0,0 +1,18 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.simulation.vectorized import compare_with_scalar
+
+
+@pytest.mark.parametrize("policy", ["greedy", "random"])
+def test_vectorized_rules_match_the_scalar_rules(policy):
+    scalar, vectorized, statistics = compare_with_scalar(20000, policy, seed=11)
+    
+    assert scalar.episodes == vectorized.episodes == 20000
+    assert abs(statistics["win_rate_z"]) < 4
+    
+    # Sampling noise alone stays around 0.01 at this size
+    assert statistics["days_total_variation"] < 0.03
+    assert statistics["deaths_total_variation"] < 0.03
+    assert statistics["causes_total_variation"] < 0.03
@@ -0,0 +1,98 @@
+import random
+
+from src.entities.player import Player
+from src.game.game_loop import GameLoop
+from src.systems.events import EventManager
+from src.systems.world import CHUNK_SIZE, WorldMap, generate
+
+
+def test_terrain_only_depends_on_the_seed_and_the_tile():
+    first = WorldMap(9)
+    small = WorldMap(9, cache_size=2)
+    tiles = [(x, y) for x in range(-40, 40, 3) for y in range(-40, 40, 3)]
+    
+    expected = [first.terrain(x, y) for x, y in tiles]
+    assert [small.terrain(x, y) for x, y in reversed(tiles)] == expected[::-1]
+    assert small.generated > first.generated
+    assert generate(9, 1, -2) == generate(9, 1, -2) != generate(10, 1, -2)
+
+
+def test_explorers_stay_ashore_and_rewind():
+    world = WorldMap(4)
+    rng = random.Random(4)
+    start = world.snapshot()
+    for _ in range(50):
+        position = world.explore(rng)
+        assert world.biome() != "sea" and world.visited(*position)
+    
+    world.restore(start)
+    assert world.snapshot() == start
+    assert not any(world.visited(x, y) for x in range(-CHUNK_SIZE, CHUNK_SIZE)
+                   for y in range(-CHUNK_SIZE, CHUNK_SIZE) if (x, y) != start[0])
+
+
+def test_only_changed_chunks_are_saved(sandbox):
+    world = WorldMap(4, directory="world")
+    rng = random.Random(1)
+    for _ in range(20):
+        world.explore(rng)
+    world.save()
+    saved = {path.name: path.stat().st_mtime_ns for path in (sandbox / "world").iterdir()}
+    assert saved
+    
+    world.save()
+    assert {path.name: path.stat().st_mtime_ns for path in (sandbox / "world").iterdir()} == saved
+    
+    again = WorldMap(4, directory="world", position=world.position)
+    visited = [(x, y) for x in range(-64, 64) for y in range(-64, 64) if world.visited(x, y)]
+    assert all(again.visited(x, y) for x, y in visited)
+
+
+def test_loaded_games_go_on_with_their_map(sandbox, answers, monkeypatch):
+    monkeypatch.setattr(GameLoop, "WORLD", True)
+    monkeypatch.setattr(GameLoop, "TELEMETRY", False)
+    monkeypatch.setattr(GameLoop, "RUN_HISTORY", False)
+    monkeypatch.setattr(GameLoop, "DAILY_EVENT_CHANCE", 0)
+    monkeypatch.setattr(EventManager, "EVENT_CHANCE", 0)
+    
+    # Explore twice, then save and quit
+    answers("", "4", "", "4", "", "q", "1")
+    first = GameLoop(Player("Bob"), seed=12)
+    first.start()
+    world = first.world
+    directory = sandbox / GameLoop.WORLD_DIR / "12"
+    assert any(directory.iterdir())
+    
+    data = first.save_manager.load(first.slot)
+    assert data["world"] == {"seed": 12, "position": list(world.position)}
+    player = Player("Bob")
+    player.load_state(data)
+    player.day = GameLoop.TARGET_DAYS
+    
+    # Loaded with another session seed, on the last day: rest, and win
+    answers("", "3", "")
+    loaded = GameLoop(player, seed=99, slot=first.slot, world=data["world"])
+    assert (loaded.world.seed, loaded.world.position) == (12, world.position)
+    visited = [(x, y) for x in range(-64, 64) for y in range(-64, 64) if world.visited(x, y)]
+    assert len(visited) > 1 and all(loaded.world.visited(x, y) for x, y in visited)
+    loaded.start()
+    
+    assert loaded.outcome == "won"
+    assert not directory.exists()
+    assert not loaded.save_manager.save_exists(first.slot)
+
+
+def test_saved_masks_leave_memory(sandbox):
+    world = WorldMap(4, directory="world", cache_size=4)
+    tiles = [(x * CHUNK_SIZE, 0) for x in range(40)]
+    for number, (x, y) in enumerate(tiles):
+        world.visit(x, y)
+        world.chunk(x // CHUNK_SIZE, 0)
+        if number % 5 == 4:
+            world.save()
+    world.save()
+    
+    assert len(world._visited) <= 4 and len(world._loaded) <= 4
+    assert all(world.visited(x, y) for x, y in tiles)
+    assert not world.visited(1, 0)
+    assert len(world._loaded) <= 4